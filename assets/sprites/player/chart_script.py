@@ -1,4 +1,22 @@
-import plotly.graph_objects as go
+"""
+Purple hacker walk cycle as a pixel-exact sprite strip.
+
+Frames are index masks (0 = transparent, 1.. = palette entries) drawn with
+NumPy slicing; render() maps them through the palette and writes an RGBA PNG
+(zlib + struct, no image library or browser needed) and optionally an SVG
+with one crisp rect per run of equal pixels.
+
+Usage:
+    python chart_script.py                # sprite_sheet.png next to this script (128x32, 4 frames)
+    python chart_script.py --scale 4 --svg
+"""
+
+import argparse
+import os
+import struct
+import time
+import zlib
+
 import numpy as np
 
 # Create a 4-frame sprite sheet for a purple hacker character
@@ -7,11 +25,87 @@ sprite_width = 32
 sprite_height = 32
 num_frames = 4
 
+# Palette index -> RGBA; 0 is transparent
+PALETTE = np.array([
+    (255, 255, 255, 0),
+    (0x8A, 0x2B, 0xE2, 255),  # Purple
+], dtype=np.uint8)
+
+
+def blank_frame(height=sprite_height, width=sprite_width):
+    """Empty index mask to draw a frame into"""
+    return np.zeros((height, width), dtype=np.uint8)
+
+
+def strip(frames):
+    """Frames side by side, left to right"""
+    return np.hstack(frames)
+
+
+def to_rgba(indices, palette=PALETTE, scale=1):
+    """(h, w) palette indices -> (h * scale, w * scale, 4) uint8 pixels, nearest-neighbour"""
+    rgba = palette[indices]
+    if scale > 1:
+        rgba = rgba.repeat(scale, axis=0).repeat(scale, axis=1)
+    return rgba
+
+
+def _chunk(kind, data):
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def png_bytes(rgba):
+    """Encode (h, w, 4) uint8 pixels as an 8-bit RGBA PNG"""
+    height, width = rgba.shape[:2]
+    rows = np.hstack([np.zeros((height, 1), dtype=np.uint8), rgba.reshape(height, width * 4)])  # Filter 0 per row
+    header = struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)
+    return (b"\x89PNG\r\n\x1a\n" + _chunk(b"IHDR", header)
+            + _chunk(b"IDAT", zlib.compress(rows.tobytes(), 9)) + _chunk(b"IEND", b""))
+
+
+def svg_text(indices, palette=PALETTE, scale=1):
+    """SVG of an index mask: one rect per horizontal run of one colour, transparent runs left out"""
+    height, width = indices.shape
+    rects = []
+    for y, row in enumerate(indices):
+        starts = np.flatnonzero(np.diff(row, prepend=-1))
+        for start, end in zip(starts, list(starts[1:]) + [width]):
+            red, green, blue, alpha = (int(value) for value in palette[row[start]])
+            if alpha:
+                opacity = "" if alpha == 255 else f' fill-opacity="{alpha / 255:.3f}"'
+                rects.append(f'<rect x="{start * scale}" y="{y * scale}" width="{(end - start) * scale}" '
+                             f'height="{scale}" fill="#{red:02x}{green:02x}{blue:02x}"{opacity}/>')
+    return (f'<svg xmlns="http://www.w3.org/2000/svg" width="{width * scale}" height="{height * scale}" '
+            f'shape-rendering="crispEdges">\n' + "\n".join(rects) + "\n</svg>\n")
+
+
+def render(frames, path, palette=PALETTE, scale=1, svg_path=None):
+    """
+    Write frames as a horizontal sprite strip
+
+    Args:
+        frames: List of (h, w) index masks of equal size
+        path: PNG to write
+        scale: Integer pixel size (nearest-neighbour)
+        svg_path: Also write an SVG of the strip here
+
+    Returns:
+        PNG size in bytes
+    """
+    indices = strip(frames)
+    data = png_bytes(to_rgba(indices, palette, scale))
+    with open(path, "wb") as f:
+        f.write(data)
+    if svg_path:
+        with open(svg_path, "w", encoding="utf-8", newline="\n") as f:
+            f.write(svg_text(indices, palette, scale))
+    return len(data)
+
+
 # Create pixel art data for each frame of the walking animation
-frames = []
 
 # Frame 1 - Standing position
-frame1 = np.zeros((32, 32))
+frame1 = blank_frame()
 # Head (rows 8-15, cols 12-19)
 frame1[8:16, 12:20] = 1
 # Body (rows 16-24, cols 14-18)
@@ -24,7 +118,7 @@ frame1[24:31, 14:16] = 1  # Left leg
 frame1[24:31, 16:18] = 1  # Right leg
 
 # Frame 2 - Left step
-frame2 = np.zeros((32, 32))
+frame2 = blank_frame()
 frame2[8:16, 12:20] = 1  # Head
 frame2[16:25, 14:18] = 1  # Body
 frame2[18:23, 11:13] = 1  # Left arm forward
@@ -33,7 +127,7 @@ frame2[24:31, 13:15] = 1  # Left leg forward
 frame2[24:31, 16:18] = 1  # Right leg
 
 # Frame 3 - Center position
-frame3 = np.zeros((32, 32))
+frame3 = blank_frame()
 frame3[8:16, 12:20] = 1  # Head
 frame3[16:25, 14:18] = 1  # Body
 frame3[18:23, 12:14] = 1  # Left arm
@@ -41,7 +135,7 @@ frame3[18:23, 18:20] = 1  # Right arm
 frame3[24:31, 15:17] = 1  # Legs together
 
 # Frame 4 - Right step
-frame4 = np.zeros((32, 32))
+frame4 = blank_frame()
 frame4[8:16, 12:20] = 1  # Head
 frame4[16:25, 14:18] = 1  # Body
 frame4[18:23, 11:13] = 1  # Left arm back
@@ -51,66 +145,17 @@ frame4[24:31, 17:19] = 1  # Right leg forward
 
 frames = [frame1, frame2, frame3, frame4]
 
-# Create the full sprite sheet
-sprite_sheet = np.zeros((32, 128))  # 32 height, 128 width (4 * 32)
-
-for i, frame in enumerate(frames):
-    start_col = i * 32
-    end_col = (i + 1) * 32
-    sprite_sheet[:, start_col:end_col] = frame
-
-# Create the plot
-fig = go.Figure()
-
-# Add the sprite sheet as a heatmap with purple color
-fig.add_trace(go.Heatmap(
-    z=sprite_sheet,
-    colorscale=[[0, 'rgba(255,255,255,0)'], [1, '#8A2BE2']],  # Transparent to purple
-    showscale=False,
-    hovertemplate='<extra></extra>',
-    name=''
-))
-
-# Add subtle frame separators
-for i in range(1, 4):
-    fig.add_vline(x=i * 32 - 0.5, line=dict(color='lightgray', width=1, dash='dot'))
-
-# Update layout for cleaner sprite sheet appearance
-fig.update_layout(
-    title=dict(
-        text='Purple Hacker Walk Animation',
-        font=dict(size=20, color='#8A2BE2'),
-        x=0.5
-    ),
-    xaxis=dict(
-        showgrid=False,
-        zeroline=False,
-        showticklabels=True,
-        range=[-0.5, 127.5],
-        tickmode='array',
-        tickvals=[15.5, 47.5, 79.5, 111.5],
-        ticktext=['Frame 1', 'Frame 2', 'Frame 3', 'Frame 4'],
-        tickfont=dict(size=12)
-    ),
-    yaxis=dict(
-        showgrid=False,
-        zeroline=False,
-        showticklabels=False,
-        range=[-0.5, 31.5],
-        scaleanchor='x',
-        scaleratio=1
-    ),
-    plot_bgcolor='white',
-    paper_bgcolor='white'
-)
-
-# Invert y-axis to match typical image coordinates
-fig.update_yaxes(autorange='reversed')
-
-# Remove axis titles for cleaner look
-fig.update_xaxes(title_text='')
-fig.update_yaxes(title_text='')
-
-# Save the chart
-fig.write_image('sprite_sheet.png')
-fig.write_image('sprite_sheet.svg', format='svg')
\ No newline at end of file
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Render the hacker walk cycle as a sprite strip")
+    parser.add_argument("--out", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "sprite_sheet.png"),
+                        help="PNG to write (default: sprite_sheet.png next to this script)")
+    parser.add_argument("--scale", type=int, default=1, help="Integer pixel size (default: 1)")
+    parser.add_argument("--svg", action="store_true", help="Also write an SVG next to the PNG")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    size = render(frames, args.out, scale=args.scale,
+                  svg_path=os.path.splitext(args.out)[0] + ".svg" if args.svg else None)
+    print(f"Wrote {args.out}: {num_frames * sprite_width * args.scale}x{sprite_height * args.scale}, "
+          f"{num_frames} frames, {size} bytes in {(time.perf_counter() - start) * 1000:.1f} ms")
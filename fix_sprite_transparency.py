@@ -1,85 +1,193 @@
-from PIL import Image
+#!/usr/bin/env python3
+"""
+Sprite Transparency Fixer for Roboclaust
+Detects white/gray backgrounds in sprite PNGs and keys them out.
+
+Usage:
+    python fix_sprite_transparency.py                      # whole assets/sprites tree
+    python fix_sprite_transparency.py assets/sprites/player
+    python fix_sprite_transparency.py "assets/**/*_laufanimationen.png" --json-dir reports
 
-# Load the sprite
-img_path = r"C:\Users\reid1\source\repos\reid15halo-ops\robocalypse-godot4\assets\sprites\player\hacker_1_laufanimationen.png"
-img = Image.open(img_path)
-
-print(f"Original mode: {img.mode}")
-print(f"Original size: {img.size}")
-
-# Convert to RGBA if not already
-if img.mode != 'RGBA':
-    img = img.convert('RGBA')
-    print("Converted to RGBA")
-else:
-    print("Already in RGBA mode")
-
-# Get pixel data
-pixels = img.load()
-width, height = img.size
-
-# Analyze alpha channel and colors
-alpha_values = {}
-white_count = 0
-gray_count = 0
-transparent_count = 0
-total_pixels = width * height
-
-print("\nAnalyzing pixels...")
-
-for y in range(height):
-    for x in range(width):
-        r, g, b, a = pixels[x, y]
-
-        # Track alpha distribution
-        alpha_values[a] = alpha_values.get(a, 0) + 1
-
-        # Count specific pixel types
-        if a == 0:
-            transparent_count += 1
-        elif a > 0:
-            # Check if white/gray
-            if r > 200 and g > 200 and b > 200:
-                white_count += 1
-            elif 100 < r < 200 and 100 < g < 200 and 100 < b < 200:
-                gray_count += 1
-
-print("\nAlpha value distribution:")
-for alpha in sorted(alpha_values.keys()):
-    count = alpha_values[alpha]
-    percentage = (count / total_pixels) * 100
-    print(f"  Alpha {alpha}: {count} pixels ({percentage:.2f}%)")
-
-print(f"\nPixel analysis:")
-print(f"Fully transparent (a=0): {transparent_count} ({(transparent_count/total_pixels)*100:.2f}%)")
-print(f"White-like pixels: {white_count} ({(white_count/total_pixels)*100:.2f}%)")
-print(f"Gray-like pixels: {gray_count} ({(gray_count/total_pixels)*100:.2f}%)")
-
-# If there's a significant amount of white/gray, create a cleaned version
-if white_count > total_pixels * 0.05:  # More than 5% white pixels
-    print("\n!!! DETECTED WHITE/GRAY BACKGROUND !!!")
-    print("Creating cleaned version...")
-
-    # Create new image with cleaned pixels
-    cleaned_img = Image.new('RGBA', (width, height))
-    cleaned_pixels = cleaned_img.load()
-
-    for y in range(height):
-        for x in range(width):
-            r, g, b, a = pixels[x, y]
-
-            # Make white/gray pixels fully transparent
-            if a > 0 and ((r > 200 and g > 200 and b > 200) or
-                          (100 < r < 200 and 100 < g < 200 and 100 < b < 200)):
-                cleaned_pixels[x, y] = (r, g, b, 0)
-            else:
-                cleaned_pixels[x, y] = (r, g, b, a)
-
-    # Save cleaned version
-    output_path = r"C:\Users\reid1\source\repos\reid15halo-ops\robocalypse-godot4\assets\sprites\player\hacker_1_laufanimationen_clean.png"
-    cleaned_img.save(output_path)
-    print(f"Saved cleaned version to: {output_path}")
-    print("\nReplace the original file with the clean version, or update player.gd to use '_clean.png'")
-else:
-    print("\nNo significant white background detected.")
-    print("Transparency issue may be in Godot import settings or rendering.")
+JSON summaries go to one report directory (default tools/.build_cache/keying,
+outside the Godot-imported asset folders), mirroring the project tree:
+assets/sprites/player/hacker_1.png -> <report dir>/assets/sprites/player/hacker_1.keying.json
+"""
+
+from PIL import Image
+import numpy as np
+import argparse
+import glob
+import json
+import os
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TARGET = os.path.join(BASE_PATH, "assets", "sprites")
+DEFAULT_REPORT_DIR = os.path.join(BASE_PATH, "tools", ".build_cache", "keying")
+
+# More than this fraction of white pixels means the sheet has a baked background
+WHITE_THRESHOLD = 0.05
+CLEAN_SUFFIX = "_clean"
+
+
+def white_gray_masks(rgba):
+    """
+    Classify the pixels of an RGBA array
+
+    Args:
+        rgba: uint8 array of shape (height, width, 4)
+
+    Returns:
+        (transparent, white, gray) boolean masks. Gray excludes white, like
+        the if/elif of the original per-pixel loop.
+    """
+    r, g, b, a = (rgba[..., i] for i in range(4))
+    transparent = a == 0
+    visible = ~transparent
+    white = visible & (r > 200) & (g > 200) & (b > 200)
+    gray = (visible & ~white
+            & (r > 100) & (r < 200)
+            & (g > 100) & (g < 200)
+            & (b > 100) & (b < 200))
+    return transparent, white, gray
+
+
+def analyze(rgba):
+    """Compute the alpha histogram and white/gray/transparent counts"""
+    transparent, white, gray = white_gray_masks(rgba)
+    histogram = np.bincount(rgba[..., 3].ravel(), minlength=256)
+    return {
+        "total_pixels": int(rgba.shape[0] * rgba.shape[1]),
+        "alpha_values": {str(alpha): int(count)
+                         for alpha, count in enumerate(histogram) if count},
+        "transparent_count": int(transparent.sum()),
+        "white_count": int(white.sum()),
+        "gray_count": int(gray.sum()),
+    }, white | gray
+
+
+def clean(rgba, background):
+    """Return a copy of rgba with every background pixel made fully transparent"""
+    cleaned = rgba.copy()
+    cleaned[..., 3][background] = 0
+    return cleaned
+
+
+def print_stats(stats):
+    total = stats["total_pixels"]
+
+    print("\nAlpha value distribution:")
+    for alpha, count in sorted(stats["alpha_values"].items(), key=lambda item: int(item[0])):
+        print(f"  Alpha {alpha}: {count} pixels ({(count / total) * 100:.2f}%)")
+
+    print(f"\nPixel analysis:")
+    for label, key in (("Fully transparent (a=0)", "transparent_count"),
+                       ("White-like pixels", "white_count"),
+                       ("Gray-like pixels", "gray_count")):
+        print(f"{label}: {stats[key]} ({(stats[key] / total) * 100:.2f}%)")
+
+
+def report_path(path, json_dir=DEFAULT_REPORT_DIR):
+    """<json_dir>/<path relative to the project>.keying.json, so equal file names don't collide"""
+    rel = os.path.relpath(os.path.abspath(path), BASE_PATH)
+    if rel.startswith(".."):  # Outside the project: mirror the absolute path
+        rel = os.path.splitdrive(os.path.abspath(path))[1].lstrip(os.sep)
+    return os.path.join(json_dir, os.path.splitext(rel)[0] + ".keying.json")
+
+
+def process_file(path, threshold=WHITE_THRESHOLD, in_place=False, json_dir=None, quiet=False):
+    """
+    Analyze one sprite and write a cleaned copy if it has a white background
+
+    Args:
+        path: PNG to analyze
+        threshold: Fraction of white pixels that triggers cleaning
+        in_place: Overwrite the source instead of writing <name>_clean.png
+        json_dir: Report directory for the JSON summary (default: tools/.build_cache/keying)
+        quiet: Skip the per-file histogram output
+
+    Returns:
+        Summary dict (also written to report_path())
+    """
+    print(f"\n=== Processing: {os.path.relpath(path, BASE_PATH)} ===")
+
+    img = Image.open(path)
+    original_mode = img.mode
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    rgba = np.asarray(img)
+
+    stats, background = analyze(rgba)
+    stats["file"] = os.path.relpath(path, BASE_PATH).replace(os.sep, "/")
+    stats["original_mode"] = original_mode
+    stats["size"] = list(img.size)
+    stats["cleaned"] = None
+
+    print(f"Mode: {original_mode}, size: {img.size[0]}x{img.size[1]}")
+    if not quiet:
+        print_stats(stats)
+
+    if stats["white_count"] > stats["total_pixels"] * threshold:
+        root, ext = os.path.splitext(path)
+        output_path = path if in_place else root + CLEAN_SUFFIX + ext
+        Image.fromarray(clean(rgba, background), "RGBA").save(output_path, "PNG")
+        stats["cleaned"] = os.path.relpath(output_path, BASE_PATH).replace(os.sep, "/")
+        print(f"!!! DETECTED WHITE/GRAY BACKGROUND !!! Saved: {stats['cleaned']}")
+    else:
+        print("No significant white background detected.")
+
+    report = report_path(path, json_dir or DEFAULT_REPORT_DIR)
+    os.makedirs(os.path.dirname(report), exist_ok=True)
+    with open(report, "w", encoding="utf-8") as f:
+        json.dump(stats, f, indent=2)
+
+    return stats
+
+
+def collect_files(targets):
+    """Expand directories (recursively) and glob patterns into a sorted list of PNGs"""
+    files = set()
+    for target in targets:
+        if os.path.isdir(target):
+            pattern = os.path.join(target, "**", "*.png")
+        else:
+            pattern = target
+        for path in glob.glob(pattern, recursive=True):
+            if path.lower().endswith(".png") and not os.path.splitext(path)[0].endswith(CLEAN_SUFFIX):
+                files.add(os.path.abspath(path))
+    return sorted(files)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Key out white/gray sprite backgrounds")
+    parser.add_argument("targets", nargs="*", default=[DEFAULT_TARGET],
+                        help="PNG files, directories or glob patterns (default: assets/sprites)")
+    parser.add_argument("--threshold", type=float, default=WHITE_THRESHOLD,
+                        help="Fraction of white pixels that triggers cleaning (default: 0.05)")
+    parser.add_argument("--in-place", action="store_true",
+                        help="Overwrite sprites instead of writing *_clean.png copies")
+    parser.add_argument("--json-dir", default=DEFAULT_REPORT_DIR,
+                        help="Report directory for the JSON summaries, mirroring the project tree "
+                             "(default: tools/.build_cache/keying)")
+    parser.add_argument("--quiet", action="store_true", help="Don't print alpha histograms")
+    args = parser.parse_args()
+
+    files = collect_files(args.targets)
+    print("=" * 60)
+    print(f"Sprite Transparency Fixer - {len(files)} file(s)")
+    print("=" * 60)
+
+    cleaned = 0
+    for path in files:
+        stats = process_file(path, args.threshold, args.in_place, args.json_dir, args.quiet)
+        if stats["cleaned"]:
+            cleaned += 1
+
+    print("\n" + "=" * 60)
+    print(f"Analyzed {len(files)} file(s), cleaned {cleaned}")
+    print("=" * 60)
+    if cleaned and not args.in_place:
+        print("\nReplace the originals with the *_clean.png versions, or rerun with --in-place")
+
+
+if __name__ == "__main__":
+    main()
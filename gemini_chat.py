@@ -1,22 +1,232 @@
+"""
+Gemini chat for design questions.
+
+By default the chat runs on asyncio: replies stream as tokens arrive and you
+can keep typing while one is streaming (the next prompt is sent when the
+current reply is done). Replies are cached on disk by a sha256 of backend,
+history and prompt, so repeating a question - in this or a later session -
+answers instantly.
+
+Backends are pluggable: "gemini" (Google AI Studio), "local" (an offline
+stand-in that streams canned text with configurable latency, for testing and
+benchmarks) or any "module:Class" with an async stream(prompt, history) method.
+
+Usage:
+    python gemini_chat.py                      # async streaming chat with Gemini
+    python gemini_chat.py --backend local      # offline
+    python gemini_chat.py --bench 20           # cold vs. cached latency on the local backend
+    python gemini_chat.py --sync               # the old blocking loop
+"""
+
+import argparse
+import asyncio
+import hashlib
+import importlib
+import json
 import os
-import google.generativeai as genai
-
-# IMPORTANT: Replace "YOUR_API_KEY" with your actual Google AI Studio API key.
-# Get your key from https://aistudio.google.com/app/apikey
-try:
-    # It's recommended to set the API key as an environment variable for security.
-    # If you've set the GOOGLE_API_KEY environment variable, the script will use it.
-    # Otherwise, it will use the key hardcoded in the script.
-    api_key = os.environ.get("GOOGLE_API_KEY")
-    if not api_key:
-        api_key = "YOUR_API_KEY" # <-- PASTE YOUR KEY HERE
-    
-    genai.configure(api_key=api_key)
-
-except Exception as e:
-    print(f"Error configuring the API key: {e}")
-    print("Please make sure you have set your GOOGLE_API_KEY environment variable or replaced 'YOUR_API_KEY' in the script.")
-    exit()
+import sys
+import tempfile
+import time
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools", ".build_cache", "chat")
+MODEL_NAME = "gemini-pro"
+
+BENCH_PROMPTS = [
+    "How should drone difficulty scale over waves?",
+    "Suggest three affixes for elite enemies.",
+    "What makes a hacking minigame feel fair?",
+    "How big should the scrap pickup radius be?",
+    "Ideas for a second boss phase?",
+]
+
+
+def configure_gemini():
+    """Configure google.generativeai with the API key and return the module"""
+    import google.generativeai as genai
+
+    # IMPORTANT: Replace "YOUR_API_KEY" with your actual Google AI Studio API key.
+    # Get your key from https://aistudio.google.com/app/apikey
+    try:
+        # It's recommended to set the API key as an environment variable for security.
+        # If you've set the GOOGLE_API_KEY environment variable, the script will use it.
+        # Otherwise, it will use the key hardcoded in the script.
+        api_key = os.environ.get("GOOGLE_API_KEY")
+        if not api_key:
+            api_key = "YOUR_API_KEY" # <-- PASTE YOUR KEY HERE
+
+        genai.configure(api_key=api_key)
+
+    except Exception as e:
+        print(f"Error configuring the API key: {e}")
+        print("Please make sure you have set your GOOGLE_API_KEY environment variable or replaced 'YOUR_API_KEY' in the script.")
+        exit()
+    return genai
+
+
+# ============================================================================
+# BACKENDS
+# ============================================================================
+
+class GeminiBackend:
+    """Streams from the Gemini API; every request carries the full history, so it is stateless"""
+
+    def __init__(self, model_name=MODEL_NAME):
+        self.name = f"gemini:{model_name}"
+        self.model = configure_gemini().GenerativeModel(model_name)
+
+    async def stream(self, prompt, history):
+        contents = [{"role": role, "parts": [text]} for role, text in history]
+        contents.append({"role": "user", "parts": [prompt]})
+        response = await self.model.generate_content_async(contents, stream=True)
+        async for chunk in response:
+            yield chunk.text
+
+
+class LocalBackend:
+    """
+    Offline stand-in: streams a deterministic reply word by word
+
+    Args:
+        first_token: Seconds before the first chunk (network + model latency)
+        per_token: Seconds between chunks
+    """
+
+    def __init__(self, first_token=0.4, per_token=0.02):
+        self.name = "local"
+        self.first_token = first_token
+        self.per_token = per_token
+
+    async def stream(self, prompt, history):
+        await asyncio.sleep(self.first_token)
+        words = f"(local reply to turn {len(history) // 2 + 1}) You asked: {prompt}".split()
+        for index, word in enumerate(words):
+            yield word if index == 0 else " " + word
+            await asyncio.sleep(self.per_token)
+
+
+BACKENDS = {"gemini": GeminiBackend, "local": LocalBackend}
+
+
+def make_backend(spec):
+    """Backend from a BACKENDS name or a "module:Class" spec"""
+    if spec in BACKENDS:
+        return BACKENDS[spec]()
+    module, _, attr = spec.partition(":")
+    if not attr:
+        raise SystemExit(f"Unknown backend '{spec}', choose from {', '.join(BACKENDS)} or use module:Class")
+    backend = getattr(importlib.import_module(module), attr)()
+    backend.name = getattr(backend, "name", spec)
+    return backend
+
+
+# ============================================================================
+# RESPONSE CACHE
+# ============================================================================
+
+class ResponseCache:
+    """Content-addressed replies: sha256 of backend, history and prompt -> <key>.json"""
+
+    def __init__(self, directory=CACHE_DIR):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, backend_name, prompt, history):
+        payload = json.dumps({"backend": backend_name, "history": history, "prompt": prompt},
+                             ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        try:
+            with open(os.path.join(self.directory, key + ".json"), encoding="utf-8") as f:
+                reply = json.load(f)["reply"]
+        except (OSError, ValueError, KeyError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return reply
+
+    def put(self, key, prompt, reply):
+        os.makedirs(self.directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=self.directory,
+                                         suffix=".tmp", delete=False) as f:  # Unique per writer
+            json.dump({"prompt": prompt, "reply": reply}, f, ensure_ascii=False)
+        os.replace(f.name, os.path.join(self.directory, key + ".json"))  # Readers never see half a reply
+
+
+async def stream_reply(backend, cache, prompt, history, on_chunk):
+    """
+    Stream one reply, from the cache when this exact conversation was seen before
+
+    Args:
+        on_chunk: Called with every piece of text as it arrives
+
+    Returns:
+        (full reply, True if it came from the cache)
+    """
+    key = cache.key(backend.name, prompt, history) if cache else None
+    reply = cache.get(key) if cache else None
+    if reply is not None:
+        on_chunk(reply)
+        return reply, True
+
+    parts = []
+    async for chunk in backend.stream(prompt, history):
+        parts.append(chunk)
+        on_chunk(chunk)
+    reply = "".join(parts)
+    if cache and reply:
+        cache.put(key, prompt, reply)
+    return reply, False
+
+
+# ============================================================================
+# CHAT LOOPS
+# ============================================================================
+
+def print_chunk(text):
+    print(text, end="", flush=True)
+
+
+async def async_chat(backend, cache):
+    """Streaming chat; stdin is read in a thread so typing doesn't wait for the reply"""
+    loop = asyncio.get_running_loop()
+    prompts = asyncio.Queue()
+
+    async def read_input():
+        while True:
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line or line.strip().lower() in ["quit", "exit"]:
+                await prompts.put(None)
+                return
+            if line.strip():
+                await prompts.put(line.strip())
+
+    reader = asyncio.create_task(read_input())
+    history = []
+    print(f"?? Chat ({backend.name}) is ready. Type 'quit' or 'exit' to end the session.")
+    print("You can keep typing while a reply streams; prompts are answered in order.")
+    print("-" * 30)
+    try:
+        while True:
+            if prompts.empty():
+                print("You: ", end="", flush=True)
+            prompt = await prompts.get()
+            if prompt is None:
+                print("?? Goodbye!")
+                break
+            print("Gemini: ", end="", flush=True)
+            try:
+                reply, cached = await stream_reply(backend, cache, prompt, history, print_chunk)
+            except Exception as e:
+                print(f"\nAn error occurred: {e}")
+                print("This might be due to an invalid API key or network issues.")
+                continue
+            print(" [cached]" if cached else "")
+            history += [("user", prompt), ("model", reply)]
+    finally:
+        reader.cancel()
+
 
 def start_chat():
     """
@@ -24,7 +234,7 @@ def start_chat():
     """
     try:
         # Create the model
-        model = genai.GenerativeModel('gemini-pro')
+        model = configure_gemini().GenerativeModel(MODEL_NAME)
         chat = model.start_chat(history=[])
 
         print("?? Gemini Chat is ready. Type 'quit' or 'exit' to end the session.")
@@ -35,13 +245,13 @@ def start_chat():
             if prompt.lower() in ["quit", "exit"]:
                 print("?? Goodbye!")
                 break
-            
+
             if not prompt:
                 continue
 
             # Send the message and stream the response
             response = chat.send_message(prompt, stream=True)
-            
+
             print("Gemini: ", end="")
             for chunk in response:
                 print(chunk.text, end="", flush=True)
@@ -51,5 +261,62 @@ def start_chat():
         print(f"\nAn error occurred: {e}")
         print("This might be due to an invalid API key or network issues.")
 
+
+# ============================================================================
+# BENCHMARK
+# ============================================================================
+
+async def bench(backend, cache, count):
+    """
+    Ask count prompts twice (each as a fresh one-turn conversation): the first
+    pass goes to the backend, the second is answered from the cache.
+    """
+    prompts = [BENCH_PROMPTS[i % len(BENCH_PROMPTS)] + f" (#{i})" for i in range(count)]
+    print(f"{'pass':<8} {'prompts':>7} {'first chunk ms':>15} {'reply ms':>9} {'total s':>8}")
+    for label in ["backend", "cached"]:
+        first, whole = [], []
+        start_all = time.perf_counter()
+        for prompt in prompts:
+            start = time.perf_counter()
+            seen = []
+
+            def on_chunk(text):
+                if not seen:
+                    first.append(time.perf_counter() - start)
+                seen.append(text)
+
+            await stream_reply(backend, cache, prompt, [], on_chunk)
+            whole.append(time.perf_counter() - start)
+        print(f"{label:<8} {count:>7} {sum(first) / count * 1000:>15.2f} {sum(whole) / count * 1000:>9.2f} "
+              f"{time.perf_counter() - start_all:>8.2f}")
+    print(f"Cache: {cache.hits} hits, {cache.misses} misses")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Streaming Gemini chat with a reply cache")
+    parser.add_argument("--backend", help="gemini, local or module:Class (default: gemini, local for --bench)")
+    parser.add_argument("--cache-dir", default=CACHE_DIR, help="Reply cache directory (default: %(default)s)")
+    parser.add_argument("--no-cache", action="store_true", help="Always ask the backend")
+    parser.add_argument("--sync", action="store_true", help="Old blocking chat loop (Gemini only, no cache)")
+    parser.add_argument("--bench", type=int, metavar="N", help="Benchmark N prompts cold and cached, then exit")
+    args = parser.parse_args()
+
+    if args.sync:
+        start_chat()
+        return
+
+    if args.bench:
+        backend = make_backend(args.backend or "local")
+        with tempfile.TemporaryDirectory() as directory:  # Cold start every run
+            asyncio.run(bench(backend, ResponseCache(directory), args.bench))
+        return
+
+    cache = None if args.no_cache else ResponseCache(args.cache_dir)
+    try:
+        asyncio.run(async_chat(make_backend(args.backend or "gemini"), cache))
+    except KeyboardInterrupt:
+        print("\n?? Goodbye!")
+
+
 if __name__ == "__main__":
-    start_chat()
+    main()
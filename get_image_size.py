@@ -1,19 +1,27 @@
-from PIL import Image
+import os
+import sys
 
-# Load the image
-img_path = r"C:\Users\reid1\source\repos\reid15halo-ops\robocalypse-godot4\assets\sprites\player\hacker_1_laufanimationen.png"
-img = Image.open(img_path)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tools"))
+from detect_grid import propose_layout
+import pixel_cache
 
-width, height = img.size
-print(f"Image dimensions: {width}x{height}")
-
-# Calculate frame size
-# Layout: 4 columns, 2 rows (4 frames top, 2 frames bottom)
-cols = 4
-rows = 2
+# Load the image (default: the player walk sheet)
+img_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "assets", "sprites", "player", "hacker_1_laufanimationen.png")
+rgba = pixel_cache.load_rgba(img_path, store=False)  # Read only: don't add cache entries
 
-frame_width = width // cols
-frame_height = height // rows
+height, width = rgba.shape[:2]
+print(f"Image dimensions: {width}x{height}")
 
-print(f"Frame size: {frame_width}x{frame_height}")
-print(f"Total frames: 6 (4 in row 1, 2 in row 2)")
+# Frame layout detected from the gutters between frames (see tools/detect_grid.py),
+# e.g. 4 frames on top and 2 centred below for the walk sheet
+layout = propose_layout(rgba)
+if "cells" in layout:
+    left, top, right, bottom = layout["cells"][0]
+    print(f"Frame size: {right - left}x{bottom - top}")
+    print(f"Total frames: {len(layout['cells'])} ({' + '.join(map(str, layout['rows']))} per row)")
+else:
+    cols, rows = layout["grid"]
+    print(f"Frame size: {width // cols}x{height // rows}")
+    print(f"Grid: {cols} columns, {rows} rows")
+print(f"asset_sheets.json layout: {layout}")
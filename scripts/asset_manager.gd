@@ -11,6 +11,22 @@ var texture_cache: Dictionary = {}  # path -> Texture2D
 var placeholder_texture: ImageTexture = null
 
 
+# ============================================================================
+# TEXTURE TIERS
+# ============================================================================
+
+# Scaled copies of the assets written by tools/texture_tiers.py (or --tiers).
+# Loaders only substitute them with use_tier = true; those callers divide their
+# sprite scale by get_texture_tier_scale(). Exports need the manifest in the
+# include_filter of export_presets.cfg, since Godot doesn't export .json by itself.
+const TIERS_MANIFEST: String = "res://assets/tiers/tiers.json"
+const TIER_VRAM_BUDGET_BYTES: int = 256 * 1024 * 1024  # Largest upscaled tier picked automatically
+
+var texture_tier: String = ""  # "" = original assets, else e.g. "0.5x" or "2x"
+var texture_tier_scale: float = 1.0
+var texture_tier_root: String = ""
+
+
 # ============================================================================
 # INITIALIZATION
 # ============================================================================
@@ -18,9 +34,63 @@ var placeholder_texture: ImageTexture = null
 func _ready() -> void:
 	"""Initialize asset manager"""
 	_create_placeholder_texture()
+	_select_texture_tier()
 	print("[AssetManager] Initialized with fallback system")
 
 
+func _select_texture_tier() -> void:
+	"""
+	Pick the texture tier for this machine
+
+	--texture-tier=NAME after "--" on the command line forces a tier ("1x" = originals).
+	Otherwise integrated GPUs get the smallest downscaled tier and hi-DPI screens
+	the largest upscaled tier that fits TIER_VRAM_BUDGET_BYTES.
+	"""
+	if not FileAccess.file_exists(TIERS_MANIFEST):
+		return
+	var manifest = JSON.parse_string(FileAccess.get_file_as_string(TIERS_MANIFEST))
+	if typeof(manifest) != TYPE_DICTIONARY or not manifest.has("tiers"):
+		push_warning("[AssetManager] Invalid tier manifest: '%s'" % TIERS_MANIFEST)
+		return
+	var tiers: Dictionary = manifest["tiers"]
+
+	var chosen: String = ""
+	var forced: bool = false
+	for arg in OS.get_cmdline_user_args():
+		if arg.begins_with("--texture-tier="):
+			chosen = arg.trim_prefix("--texture-tier=")
+			forced = true
+	if forced:
+		if chosen == "1x":
+			return
+		if not tiers.has(chosen):
+			push_warning("[AssetManager] Unknown texture tier '%s', using originals" % chosen)
+			return
+	elif RenderingServer.get_video_adapter_type() == RenderingDevice.DEVICE_TYPE_INTEGRATED_GPU:
+		for name in tiers:
+			if tiers[name]["scale"] < 1.0 and (chosen == "" or tiers[name]["scale"] < tiers[chosen]["scale"]):
+				chosen = name
+	elif DisplayServer.screen_get_scale() >= 2.0:
+		for name in tiers:
+			var fits: bool = tiers[name]["vram_bytes"] <= TIER_VRAM_BUDGET_BYTES
+			if tiers[name]["scale"] > 1.0 and fits and (chosen == "" or tiers[name]["scale"] > tiers[chosen]["scale"]):
+				chosen = name
+
+	if chosen != "":
+		texture_tier = chosen
+		texture_tier_scale = tiers[chosen]["scale"]
+		texture_tier_root = tiers[chosen]["root"]
+		print("[AssetManager] Texture tier %s (scale %s)" % [texture_tier, texture_tier_scale])
+
+
+func _tier_path(path: String) -> String:
+	"""Path of the tier copy of an asset, or the path itself if there is none"""
+	if texture_tier == "" or not path.begins_with("res://assets/"):
+		return path
+	var tier_path: String = texture_tier_root + "/" + path.trim_prefix("res://assets/")
+	return tier_path if ResourceLoader.exists(tier_path) or FileAccess.file_exists(tier_path) else path
+
+
 func _create_placeholder_texture() -> void:
 	"""Create a simple placeholder texture for missing assets"""
 	var size: int = 64
@@ -40,17 +110,22 @@ func _create_placeholder_texture() -> void:
 # TEXTURE LOADING
 # ============================================================================
 
-func load_texture(path: String, use_cache: bool = true) -> Texture2D:
+func load_texture(path: String, use_cache: bool = true, use_tier: bool = false) -> Texture2D:
 	"""
 	Load a texture with automatic fallback to placeholder
 
 	Args:
 		path: Resource path to texture (e.g., "res://assets/sprites/player.png")
 		use_cache: Whether to use cached textures (default: true)
+		use_tier: Load the selected texture tier's copy when it exists (default: false);
+			it is get_texture_tier_scale() times the original size
 
 	Returns:
 		Loaded texture or placeholder if failed
 	"""
+	if use_tier:
+		path = _tier_path(path)
+
 	# Check cache first
 	if use_cache and texture_cache.has(path):
 		return texture_cache[path]
@@ -102,6 +177,61 @@ func try_load_texture_with_fallback(primary_path: String, fallback_path: String
 	return placeholder_texture
 
 
+func load_trimmed_texture(path: String, use_tier: bool = false) -> Texture2D:
+	"""
+	Load a sprite cropped by asset_splitter.py --trim at its original cell alignment
+
+	Args:
+		path: Resource path to the trimmed PNG (reads the <name>.trim.json sidecar;
+			export_presets.cfg includes *.trim.json, which Godot doesn't export by itself)
+		use_tier: Load the selected texture tier's copy and sidecar when they exist
+
+	Returns:
+		AtlasTexture padded back to the full cell size, or the plain texture without a sidecar
+	"""
+	var texture: Texture2D = load_texture(path, true, use_tier)
+	var sidecar_path: String = path.get_basename() + ".trim.json"
+	if use_tier:
+		sidecar_path = _tier_path(sidecar_path)
+	if texture == placeholder_texture or not FileAccess.file_exists(sidecar_path):
+		return texture
+
+	var trim = JSON.parse_string(FileAccess.get_file_as_string(sidecar_path))
+	if typeof(trim) != TYPE_DICTIONARY or not trim.has("cell_size") or not trim.has("offset"):
+		push_warning("[AssetManager] Invalid trim sidecar: '%s'" % sidecar_path)
+		return texture
+
+	# margin.position shifts the region, margin.size pads it back to the cell size
+	var atlas_texture: AtlasTexture = AtlasTexture.new()
+	atlas_texture.atlas = texture
+	atlas_texture.region = Rect2(Vector2.ZERO, texture.get_size())
+	atlas_texture.margin = Rect2(
+		trim["offset"][0], trim["offset"][1],
+		trim["cell_size"][0] - texture.get_width(), trim["cell_size"][1] - texture.get_height()
+	)
+	return atlas_texture
+
+
+func load_sprite_frames(path: String, use_tier: bool = false) -> SpriteFrames:
+	"""
+	Load a SpriteFrames resource (e.g., "res://assets/anim/drone_fast.tres")
+
+	Args:
+		path: Resource path to the .tres
+		use_tier: Load the selected texture tier's copy when it exists; its frames
+			are get_texture_tier_scale() times the original size
+
+	Returns:
+		SpriteFrames or null if it can't be loaded
+	"""
+	if use_tier:
+		path = _tier_path(path)
+	var frames: SpriteFrames = load(path) as SpriteFrames if ResourceLoader.exists(path) else null
+	if frames == null:
+		push_warning("[AssetManager] SpriteFrames not found: '%s'" % path)
+	return frames
+
+
 func preload_textures(paths: Array[String]) -> void:
 	"""Preload multiple textures into cache"""
 	for path in paths:
@@ -126,3 +256,8 @@ func get_cache_size() -> int:
 func get_placeholder() -> Texture2D:
 	"""Get the placeholder texture directly"""
 	return placeholder_texture
+
+
+func get_texture_tier_scale() -> float:
+	"""Scale of use_tier textures relative to the originals (divide sprite scale by it)"""
+	return texture_tier_scale
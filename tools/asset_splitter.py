@@ -2,25 +2,78 @@
 """
 Asset Splitter for Roboclaust
 Splits JPEG sprite sheets into individual PNG files
+
+Sheet layouts (grids, cell names, skipped cells, alias copies) are
+declared in asset_sheets.json next to this script. Irregular sheets list
+explicit "cells" boxes instead of a grid; detect_grid.py proposes either.
+
+With --trim (or "trim": true on a sheet) cells are cropped to the bounding
+box of their content and a <name>.trim.json sidecar records the original cell
+size and offset, so AssetManager.load_trimmed_texture() can restore alignment.
+Content is the non-transparent pixels, or for opaque cells (JPEG sheets) the
+pixels that don't match the border colours (detect_grid.background_mask).
+
+With --watch, the manifest and source sheets are polled after the first
+run; saving a sheet re-runs only its stage, and only cells whose pixels
+changed are re-encoded. The time from save to written PNGs is reported.
+
+With --stream, cells are decoded, converted and written one row band at a
+time. Uncompressed sources (PPM, BMP, raw TIFF) are read band by band straight
+from the file, so peak memory is about one cell row. JPEG/PNG can only be
+decoded whole, so they stay in their native mode (RGB: 3/4 of the RGBA copy)
+and are converted to RGBA per band. --preview N decodes at 1/N scale (JPEG DCT
+draft, so the full-size sheet is never decoded) into the build cache instead
+of the project.
+
+--tiers 0.5,2 also writes every cell at those scales into assets/tiers/<tier>/
+(see texture_tiers.py) and updates assets/tiers/tiers.json.
+
+--trace PATH records spans per stage, decode/band/crop and per output file
+(encode, write, with byte counts) as Chrome trace JSON and prints a summary.
 """
 
 from PIL import Image
+from concurrent.futures import (FIRST_COMPLETED, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from functools import partial
+import numpy as np
+import argparse
+import hashlib
+import io
+import json
 import os
-import sys
-
-# Define output directories
-DIRS = {
-    "enemies": "assets/sprites/enemies",
-    "player": "assets/sprites/player",
-    "boss": "assets/sprites/boss",
-    "effects": "assets/sprites/effects",
-    "projectiles": "assets/sprites/projectiles",
-    "weapons": "assets/sprites/weapons",
-    "items": "assets/sprites/items",
-    "drugs": "assets/sprites/drugs",
-    "tiles_factory": "assets/tiles/factory",
-    "tiles_danger": "assets/tiles/danger",
-}
+
+from optimize_png import encode_smallest
+import pixel_cache
+import texture_tiers
+import tracing
+import watch
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "asset_sheets.json")
+
+def load_manifest(path=MANIFEST_PATH):
+    """Load the sheet manifest (see asset_sheets.json)"""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Output directories, shared with the manifest
+DIRS = load_manifest()["dirs"]
+
+# Worker threads used to encode the cells of one sheet (set per process)
+CELL_JOBS = os.cpu_count() or 1
+
+# Incremental build cache: one manifest per source sheet
+CACHE_DIR = os.path.join(os.path.dirname(__file__), ".build_cache")
+CACHE_VERSION = 1
+FORCE_REBUILD = False  # --force: ignore the cache (set per process)
+OPTIMIZE_PNG = False  # --optimize: smallest lossless PNG via optimize_png (set per process)
+TIERS = []  # --tiers: extra texture_tiers scales written for every cell (set per process)
+PREVIEW_SCALES = (2, 4, 8)  # JPEG draft decoding supports these exactly
+
+# Bytes per pixel of the raw modes that can be read band by band
+RAW_PIXEL_BYTES = {"L": 1, "P": 1, "LA": 2, "RGB": 3, "BGR": 3,
+                   "RGBA": 4, "BGRA": 4, "RGBX": 4, "BGRX": 4}
 
 
 def create_directories():
@@ -32,35 +85,151 @@ def create_directories():
         print(f"Created directory: {full_path}")
 
 
-def split_sprite_sheet(input_path, output_dir, grid_cols, grid_rows, names):
+def file_hash(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def build_key(input_paths, spec):
+    """Cache key from the input file contents plus the JSON-serializable build spec"""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for path in input_paths:
+        digest.update(file_hash(path).encode())
+    digest.update(json.dumps(spec, sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def _cache_file(name):
+    return os.path.join(CACHE_DIR, name.replace("/", "_").replace("\\", "_") + ".json")
+
+
+def load_build(name):
+    """The last build manifest recorded for name ({} when missing or with --force)"""
+    if FORCE_REBUILD:
+        return {}
+    try:
+        with open(_cache_file(name), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def outputs_intact(entry, paths):
+    """True when every path still has the size and mtime the manifest recorded"""
+    recorded = entry.get("outputs", {})
+    for path in paths:
+        if path not in recorded:
+            return False
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return False
+        if [stat.st_size, stat.st_mtime_ns] != recorded[path]:
+            return False
+    return True
+
+
+def is_up_to_date(name, key):
     """
-    Split sprite sheet into individual images
+    Check the build manifest for a cached build
+
+    Returns True when the manifest was written for the same key and every
+    output still has the size and mtime recorded after the last build.
+    """
+    entry = load_build(name)
+    return entry.get("key") == key and outputs_intact(entry, entry["outputs"])
+
+
+def record_build(name, key, output_paths, cells=None):
+    """
+    Write the build manifest for name after a successful build
 
     Args:
-        input_path: Path to input JPEG
-        output_dir: Output directory for PNGs
-        grid_cols: Number of columns in grid
-        grid_rows: Number of rows in grid
-        names: List of output file names (without .png extension)
+        cells: Optional first output path -> cell_digest(), so the next build
+               can skip cells whose pixels did not change
     """
-    base_path = os.path.join(os.path.dirname(__file__), "..")
-    full_input = os.path.join(base_path, input_path)
-    full_output = os.path.join(base_path, output_dir)
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    outputs = {}
+    for path in output_paths:
+        stat = os.stat(path)
+        outputs[path] = [stat.st_size, stat.st_mtime_ns]
+    with open(_cache_file(name), "w", encoding="utf-8") as f:
+        json.dump({"key": key, "outputs": outputs, "cells": cells or {}}, f, indent=2)
+
+
+def cell_digest(cell, trim):
+    """Hash of everything a cell's output depends on: its pixels and the encode options"""
+    digest = hashlib.blake2b(f"{cell.size} {bool(trim)} {OPTIMIZE_PNG} {TIERS}".encode(), digest_size=16)
+    digest.update(cell.tobytes())
+    return digest.hexdigest()
+
+
+def encode_png(img):
+    """Encode an image as PNG bytes (indexed/recompressed with --optimize)"""
+    if OPTIMIZE_PNG:
+        return encode_smallest(img)
+    buffer = io.BytesIO()
+    img.save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def write_if_changed(data, output_path):
+    """
+    Write encoded bytes only if they differ from the file on disk
+
+    Keeping the old file (and its mtime) stops Godot from reimporting it.
+
+    Returns:
+        True if the file was written
+    """
+    if os.path.exists(output_path) and os.path.getsize(output_path) == len(data):
+        with open(output_path, "rb") as f:
+            if f.read() == data:
+                return False
+
+    with open(output_path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def sheet_names(sheet):
+    """Cell names of a sheet in row-major order ("skip" marks empty cells)"""
+    if "names_pattern" in sheet:
+        cols, rows = sheet.get("grid", [1, 1])
+        count = len(sheet["cells"]) if "cells" in sheet else cols * rows
+        return [sheet["names_pattern"].format(index=i) for i in range(count)]
+    return sheet["names"]
+
+
+def cell_boxes(size, sheet):
+    """
+    Compute the crop boxes of a sheet
+
+    Args:
+        size: (width, height) of the decoded source
+        sheet: Sheet entry from the manifest
 
-    print(f"\n=== Processing: {input_path} ===")
-    print(f"Grid: {grid_cols}x{grid_rows}")
+    Returns:
+        List of (name, (left, top, right, bottom)) for every non-skipped cell
+    """
+    width, height = size
+    grid_cols, grid_rows = sheet.get("grid", [1, 1])
+    names = sheet_names(sheet)
 
-    img = Image.open(full_input)
-    img = img.convert("RGBA")  # Ensure RGBA mode
-    width, height = img.size
+    if "cells" in sheet:  # Explicit boxes, measured on a sheet of "size" (scaled for previews)
+        source_width, source_height = sheet.get("size", size)
+        return [(name, (left * width // source_width, top * height // source_height,
+                        right * width // source_width, bottom * height // source_height))
+                for name, (left, top, right, bottom) in zip(names, sheet["cells"]) if name != "skip"]
 
     cell_width = width // grid_cols
     cell_height = height // grid_rows
 
-    print(f"Image size: {width}x{height}")
-    print(f"Cell size: {cell_width}x{cell_height}")
-
-    count = 0
+    boxes = []
     for row in range(grid_rows):
         for col in range(grid_cols):
             index = row * grid_cols + col
@@ -73,201 +242,428 @@ def split_sprite_sheet(input_path, output_dir, grid_cols, grid_rows, names):
 
             left = col * cell_width
             top = row * cell_height
-            right = left + cell_width
-            bottom = top + cell_height
-
-            cell = img.crop((left, top, right, bottom))
-
-            # Auto-crop transparent borders (optional)
-            # bbox = cell.getbbox()
-            # if bbox:
-            #     cell = cell.crop(bbox)
-
-            output_path = os.path.join(full_output, name + ".png")
-            cell.save(output_path, "PNG")
-            count += 1
-            print(f"  [{count}] Saved: {name}.png")
-
-    print(f"Completed: {count} images extracted\n")
-
-
-def process_drones():
-    """Process dronen-1.jpg - Enemy drones"""
-    split_sprite_sheet(
-        "assets/dronen-1.jpg",
-        DIRS["enemies"],
-        grid_cols=2,
-        grid_rows=3,
-        names=[
-            "standard_drone",
-            "fast_drone",
-            "heavy_drone",
-            "explosion_smoke",
-            "kamikaze_drone",
-            "sniper_drone"
-        ]
-    )
-
-
-def process_player():
-    """Process hacker-1.jpg - Player character"""
-    # Single image, just convert to PNG
-    base_path = os.path.join(os.path.dirname(__file__), "..")
-    input_path = os.path.join(base_path, "assets/hacker-1.jpg")
-    output_path = os.path.join(base_path, DIRS["player"], "player.png")
+            boxes.append((name, (left, top, left + cell_width, top + cell_height)))
+    return boxes
 
-    print(f"\n=== Processing: hacker-1.jpg ===")
-    img = Image.open(input_path)
-    img = img.convert("RGBA")
-    img.save(output_path, "PNG")
-    print(f"Saved: player.png\n")
 
+def trim_cell(cell):
+    """
+    Crop a cell to the bounding box of its content
 
-def process_boss():
-    """Process boss-gegner1.jpg - Boss enemy"""
-    base_path = os.path.join(os.path.dirname(__file__), "..")
-    input_path = os.path.join(base_path, "assets/boss-gegner1.jpg")
-    output_path = os.path.join(base_path, DIRS["boss"], "boss_mech.png")
-
-    print(f"\n=== Processing: boss-gegner1.jpg ===")
-    img = Image.open(input_path)
-    img = img.convert("RGBA")
-    img.save(output_path, "PNG")
-    print(f"Saved: boss_mech.png\n")
-
-
-def process_effects():
-    """Process effects-1.jpg - VFX effects"""
-    split_sprite_sheet(
-        "assets/effects-1.jpg",
-        DIRS["effects"],
-        grid_cols=2,
-        grid_rows=3,
-        names=[
-            "laser_beam",
-            "explosion_burst",
-            "energy_blast",
-            "portal_ring",
-            "skip",  # Empty cell
-            "lightning_wave"
-        ]
-    )
-
-
-def process_projectiles():
-    """Process geschosse-1.jpg - Projectiles"""
-    split_sprite_sheet(
-        "assets/geschosse-1.jpg",
-        DIRS["projectiles"],
-        grid_cols=2,
-        grid_rows=3,
-        names=[
-            "energy_bullet",
-            "energy_beam",
-            "energy_laser",
-            "rocket",
-            "grenade",
-            "energy_orb"
-        ]
-    )
-
-
-def process_weapons():
-    """Process weapons-1.jpg - Weapons"""
-    split_sprite_sheet(
-        "assets/weapons-1.jpg",
-        DIRS["weapons"],
-        grid_cols=3,
-        grid_rows=3,
-        names=[
-            "pistol_energy",
-            "pistol_gray",
-            "skip",
-            "rifle_blue",
-            "rifle_gray",
-            "skip",
-            "sword_energy",
-            "gun_heavy",
-            "skip"
-        ]
-    )
-
-
-def process_materials():
-    """Process materialien-1.jpg - Items and drugs"""
-    # This is a 6x6 grid with 36 items
-    # We'll map them to items and drugs
-    split_sprite_sheet(
-        "assets/materialien-1.jpg",
-        DIRS["items"],
-        grid_cols=6,
-        grid_rows=6,
-        names=[
-            # Row 1
-            "metal_rusty", "crystal_cyan", "crystal_pink",
-            "tech_panel", "shard_cyan", "orb_blue",
-            # Row 2
-            "cube_empty", "cube_filled", "tile_cracked_1",
-            "cube_glass", "tile_cracked_2", "orb_tech_blue",
-            # Row 3
-            "orb_purple", "orb_glow_blue", "tile_cracked_3",
-            "crystal_blue", "crystal_purple", "orb_green",
-            # Row 4
-            "crystal_green", "gem_blue", "gem_pink",
-            "gem_purple", "gem_rainbow", "star_purple",
-            # Row 5
-            "crystal_white", "tile_metal", "gem_holo_purple",
-            "ring_tech_black", "crystal_rainbow", "crystal_green_2",
-            # Row 6 (These can be drug icons!)
-            "tile_dark_1", "tile_dark_2", "tile_dark_3",
-            "tile_dark_4", "tile_dark_5", "tile_dark_6"
-        ]
-    )
-
-
-def process_drugs():
-    """Copy specific items as drug icons"""
-    print("\n=== Creating Drug Icons ===")
-    base_path = os.path.join(os.path.dirname(__file__), "..")
-    items_dir = os.path.join(base_path, DIRS["items"])
-    drugs_dir = os.path.join(base_path, DIRS["drugs"])
-
-    # Map items to drugs
-    drug_mapping = {
-        "crystal_pink.png": "stim_pack.png",       # Pink = Stimulant
-        "crystal_purple.png": "nano_boost.png",    # Purple = Nano
-        "gem_rainbow.png": "combat_drug.png",      # Rainbow = Combat
-        "orb_glow_blue.png": "focus_serum.png",    # Glowing Blue = Focus
-        "gem_holo_purple.png": "rage_pill.png",    # Holo Purple = Rage
-        "crystal_cyan.png": "speed_injector.png",  # Cyan = Speed
+    Cells with transparency are cropped to their non-transparent pixels; opaque
+    cells (every JPEG sheet) to the pixels outside the background key.
+
+    Returns:
+        (cropped cell, sidecar dict with the original cell size and offset)
+    """
+    alpha = cell.getchannel("A")
+    if alpha.getextrema()[0] < 255:
+        bbox = alpha.getbbox()
+    else:
+        from detect_grid import background_mask  # detect_grid imports this module
+        content = ~background_mask(np.asarray(cell))
+        rows, cols = np.flatnonzero(content.any(axis=1)), np.flatnonzero(content.any(axis=0))
+        bbox = (int(cols[0]), int(rows[0]), int(cols[-1]) + 1, int(rows[-1]) + 1) if len(rows) else None
+    bbox = bbox or (0, 0, 1, 1)  # Keep 1px of empty cells
+    trimmed = cell.crop(bbox)
+    return trimmed, {
+        "cell_size": list(cell.size),
+        "offset": [bbox[0], bbox[1]],
+        "size": list(trimmed.size),
     }
 
-    for source, dest in drug_mapping.items():
-        source_path = os.path.join(items_dir, source)
-        dest_path = os.path.join(drugs_dir, dest)
 
-        if os.path.exists(source_path):
-            img = Image.open(source_path)
-            img.save(dest_path, "PNG")
-            print(f"Created drug icon: {dest}")
+def raw_band_reader(path):
+    """
+    Band reader for uncompressed single-tile images
+
+    Returns:
+        read(top, bottom) -> image of those rows, decoded straight from the file,
+        or None when the format has to be decoded whole (JPEG, PNG, ...)
+    """
+    with Image.open(path) as img:
+        if len(img.tile) != 1 or img.tile[0][0] != "raw":
+            return None
+        _, extent, offset, args = img.tile[0]
+        mode, (width, height), palette = img.mode, img.size, img.palette
+
+    args = (args,) if isinstance(args, str) else tuple(args)
+    rawmode, stride, ystep = (args + (0, 1))[:3]
+    if tuple(extent) != (0, 0, width, height) or not stride and rawmode not in RAW_PIXEL_BYTES:
+        return None
+    stride = stride or width * RAW_PIXEL_BYTES[rawmode]
+
+    def read(top, bottom):
+        first_row = top if ystep > 0 else height - bottom  # Bottom-up files (BMP) store the last row first
+        with open(path, "rb") as f:
+            f.seek(offset + first_row * stride)
+            data = f.read((bottom - top) * stride)
+        band = Image.frombuffer(mode, (width, bottom - top), data, "raw", rawmode, stride, ystep).copy()
+        if palette:
+            band.putpalette(palette)
+        return band
+    return read
+
+
+def open_source(path, scale=1):
+    """
+    Open a source image lazily, asking JPEG for a 1/scale DCT draft
+
+    Returns:
+        (image, scale still to apply with reduce(): 1 when draft covered it)
+    """
+    img = Image.open(path)
+    if scale > 1 and img.format == "JPEG":
+        img.draft(img.mode, (img.width // scale, img.height // scale))
+        return img, 1
+    return img, scale
+
+
+def process_source(source, sheets, dirs, jobs=None, stream=False, scale=1):
+    """
+    Decode one source image once and write the cells of every sheet that uses it
 
+    Args:
+        source: Source image relative to the project root
+        sheets: Manifest sheet entries reading from this source
+        dirs: Output directory table (manifest "dirs")
+        jobs: Threads used to encode cells (default: CELL_JOBS).
+              PIL releases the GIL while encoding, so saves run in parallel.
+        stream: Decode, convert and write one row band of cells at a time
+        scale: Preview mode - decode at 1/scale into the build cache, not the project
+
+    Returns:
+        Dict with "pixels_saved" by trimming (0 when skipped or untrimmed)
+    """
+    base_path = os.path.join(os.path.dirname(__file__), "..")
+    full_input = os.path.join(base_path, source)
+    output_base = base_path if scale == 1 else os.path.join(CACHE_DIR, f"preview_{scale}")
+    cache_name = source if scale == 1 else f"{source}.preview_{scale}"
+
+    print(f"\n=== Processing: {source} ===")
+
+    with tracing.span("cache_check", "source", source=source) as trace_args:
+        key = build_key([full_input], {"sheets": sheets, "dirs": dirs, "scale": scale, "optimize": OPTIMIZE_PNG,
+                                       "tiers": [str(tier) for tier in TIERS]})
+        up_to_date = trace_args["up_to_date"] = is_up_to_date(cache_name, key)
+    if up_to_date:
+        print("Up to date, skipped\n")
+        return {"pixels_saved": 0}
+    previous = load_build(cache_name)  # Cells whose pixels match it are not re-encoded
+
+    # Lazy (streamed) sources decode inside the "band" spans instead
+    with tracing.span("decode", "source", source=source, bytes=os.path.getsize(full_input)):
+        read_band = raw_band_reader(full_input) if stream and scale == 1 else None
+        if not stream and scale == 1:
+            img = pixel_cache.open_image(full_input)  # RGBA, memory-mapped when decoded before
+        else:
+            img, reduce_by = open_source(full_input, scale)
+        if read_band is None and scale > 1:
+            if reduce_by > 1:
+                img = img.reduce(reduce_by)
+            if not stream:
+                img = img.convert("RGBA")  # Ensure RGBA mode
+    print(f"Image size: {img.size[0]}x{img.size[1]}" + (f" (1/{scale} preview)" if scale > 1 else ""))
+
+    # Row band (top, bottom) -> [(output paths, box, trim)]; aliases reuse the encoded bytes of their cell
+    bands = {}
+    for sheet in sheets:
+        grid_cols, grid_rows = sheet.get("grid", [1, 1])
+        layout = f"{len(sheet['cells'])} cells" if "cells" in sheet else f"Grid: {grid_cols}x{grid_rows}"
+        output_dir = os.path.join(output_base, dirs[sheet["dir"]])
+        aliases = sheet.get("aliases", {})
+        alias_dir = os.path.join(output_base, dirs[aliases["dir"]]) if aliases else None
+        print(f"{layout} -> {dirs[sheet['dir']]}")
+        if scale > 1:
+            os.makedirs(output_dir, exist_ok=True)
+            if alias_dir:
+                os.makedirs(alias_dir, exist_ok=True)
+
+        for name, box in cell_boxes(img.size, sheet):
+            paths = [os.path.join(output_dir, name + ".png")]
+            if name in aliases.get("copies", {}):
+                paths.append(os.path.join(alias_dir, aliases["copies"][name] + ".png"))
+            bands.setdefault((box[1], box[3]), []).append((paths, box, sheet.get("trim")))
+
+    tiers = TIERS if scale == 1 else []  # Previews are never tiered
+
+    def write_sidecar(sidecar, path):
+        sidecar_path = os.path.splitext(path)[0] + ".trim.json"
+        if sidecar:
+            write_if_changed(sidecar, sidecar_path)
+        elif os.path.exists(sidecar_path):
+            os.remove(sidecar_path)  # Stale offsets would misplace an untrimmed cell
+
+    def save_cell(number, paths, cell, trim):
+        file = os.path.relpath(paths[0], base_path)
+        with tracing.span("encode", "file", file=file) as trace_args:
+            data = encode_png(cell)
+            trace_args["bytes"] = len(data)
+        with tracing.span("pixel_cache", "file", file=file) as trace_args:
+            if pixel_cache.put(data, cell):  # Later stages map these pixels instead of decoding
+                trace_args["bytes"] = cell.width * cell.height * 4
+        sidecar = json.dumps(trim, indent=2).encode() if trim else None
+        for path in paths:
+            with tracing.span("write", "file", file=os.path.relpath(path, base_path)) as trace_args:
+                written = write_if_changed(data, path)
+                trace_args.update(bytes=len(data) if written else 0, written=written)
+            status = "Saved" if written else "Unchanged"
+            print(f"  [{number}] {status}: {os.path.relpath(path, base_path)}")
+            write_sidecar(sidecar, path)
+
+        for tier in tiers:
+            with tracing.span("tier", "file", file=file, tier=texture_tiers.tier_name(tier)) as trace_args:
+                data = encode_png(texture_tiers.scale_image(cell, tier))
+                trace_args["bytes"] = len(data)
+                sidecar = json.dumps(texture_tiers.scale_trim(trim, tier), indent=2).encode() if trim else None
+                for path in filter(None, (texture_tiers.tier_path(path, tier) for path in paths)):
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    write_if_changed(data, path)
+                    write_sidecar(sidecar, path)
+
+    def band_image(top, bottom):
+        """RGBA rows top..bottom and the y they start at"""
+        if read_band:
+            band = read_band(top, bottom)
+        elif stream:
+            band = img.crop((0, top, img.width, bottom))
+        else:
+            return img, 0
+        return (band if band.mode == "RGBA" else band.convert("RGBA")), top
+
+    outputs = []
+    cells = {}
+    pixels_saved = 0
+    number = 0
+    unchanged = 0
+    with ThreadPoolExecutor(max_workers=jobs or CELL_JOBS) as pool:
+        futures = []
+        for (top, bottom), band_cells in bands.items():
+            with tracing.span("band", "source", source=source, rows=[top, bottom]):
+                band, origin = band_image(top, bottom)
+            for paths, (left, cell_top, right, cell_bottom), trim in band_cells:
+                with tracing.span("crop", "cell", file=os.path.relpath(paths[0], base_path)):
+                    cell = band.crop((left, cell_top - origin, right, cell_bottom - origin))
+                    digest = cells[paths[0]] = cell_digest(cell, trim)
+                    cell_outputs = list(paths)
+
+                    # Trimming breaks sprite alignment unless the sidecar is applied
+                    if trim:
+                        full_size = cell.size
+                        cell, trim = trim_cell(cell)
+                        pixels_saved += (full_size[0] * full_size[1] - cell.size[0] * cell.size[1]) * len(paths)
+                        cell_outputs += [os.path.splitext(path)[0] + ".trim.json" for path in paths]
+                cell_outputs += [tier_path for tier_path in (texture_tiers.tier_path(path, tier)
+                                                             for path in cell_outputs for tier in tiers) if tier_path]
+                outputs += cell_outputs
+                number += 1
+                if previous.get("cells", {}).get(paths[0]) == digest and outputs_intact(previous, cell_outputs):
+                    unchanged += 1
+                    continue
+                futures.append(pool.submit(save_cell, number, paths, cell, trim or None))
+
+            if stream:  # Finish the band before decoding the next one
+                for future in futures:
+                    future.result()
+                futures = []
+            del band
+        for future in futures:
+            future.result()
+
+    record_build(cache_name, key, outputs, cells)
+    print(f"Completed: {number} images extracted" + (f", {unchanged} unchanged" if unchanged else ""))
+
+    if pixels_saved:
+        print(f"Trim saved {pixels_saved} pixels")
     print()
+    return {"pixels_saved": pixels_saved}
+
+
+def split_sprite_sheet(input_path, output_dir, grid_cols, grid_rows, names, jobs=None, trim=False,
+                       stream=False):
+    """
+    Split sprite sheet into individual images
+
+    Args:
+        input_path: Path to input JPEG
+        output_dir: Output directory for PNGs
+        grid_cols: Number of columns in grid
+        grid_rows: Number of rows in grid
+        names: List of output file names (without .png extension)
+        jobs: Threads used to encode cells (default: CELL_JOBS)
+        trim: Crop cells to their alpha bounding box and write .trim.json sidecars
+        stream: Decode and write one row band of cells at a time (bounded memory)
+    """
+    sheet = {"dir": "output", "grid": [grid_cols, grid_rows], "names": names, "trim": trim}
+    return process_source(input_path, [sheet], {"output": output_dir}, jobs, stream)
+
+
+def build_stages(manifest, stream=False, scale=1):
+    """
+    Turn the manifest into scheduler stages, one per source image
 
+    Sheets sharing a source are merged into one stage so the source is only
+    decoded once. A sheet's optional "after" list names sheets whose stages
+    must finish first.
 
-def process_map_tiles():
-    """Process map-2.jpg - Danger zone tiles"""
-    # map-2.jpg appears to be a grid of tiles
-    # Let's extract them in an 8x8 grid
-    split_sprite_sheet(
-        "assets/map-2.jpg",
-        DIRS["tiles_danger"],
-        grid_cols=8,
-        grid_rows=8,
-        names=[f"danger_tile_{i:02d}" for i in range(64)]
-    )
+    Returns:
+        Dict of stage name -> (function, dependency names)
+    """
+    by_source = {}
+    stage_of = {}
+    for sheet in manifest["sheets"]:
+        sheets = by_source.setdefault(sheet["source"], [])
+        sheets.append(sheet)
+        stage_of[sheet["name"]] = sheets[0]["name"]
+
+    stages = {}
+    for source, sheets in by_source.items():
+        deps = sorted({stage_of.get(dep, dep) for sheet in sheets for dep in sheet.get("after", [])}
+                      - {sheets[0]["name"]})
+        stages[sheets[0]["name"]] = (partial(process_source, source, sheets, manifest["dirs"],
+                                             stream=stream, scale=scale), deps)
+    return stages
+
+
+def select_stages(stages, names):
+    """
+    Stages in names plus every stage that (transitively) depends on them
+
+    Dependencies outside the selection are treated as already built.
+    """
+    selected = set(names)
+    while True:
+        more = {name for name, (_, deps) in stages.items() if selected & set(deps)} - selected
+        if not more:
+            break
+        selected |= more
+    return {name: (fn, [dep for dep in deps if dep in selected])
+            for name, (fn, deps) in stages.items() if name in selected}
+
+
+def watch_sheets(manifest_path, trim, stream, scale, jobs):
+    """Re-run the stages of changed source sheets (all stages when the manifest changes)"""
+    base_path = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    manifest_path = os.path.abspath(manifest_path)
+
+    def load():
+        manifest = load_manifest(manifest_path)
+        if trim:
+            for sheet in manifest["sheets"]:
+                sheet["trim"] = True
+        return manifest
+
+    def inputs():
+        sources = {os.path.join(base_path, sheet["source"]) for sheet in load_manifest(manifest_path)["sheets"]}
+        return [manifest_path] + sorted(sources)
+
+    def rebuild(changed):
+        stages = build_stages(load(), stream, scale)
+        if manifest_path not in changed:
+            stages = select_stages(stages, [name for name, (fn, _) in stages.items()
+                                            if os.path.join(base_path, fn.args[0]) in changed])
+        run_stages(stages, min(jobs, len(stages)))  # One changed sheet runs in-process, no pool start-up
+
+    watch.watch(inputs, rebuild)
+
+
+def _init_worker(cell_jobs, force, optimize, tiers, trace):
+    """Process pool initializer: share the cell thread budget between workers"""
+    global CELL_JOBS, FORCE_REBUILD, OPTIMIZE_PNG, TIERS
+    CELL_JOBS = cell_jobs
+    FORCE_REBUILD = force
+    OPTIMIZE_PNG = optimize
+    TIERS = tiers
+    tracing.enable(trace)
+
+
+def run_stage(name, fn):
+    """Run one stage inside its trace span"""
+    with tracing.span(name, "stage"):
+        return fn()
+
+
+def run_stages(stages, jobs):
+    """
+    Run pipeline stages on a process pool, respecting their dependencies
+
+    Args:
+        stages: Dict of stage name -> (function, dependency names)
+        jobs: Number of worker processes (1 runs everything in this process)
+
+    Returns:
+        Dict of stage name -> value returned by the stage function
+    """
+    for name, (_, deps) in stages.items():
+        for dep in deps:
+            if dep not in stages:
+                raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+    done = {}
+    pending = dict(stages)
+
+    def ready():
+        return [name for name, (_, deps) in pending.items() if all(d in done for d in deps)]
+
+    if jobs <= 1:
+        while pending:
+            batch = ready()
+            if not batch:
+                raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+            for name in batch:
+                done[name] = run_stage(name, pending.pop(name)[0])
+        return done
+
+    cell_jobs = max(1, (os.cpu_count() or 1) // jobs)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(cell_jobs, FORCE_REBUILD, OPTIMIZE_PNG, TIERS, tracing.ENABLED)) as pool:
+        running = {}
+        while pending or running:
+            for name in ready():
+                running[pool.submit(tracing.call, run_stage, name, pending.pop(name)[0])] = name
+            if not running:
+                raise ValueError(f"Dependency cycle between stages: {sorted(pending)}")
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                done[running.pop(future)], events = future.result()  # Re-raises worker errors
+                tracing.extend(events)
+    return done
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Split Roboclaust sprite sheets into PNGs")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1,
+                        help="Worker processes for independent sheets (default: CPU count)")
+    parser.add_argument("--manifest", default=MANIFEST_PATH,
+                        help="Sheet manifest to execute (default: tools/asset_sheets.json)")
+    parser.add_argument("--force", action="store_true",
+                        help="Ignore the build cache and re-split every sheet")
+    parser.add_argument("--trim", action="store_true",
+                        help="Crop every cell to its content bounding box (writes .trim.json sidecars)")
+    parser.add_argument("--stream", action="store_true",
+                        help="Decode and write one row band of cells at a time (bounded memory for huge sheets)")
+    parser.add_argument("--preview", type=int, choices=PREVIEW_SCALES, default=1, metavar="N",
+                        help="Fast 1/N scale run (2, 4 or 8) written to tools/.build_cache/preview_N")
+    parser.add_argument("--optimize", action="store_true",
+                        help="Write the smallest lossless PNGs (indexed when <= 256 colours, slower)")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep running and re-split sheets when they or the manifest are saved")
+    parser.add_argument("--tiers", metavar="SCALES", default="",
+                        help="Also write texture tiers, e.g. 0.5,2 (integer upscales, 1/integer downscales)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="Record timing spans, write them as Chrome trace JSON and print a summary")
+    args = parser.parse_args()
+    tracing.enable(bool(args.trace))
+
+    global FORCE_REBUILD, OPTIMIZE_PNG, TIERS
+    FORCE_REBUILD = args.force
+    OPTIMIZE_PNG = args.optimize
+    try:
+        TIERS = texture_tiers.parse_tiers(args.tiers)
+    except ValueError as error:
+        parser.error(str(error))
+
     print("=" * 60)
     print("Roboclaust Asset Splitter")
     print("=" * 60)
@@ -275,23 +671,35 @@ def main():
     # Create all directories
     create_directories()
 
+    manifest = load_manifest(args.manifest)
+    if args.trim:
+        for sheet in manifest["sheets"]:
+            sheet["trim"] = True
+
     # Process all sprite sheets
-    process_player()
-    process_drones()
-    process_boss()
-    process_effects()
-    process_projectiles()
-    process_weapons()
-    process_materials()
-    process_drugs()
-    process_map_tiles()
+    results = run_stages(build_stages(manifest, args.stream, args.preview), args.jobs)
+
+    pixel_cache.prune()
+    if TIERS and args.preview == 1:
+        texture_tiers.print_manifest(texture_tiers.write_manifest())
 
     print("=" * 60)
     print("Asset splitting complete!")
+    pixels_saved = sum((result or {}).get("pixels_saved", 0) for result in results.values())
+    if pixels_saved:
+        print(f"Trimming saved {pixels_saved} pixels ({pixels_saved * 4 / 1024:.0f} KiB of RGBA8)")
     print("=" * 60)
+    if args.trace:
+        tracing.write_chrome(args.trace)
+        tracing.print_summary()
+        print(f"Trace written to {args.trace} (open in chrome://tracing or ui.perfetto.dev)")
+    if args.watch:
+        FORCE_REBUILD = False  # --force only applies to the first run
+        watch_sheets(args.manifest, args.trim, args.stream, args.preview, args.jobs)
+        return
     print("\nNext steps:")
-    print("1. Open Godot and reimport all PNG files")
-    print("2. Set import settings: Filter = Nearest, Mipmaps = Off")
+    print("1. Run python tools/import_sidecars.py to write pixel-art .import files (Mipmaps = Off)")
+    print("2. Open Godot once so it builds the imported textures")
     print("3. Create SpriteFrames resources for animated sprites")
     print("4. Enable use_sprites = true in enemy.gd, player.gd, boss_enemy.gd")
 
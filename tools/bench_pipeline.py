@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Asset Pipeline Benchmark for Roboclaust
+Runs each pipeline stage against synthetic sheets of growing size and
+records wall time, CPU time, peak RSS and bytes written.
+
+Every (stage, size) run happens in a fresh subprocess so peak RSS belongs
+to that run alone. Fixtures are generated with NumPy, so no real art is needed.
+The baseline is tracked in tools/bench_baseline.json so checkouts and CI
+compare against the same numbers; fixtures and results are scratch files in
+tools/.build_cache/bench.
+
+Usage:
+    python tools/bench_pipeline.py                          # 512..4096 px, compare to baseline
+    python tools/bench_pipeline.py --sizes 512 8192 16384   # up to 16k px (needs several GB of RAM)
+    python tools/bench_pipeline.py --save-baseline          # accept the current numbers (commit the file)
+    python tools/bench_pipeline.py --stages split --threshold 0.25
+"""
+
+from PIL import Image
+import numpy as np
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+TOOLS_DIR = os.path.dirname(os.path.abspath(__file__))
+BASE_PATH = os.path.dirname(TOOLS_DIR)
+BENCH_DIR = os.path.join(TOOLS_DIR, ".build_cache", "bench")  # Scratch: fixtures, latest results
+BASELINE_PATH = os.path.join(TOOLS_DIR, "bench_baseline.json")
+
+STAGES = ["split", "transparency", "generate"]
+DEFAULT_SIZES = [512, 1024, 2048, 4096]
+GRID = 4  # Fixture sheets are GRID x GRID cells
+
+# Metrics compared against the baseline, with the absolute change ignored as noise
+METRICS = {"wall_s": 0.05, "cpu_s": 0.05, "peak_rss_mb": 8, "bytes_written": 4096}
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+
+def make_fixture(size, seed=0):
+    """
+    Synthetic sprite sheet: GRID x GRID cells of shaded discs on a white background
+
+    Returns:
+        RGB uint8 array of shape (size, size, 3)
+    """
+    rng = np.random.default_rng(seed + size)
+    sheet = np.full((size, size, 3), 255, dtype=np.uint8)
+    cell = size // GRID
+    yy, xx = np.mgrid[0:cell, 0:cell]
+    dist = np.hypot(xx - cell / 2, yy - cell / 2) / (cell / 2)
+    disc = dist < 0.7
+    for row in range(GRID):
+        for col in range(GRID):
+            color = rng.integers(40, 220, 3)
+            shade = (1.0 - 0.5 * dist[..., None]) * color
+            block = sheet[row * cell:(row + 1) * cell, col * cell:(col + 1) * cell]
+            block[disc] = shade[disc].astype(np.uint8)
+    return sheet
+
+
+def write_fixtures(sizes, fixture_dir):
+    """Write sheet_<size>.jpg (splitter input) and sheet_<size>.png (transparency input)"""
+    os.makedirs(fixture_dir, exist_ok=True)
+    for size in sizes:
+        jpg = os.path.join(fixture_dir, f"sheet_{size}.jpg")
+        png = os.path.join(fixture_dir, f"sheet_{size}.png")
+        if os.path.exists(jpg) and os.path.exists(png):
+            continue
+        image = Image.fromarray(make_fixture(size), "RGB")
+        image.save(jpg, "JPEG", quality=90)
+        image.convert("RGBA").save(png, "PNG", compress_level=1)
+        del image
+
+
+# ============================================================================
+# STAGES (run inside the child process)
+# ============================================================================
+
+def stage_split(size, fixture_dir, out_dir):
+    import asset_splitter
+    asset_splitter.CACHE_DIR = os.path.join(out_dir, ".cache")
+    asset_splitter.FORCE_REBUILD = True
+    names = [f"cell_{i:02d}" for i in range(GRID * GRID)]
+    asset_splitter.split_sprite_sheet(os.path.join(fixture_dir, f"sheet_{size}.jpg"),
+                                      out_dir, GRID, GRID, names)
+    shutil.rmtree(asset_splitter.CACHE_DIR, ignore_errors=True)
+
+
+def stage_transparency(size, fixture_dir, out_dir):
+    sys.path.insert(0, BASE_PATH)
+    import fix_sprite_transparency
+    source = os.path.join(out_dir, "sheet.png")
+    shutil.copyfile(os.path.join(fixture_dir, f"sheet_{size}.png"), source)
+    fix_sprite_transparency.process_file(source, json_dir=out_dir, quiet=True)
+    os.remove(source)  # Input, not output
+
+
+def stage_generate(size, fixture_dir, out_dir):
+    import generate_roboclaust_assets as generator
+    import patterns
+    tile = patterns.canvas(size, size, (70, 70, 78, 255))
+    patterns.add_noise(tile, (140, 60, 30, 255), density=0.02, seed=17)
+    patterns.to_image(tile).save(os.path.join(out_dir, "noise_tile.png"), "PNG")
+    # 8 frames of size/8 px: a strip as wide as the fixture
+    sheet = generator.explosion_sheet((255, 180, 40, 255), (255, 240, 120, 255),
+                                      frames=8, size=max(16, size // 8))
+    sheet.save(os.path.join(out_dir, "explosion.png"), "PNG")
+
+
+STAGE_FUNCTIONS = {"split": stage_split, "transparency": stage_transparency,
+                   "generate": stage_generate}
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB (None without /proc or the resource module)"""
+    try:
+        # ru_maxrss survives exec on Linux, so it would report the driver's fixture generation
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return round(int(line.split()[1]) / 1024, 1)
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def dir_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, name))
+               for root, _, files in os.walk(path) for name in files)
+
+
+def run_one(stage, size, fixture_dir, out_dir):
+    """Child process entry point: run one stage and print its metrics as JSON"""
+    sys.path.insert(0, TOOLS_DIR)
+    import pixel_cache
+    pixel_cache.CACHE_DIR = os.path.join(out_dir, ".pixels")  # Cold every run, and its writes count as output
+    os.makedirs(out_dir, exist_ok=True)
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        STAGE_FUNCTIONS[stage](size, fixture_dir, out_dir)
+    metrics = {
+        "wall_s": round(time.perf_counter() - wall_start, 4),
+        "cpu_s": round(time.process_time() - cpu_start, 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "bytes_written": dir_bytes(out_dir),
+    }
+    print(json.dumps(metrics))
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+
+def measure(stage, size, fixture_dir, work_dir, repeat):
+    """
+    Run a stage repeat times in fresh processes
+
+    Returns:
+        Metrics dict: best wall/CPU time, lowest peak RSS, bytes of the last run
+    """
+    runs = []
+    for attempt in range(repeat):
+        out_dir = os.path.join(work_dir, f"{stage}_{size}_{attempt}")
+        result = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--run-one", stage, str(size), fixture_dir, out_dir],
+            capture_output=True, text=True)
+        shutil.rmtree(out_dir, ignore_errors=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"{stage} @ {size}px failed:\n{result.stderr}")
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    best = {key: min(run[key] for run in runs) for key in ("wall_s", "cpu_s")}
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    best["peak_rss_mb"] = min(rss) if rss else None
+    best["bytes_written"] = runs[-1]["bytes_written"]
+    return best
+
+
+def compare(results, baseline, threshold):
+    """
+    Compare results against a baseline
+
+    Returns:
+        List of regression messages (empty when everything is within threshold)
+    """
+    regressions = []
+    for key, metrics in results.items():
+        old = baseline.get(key)
+        if not old:
+            continue
+        for metric, noise in METRICS.items():
+            before, after = old.get(metric), metrics.get(metric)
+            if before is None or after is None:
+                continue
+            if after - before > max(before * threshold, noise):
+                regressions.append(f"{key} {metric}: {before} -> {after} "
+                                   f"(+{(after - before) / before * 100 if before else float('inf'):.0f}%)")
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"{'stage @ size':<22} {'wall s':>8} {'cpu s':>8} {'peak MB':>9} {'bytes':>12} {'wall vs base':>13}")
+    for key, metrics in results.items():
+        old = baseline.get(key, {}).get("wall_s")
+        delta = f"{(metrics['wall_s'] - old) / old * 100:+.0f}%" if old else "-"
+        rss = metrics["peak_rss_mb"] if metrics["peak_rss_mb"] is not None else "n/a"
+        print(f"{key:<22} {metrics['wall_s']:>8.3f} {metrics['cpu_s']:>8.3f} {rss:>9} "
+              f"{metrics['bytes_written']:>12} {delta:>13}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Python asset pipeline")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Fixture sheet sizes in px (default: %(default)s)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per stage, best is kept (default: 3)")
+    parser.add_argument("--output", default=os.path.join(BENCH_DIR, "results.json"))
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed relative increase before a metric counts as a regression (default: 0.15)")
+    parser.add_argument("--save-baseline", action="store_true", help="Store these results as the new baseline")
+    parser.add_argument("--run-one", nargs=4, metavar=("STAGE", "SIZE", "FIXTURES", "OUT"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_one:
+        stage, size, fixture_dir, out_dir = args.run_one
+        run_one(stage, int(size), fixture_dir, out_dir)
+        return
+
+    print("=" * 60)
+    print("Roboclaust Asset Pipeline Benchmark")
+    print("=" * 60)
+
+    fixture_dir = os.path.join(BENCH_DIR, "fixtures")
+    print(f"Fixtures: {', '.join(f'{size}px' for size in args.sizes)} -> {fixture_dir}")
+    write_fixtures(args.sizes, fixture_dir)
+
+    results = {}
+    work_dir = tempfile.mkdtemp(prefix="roboclaust_bench_")
+    try:
+        for stage in args.stages:
+            for size in args.sizes:
+                key = f"{stage}@{size}"
+                print(f"  {key} ...", flush=True)
+                results[key] = measure(stage, size, fixture_dir, work_dir, args.repeat)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    print()
+    print_table(results, baseline)
+    print(f"\nResults: {args.output}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({**baseline, **results}, f, indent=2)
+            f.write("\n")
+        print(f"Baseline saved: {args.baseline}")
+        return
+    if not baseline:
+        print("No baseline yet - run with --save-baseline to create one")
+        return
+
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) past {args.threshold:.0%}:")
+        for line in regressions:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nNo regressions past {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Sprite Sheet Layout Detector for Roboclaust
+Finds cell boundaries from row and column projection profiles, so new
+sheets don't need hand-counted grids.
+
+Background is transparent pixels plus the colours found on the sheet border
+(solid fills, baked checkerboards, JPEG noise around them). Rows of the sheet
+are split at horizontal gutters, then every row band is split at its own
+vertical gutters, so ragged layouts (4 frames on top, 2 centred below) are
+found too. Frames that touch, without a gutter between them, can't be told apart.
+
+The proposed layout is a sheet entry for asset_sheets.json:
+    "grid": [cols, rows]        when every frame sits inside one cell of a regular
+                                grid (empty cells become "skip" names)
+    "cells": [[l, t, r, b], ..] otherwise: one box per frame, all the size of the largest
+                                frame and centred on their frame (SpriteFrames want equal
+                                frames), shrunk where that would overlap a neighbour;
+                                --gutter-boxes splits at gutter midpoints instead
+    "size": [w, h]              with the sheet size the boxes were measured on
+
+Usage:
+    python tools/detect_grid.py assets/new-sheet.jpg                     # print the layout
+    python tools/detect_grid.py assets/new-sheet.jpg --add new_sheet --dir enemies   # onboard it
+    python tools/detect_grid.py sheet.png --overlay boxes.png            # draw the boxes to check them
+"""
+
+from PIL import Image, ImageDraw
+import numpy as np
+import argparse
+import json
+import os
+import re
+
+from asset_splitter import MANIFEST_PATH, load_manifest
+import pixel_cache
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+COLOR_SHIFT = 5  # Colours are compared in 3-bit-per-channel bins, which absorbs JPEG noise
+BORDER_SHARE = 0.005  # Border colours covering at least this share of the border are background
+MIN_FILL = 0.002  # A line with fewer content pixels than this share of its length is empty
+MIN_GAP = 3  # Gutters narrower than this (px) don't split
+MIN_SIZE = 8  # Content runs shorter than this (px) are specks, not frames
+MIN_PIXELS = 0.1  # Frames with fewer content pixels than this share of the biggest one are labels/specks
+PADDING = 2  # Empty pixels kept around the largest frame in equal-size cells
+
+
+def background_mask(rgba):
+    """
+    Background pixels of an (h, w, 4) uint8 array
+
+    Returns:
+        Boolean (h, w) mask: transparent, or a colour that is common on the sheet border
+    """
+    rgb = rgba[..., :3] >> COLOR_SHIFT
+    codes = (rgb[..., 0].astype(np.uint16) << 6) | (rgb[..., 1].astype(np.uint16) << 3) | rgb[..., 2]
+    border = np.concatenate([codes[0], codes[-1], codes[:, 0], codes[:, -1]])
+    counts = np.bincount(border, minlength=512)
+    palette = counts >= max(1, BORDER_SHARE * len(border))
+    return (rgba[..., 3] < 16) | palette[codes]
+
+
+def content_runs(profile, length):
+    """
+    Spans of a projection profile that hold content
+
+    Args:
+        profile: Content pixels per line
+        length: Pixels per line (for MIN_FILL)
+
+    Returns:
+        List of (start, end) with end exclusive, gaps < MIN_GAP merged, runs < MIN_SIZE dropped
+    """
+    filled = np.concatenate([[False], profile > max(1, MIN_FILL * length), [False]])
+    edges = np.flatnonzero(np.diff(filled.astype(np.int8)))
+    starts, ends = edges[0::2], edges[1::2]
+    if not len(starts):
+        return []
+    keep = np.concatenate([[True], starts[1:] - ends[:-1] >= MIN_GAP])  # Runs that start after a real gutter
+    starts = starts[keep]
+    ends = np.maximum.reduceat(ends, np.flatnonzero(keep))  # Merged runs end where their last piece ends
+    return [(int(s), int(e)) for s, e in zip(starts, ends) if e - s >= MIN_SIZE]
+
+
+def split_at_gutters(runs, length):
+    """Boundaries halfway through each gutter between runs; the outer ones are 0 and length"""
+    cuts = [0] + [(end + start) // 2 for (_, end), (start, _) in zip(runs, runs[1:])] + [length]
+    return list(zip(cuts, cuts[1:]))
+
+
+def detect(rgba):
+    """
+    Find the frames of a sheet
+
+    Returns:
+        List of rows, top to bottom; each a list of frames left to right as
+        dicts with "box" (cell split at gutter midpoints) and "content"
+        (tight bounding box), both (left, top, right, bottom), and "pixels"
+    """
+    height, width = rgba.shape[:2]
+    content = ~background_mask(rgba)
+
+    band_runs = content_runs(content.sum(axis=1), width)
+    rows = []
+    for (top, bottom), (run_top, run_bottom) in zip(split_at_gutters(band_runs, height), band_runs):
+        band = content[run_top:run_bottom]
+        column_runs = content_runs(band.sum(axis=0), run_bottom - run_top)
+        frames = []
+        for (left, right), (run_left, run_right) in zip(split_at_gutters(column_runs, width), column_runs):
+            cell = band[:, run_left:run_right]
+            filled = np.flatnonzero(cell.any(axis=1))
+            frames.append({"box": (left, top, right, bottom), "pixels": int(np.count_nonzero(cell)),
+                           "content": (run_left, run_top + int(filled[0]), run_right, run_top + int(filled[-1]) + 1)})
+        rows.append(frames)
+
+    biggest = max((frame["pixels"] for row in rows for frame in row), default=0)
+    rows = [[frame for frame in row if frame["pixels"] >= MIN_PIXELS * biggest] for row in rows]
+    return [row for row in rows if row]
+
+
+def fit_grid(rows, size):
+    """
+    Fit the frames to a regular grid (the splitter's width // cols cells)
+
+    Returns:
+        (cols, rows, occupied cell indices) or None when some frame crosses a cell edge
+    """
+    cols = max(len(row) for row in rows)
+    cell_width, cell_height = size[0] // cols, size[1] // len(rows)
+    occupied = []
+    for frame in (frame for row in rows for frame in row):
+        left, top, right, bottom = frame["content"]
+        col, row = left // cell_width, top // cell_height
+        if (right - 1) // cell_width != col or (bottom - 1) // cell_height != row or col >= cols:
+            return None
+        occupied.append(row * cols + col)
+    if len(set(occupied)) != len(occupied):
+        return None
+    return cols, len(rows), occupied
+
+
+def equal_boxes(frames, size):
+    """
+    Boxes of the largest frame's size (plus PADDING), centred on every frame
+
+    Each box is shifted, then if need be clipped, into its frame's gutter split,
+    so neighbours never overlap: frames too close together for the common size
+    get a smaller box.
+    """
+    content = np.array([frame["content"] for frame in frames])
+    gutter = np.array([frame["box"] for frame in frames])
+    extent = (content[:, 2:] - content[:, :2]).max(axis=0) + 2 * PADDING
+    extent = np.minimum(extent, size)
+    origin = (content[:, :2] + content[:, 2:] - extent) // 2
+    origin = np.maximum(np.minimum(origin, gutter[:, 2:] - extent), gutter[:, :2])
+    end = np.minimum(origin + extent, gutter[:, 2:])
+    return np.concatenate([origin, end], axis=1).tolist()
+
+
+def propose_layout(rgba, name=None, gutter_boxes=False):
+    """
+    Sheet layout the splitter can consume
+
+    Args:
+        rgba: (h, w, 4) uint8 array of the sheet
+        name: Base name for the cells (<name>_00, <name>_01, ...); default "cell"
+        gutter_boxes: Irregular sheets: split at gutter midpoints instead of equal-size cells
+
+    Returns:
+        Dict with "grid" or "cells"/"size", plus "names" or "names_pattern";
+        "cells" layouts also get "rows" (frames per row), which is only
+        reported and is left out of the manifest entry
+    """
+    rows = detect(rgba)
+    if not rows:
+        raise ValueError("No frames found - is the whole sheet one colour?")
+    size = [int(rgba.shape[1]), int(rgba.shape[0])]
+    prefix = name or "cell"
+
+    grid = fit_grid(rows, size)
+    if grid:
+        cols, row_count, occupied = grid
+        if len(occupied) == cols * row_count:
+            return {"grid": [cols, row_count], "names_pattern": prefix + "_{index:02d}"}
+        names = ["skip"] * (max(occupied) + 1)  # Cells after the last name are not split
+        for number, index in enumerate(sorted(occupied)):
+            names[index] = f"{prefix}_{number:02d}"
+        return {"grid": [cols, row_count], "names": names}
+
+    frames = [frame for row in rows for frame in row]
+    cells = [list(frame["box"]) for frame in frames] if gutter_boxes else equal_boxes(frames, size)
+    return {"size": size, "cells": cells, "names_pattern": prefix + "_{index:02d}",
+            "rows": [len(row) for row in rows]}
+
+
+def draw_overlay(img, layout, path):
+    """Save the sheet with the proposed cell boxes drawn on it"""
+    overlay = img.convert("RGBA")
+    draw = ImageDraw.Draw(overlay)
+    if "cells" in layout:
+        boxes = layout["cells"]
+    else:
+        cols, rows = layout["grid"]
+        width, height = overlay.width // cols, overlay.height // rows
+        boxes = [(c * width, r * height, (c + 1) * width, (r + 1) * height) for r in range(rows) for c in range(cols)]
+    for box in boxes:
+        draw.rectangle((box[0], box[1], box[2] - 1, box[3] - 1), outline=(255, 0, 255, 255), width=2)
+    overlay.save(path)
+
+
+def format_entry(entry, indent="    "):
+    """Sheet entry as JSON in the manifest's style: one key per line, short lists inline"""
+    text = json.dumps(entry, indent=2)
+    text = re.sub(r"\[\s*([^\[\]{}]*?)\s*\]", lambda m: "[" + re.sub(r",\s+", ", ", m.group(1)) + "]", text)
+    return "\n".join(indent + line for line in text.splitlines())
+
+
+def add_to_manifest(source, name, directory, layout, manifest_path=MANIFEST_PATH):
+    """
+    Append a sheet entry to the manifest
+
+    The entry is inserted as text, so the hand formatting of the other entries survives.
+    """
+    manifest = load_manifest(manifest_path)
+    if directory not in manifest["dirs"]:
+        raise SystemExit(f"Unknown output dir '{directory}', choose from: {', '.join(manifest['dirs'])}")
+    if any(sheet["name"] == name for sheet in manifest["sheets"]):
+        raise SystemExit(f"A sheet named '{name}' is already in {manifest_path}")
+    entry = {"name": name, "source": source, "dir": directory}
+    entry.update({key: value for key, value in layout.items() if key != "rows"})
+
+    with open(manifest_path, encoding="utf-8") as f:
+        text = f.read()
+    end = text.rindex("]", 0, text.rindex("}"))  # Closing bracket of "sheets"
+    body = text[:end].rstrip()
+    separator = "" if body.endswith("[") else ","
+    text = f"{body}{separator}\n{format_entry(entry)}\n  {text[end:]}"
+    json.loads(text)  # Never leave a broken manifest behind
+    with open(manifest_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write(text)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Detect the frame layout of a sprite sheet")
+    parser.add_argument("sheet", help="Sprite sheet image")
+    parser.add_argument("--add", metavar="NAME", help="Add the sheet to asset_sheets.json under this name")
+    parser.add_argument("--dir", help="Output dir key for --add (see \"dirs\" in the manifest)")
+    parser.add_argument("--manifest", default=MANIFEST_PATH,
+                        help="Sheet manifest --add writes to (default: tools/asset_sheets.json)")
+    parser.add_argument("--overlay", metavar="PNG", help="Write the sheet with the proposed boxes drawn on it")
+    parser.add_argument("--gutter-boxes", action="store_true",
+                        help="Irregular sheets: cut at gutter midpoints instead of equal-size cells")
+    args = parser.parse_args()
+    if args.add and not args.dir:
+        parser.error("--add needs --dir")
+
+    rgba = pixel_cache.load_rgba(args.sheet, store=False)  # Analysis only, never adds cache entries
+    layout = propose_layout(rgba, args.add, args.gutter_boxes)
+    frames = sum(layout.get("rows", [])) or sum(name != "skip" for name in layout.get("names", [])) \
+        or layout["grid"][0] * layout["grid"][1]
+    shape = f"grid {layout['grid'][0]}x{layout['grid'][1]}" if "grid" in layout \
+        else "ragged rows " + " + ".join(map(str, layout["rows"]))
+    print(f"{args.sheet}: {rgba.shape[1]}x{rgba.shape[0]}, {frames} frames, {shape}")
+    print(json.dumps(layout))
+
+    if args.overlay:
+        draw_overlay(Image.fromarray(np.asarray(rgba)), layout, args.overlay)
+        print(f"Overlay written to {args.overlay}")
+    if args.add:
+        source = os.path.relpath(os.path.abspath(args.sheet), BASE_PATH).replace(os.sep, "/")
+        add_to_manifest(source, args.add, args.dir, layout, args.manifest)
+        print(f"Added '{args.add}' to {args.manifest}; run python tools/asset_splitter.py to split it")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,41 @@
 # Re-create all Roboclaust assets (static + animated) due to expired session.
 # Outputs:
 # - assets/sprites/ (PNGs)
-# - assets/anim/ (animated sheets)
+# - assets/anim/ (animated sheets + SpriteFrames .tres)
+#
+# Every asset is a named producer registered with @asset; nothing is drawn
+# at import time. Build everything, or only some targets:
+#   python tools/generate_roboclaust_assets.py
+#   python tools/generate_roboclaust_assets.py --only "drone_*" --only explosion_generic
+#   python tools/generate_roboclaust_assets.py --list
+#   python tools/generate_roboclaust_assets.py --watch   # rebuild what an edit to this script/patterns/compositor affects
+#   python tools/generate_roboclaust_assets.py --tiers 0.5,2   # also assets/tiers/<tier>/ copies (texture_tiers.py)
+#   python tools/generate_roboclaust_assets.py --trace trace.json   # spans per asset/strip/file, Chrome trace JSON
 from PIL import Image, ImageDraw, ImageFont
-import os, math, zipfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+import argparse, fnmatch, importlib.util, os, math, re, sys, zipfile
+import patterns as pt
+from compositor import Compositor, layer, place, over
+from optimize_png import encode_smallest
+import pixel_cache
+import texture_tiers
+import tracing
+import watch
 
 # -------------------- Helpers --------------------
 def img(size, color=(0,0,0,0)): return Image.new("RGBA", size, color)
-def save(im, path): os.makedirs(os.path.dirname(path), exist_ok=True); im.save(path, "PNG"); return path
-def add_noise(draw, w, h, color, density=0.05, seed=7):
-    import random
-    rnd = random.Random(seed)
-    for _ in range(int(w*h*density)):
-        x = rnd.randrange(0,w); y = rnd.randrange(0,h)
-        draw.point((x,y), fill=color)
+OPTIMIZE_PNG = False  # --optimize: indexed, recompressed PNGs via optimize_png.encode_smallest
+TIERS = []  # --tiers: texture_tiers scales written next to every PNG/.tres
+def save(im, path):
+    """Encode once; the pixels go to pixel_cache so later tools don't decode the PNG again"""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    encode = encode_smallest if OPTIMIZE_PNG else None
+    with tracing.span("save", "file", file=path) as trace_args:
+        trace_args["bytes"] = len(pixel_cache.save(im, path, encode))
+    if TIERS:
+        with tracing.span("tiers", "file", file=path): texture_tiers.save_tiers(im, path, TIERS, encode)
+    return path
 
 # Palette
 BLACK=(0,0,0,255); WHITE=(255,255,255,255)
@@ -23,25 +45,47 @@ RED=(220,40,40,255); DARK_RED=(140,10,10,255)
 BROWN=(120,70,50,255); ORANGE=(255,140,0,255)
 YELLOW=(255,220,0,255); GREEN=(80,200,120,255)
 
+# -------------------- Registry --------------------
+PRODUCERS = {}  # name -> (function, dependency names)
+def asset(name, deps=()):
+    """Register a producer; it is called with the results of its dependencies."""
+    def register(fn): PRODUCERS[name] = (fn, tuple(deps)); return fn
+    return register
+def build(name, built):
+    """Build name (and its dependencies) once, memoized in built."""
+    if name not in built:
+        fn, deps = PRODUCERS[name]
+        args = [build(dep, built) for dep in deps]
+        with tracing.span(name, "asset"): built[name] = fn(*args)  # Dependencies get their own spans
+    return built[name]
+def select(patterns):
+    """Producer names matching any glob pattern, in registration order."""
+    names = [n for n in PRODUCERS if any(fnmatch.fnmatchcase(n, p) for p in patterns)]
+    unknown = [p for p in patterns if not any(fnmatch.fnmatchcase(n, p) for n in PRODUCERS)]
+    if unknown: raise SystemExit(f"No assets match: {', '.join(unknown)} (see --list)")
+    return names
+
 # -------------------- Static Pack --------------------
 base_dir = "assets/sprites"
-os.makedirs(base_dir, exist_ok=True)
+def save_static(im, name): save(im, f"{base_dir}/{name}"); return im
 
 # Player 64x64
-player = img((64,64))
-d = ImageDraw.Draw(player)
-d.rectangle((10,8,54,56), fill=DARK_GRAY, outline=BLACK)
-d.ellipse((22,4,42,20), fill=BLACK, outline=(10,10,10,255))
-d.rectangle((6,34,20,44), fill=(20,30,35,255), outline=BLACK)
-d.rectangle((8,36,18,42), outline=CYAN)
-d.rectangle((8,24,20,48), fill=GRAY, outline=BLACK)
-d.rectangle((44,24,56,48), fill=GRAY, outline=BLACK)
-d.rectangle((26,28,38,44), fill=(30,30,36,255), outline=(15,15,18,255))
-for x in range(12,53,3): d.point((x,32), fill=CYAN)
-for y in range(16,54,3): d.point((12,y), fill=CYAN); d.point((52,y), fill=CYAN)
-d.rectangle((20,52,28,58), fill=BLACK)
-d.rectangle((36,52,44,58), fill=BLACK)
-save(player, f"{base_dir}/player_hacker_64.png")
+@asset("player")
+def player_sprite():
+    player = img((64,64))
+    d = ImageDraw.Draw(player)
+    d.rectangle((10,8,54,56), fill=DARK_GRAY, outline=BLACK)
+    d.ellipse((22,4,42,20), fill=BLACK, outline=(10,10,10,255))
+    d.rectangle((6,34,20,44), fill=(20,30,35,255), outline=BLACK)
+    d.rectangle((8,36,18,42), outline=CYAN)
+    d.rectangle((8,24,20,48), fill=GRAY, outline=BLACK)
+    d.rectangle((44,24,56,48), fill=GRAY, outline=BLACK)
+    d.rectangle((26,28,38,44), fill=(30,30,36,255), outline=(15,15,18,255))
+    for x in range(12,53,3): d.point((x,32), fill=CYAN)
+    for y in range(16,54,3): d.point((12,y), fill=CYAN); d.point((52,y), fill=CYAN)
+    d.rectangle((20,52,28,58), fill=BLACK)
+    d.rectangle((36,52,44,58), fill=BLACK)
+    return save_static(player, "player_hacker_64.png")
 
 # Enemies 40x40
 def chassis_base(color, accent=None, size=(40,40), heavy=False, aero=False):
@@ -63,120 +107,183 @@ def chassis_base(color, accent=None, size=(40,40), heavy=False, aero=False):
         d.rectangle((w-14,12,w-8,h-12), fill=BLACK)
     return im
 
-std = chassis_base(RED, accent=WHITE); save(std, f"{base_dir}/enemy_drone_standard_40.png")
-fast = img((40,40)); fd = ImageDraw.Draw(fast)
-fd.polygon([(20,6),(30,14),(20,22),(10,14)], fill=NEON_BLUE, outline=BLACK)
-fd.polygon([(20,4),(32,14),(20,10)], fill=(0,120,150,255), outline=BLACK)
-fd.ellipse((18,12,22,16), fill=BLACK, outline=WHITE); save(fast, f"{base_dir}/enemy_drone_fast_40.png")
-heavy = chassis_base((100,40,30,255), accent=(200,120,80,255), heavy=True)
-ImageDraw.Draw(heavy).point((16,14), fill=YELLOW); save(heavy, f"{base_dir}/enemy_drone_heavy_40.png")
-kama = img((40,40)); kd=ImageDraw.Draw(kama)
-kd.rectangle((10,10,30,30), fill=ORANGE, outline=BLACK)
-kd.ellipse((16,16,24,24), fill=BLACK, outline=YELLOW); kd.line((24,16,28,10), fill=YELLOW, width=1)
-save(kama, f"{base_dir}/enemy_drone_kamikaze_40.png")
-snip = img((40,40)); sd=ImageDraw.Draw(snip)
-sd.rectangle((8,8,32,32), fill=(40,120,60,255), outline=BLACK)
-sd.rectangle((20,6,22,8), fill=BLACK); sd.rectangle((21,4,27,6), fill=BLACK)
-sd.ellipse((14,14,26,26), fill=BLACK, outline=WHITE); save(snip, f"{base_dir}/enemy_drone_sniper_40.png")
+@asset("enemy_standard")
+def enemy_standard():
+    std = chassis_base(RED, accent=WHITE); return save_static(std, "enemy_drone_standard_40.png")
+@asset("enemy_fast")
+def enemy_fast():
+    fast = img((40,40)); fd = ImageDraw.Draw(fast)
+    fd.polygon([(20,6),(30,14),(20,22),(10,14)], fill=NEON_BLUE, outline=BLACK)
+    fd.polygon([(20,4),(32,14),(20,10)], fill=(0,120,150,255), outline=BLACK)
+    fd.ellipse((18,12,22,16), fill=BLACK, outline=WHITE); return save_static(fast, "enemy_drone_fast_40.png")
+@asset("enemy_heavy")
+def enemy_heavy():
+    heavy = chassis_base((100,40,30,255), accent=(200,120,80,255), heavy=True)
+    ImageDraw.Draw(heavy).point((16,14), fill=YELLOW); return save_static(heavy, "enemy_drone_heavy_40.png")
+@asset("enemy_kamikaze")
+def enemy_kamikaze():
+    kama = img((40,40)); kd=ImageDraw.Draw(kama)
+    kd.rectangle((10,10,30,30), fill=ORANGE, outline=BLACK)
+    kd.ellipse((16,16,24,24), fill=BLACK, outline=YELLOW); kd.line((24,16,28,10), fill=YELLOW, width=1)
+    return save_static(kama, "enemy_drone_kamikaze_40.png")
+@asset("enemy_sniper")
+def enemy_sniper():
+    snip = img((40,40)); sd=ImageDraw.Draw(snip)
+    sd.rectangle((8,8,32,32), fill=(40,120,60,255), outline=BLACK)
+    sd.rectangle((20,6,22,8), fill=BLACK); sd.rectangle((21,4,27,6), fill=BLACK)
+    sd.ellipse((14,14,26,26), fill=BLACK, outline=WHITE); return save_static(snip, "enemy_drone_sniper_40.png")
 
 # Boss 128x128
-boss = img((128,128)); bd=ImageDraw.Draw(boss)
-bd.rectangle((20,24,108,100), fill=(120,0,0,255), outline=BLACK)
-bd.rectangle((48,8,80,28), fill=(60,0,0,255), outline=BLACK)
-bd.rectangle((10,44,24,88), fill=(50,50,55,255), outline=BLACK)
-bd.rectangle((104,44,118,88), fill=(50,50,55,255), outline=BLACK)
-bd.rectangle((36,96,56,120), fill=BLACK, outline=BLACK)
-bd.rectangle((72,96,92,120), fill=BLACK, outline=BLACK)
-for x in range(24,104,4): bd.point((x,62), fill=RED)
-bd.ellipse((58,56,70,68), fill=BLACK, outline=WHITE)
-save(boss, f"{base_dir}/boss_mech_128.png")
+@asset("boss")
+def boss_sprite():
+    boss = img((128,128)); bd=ImageDraw.Draw(boss)
+    bd.rectangle((20,24,108,100), fill=(120,0,0,255), outline=BLACK)
+    bd.rectangle((48,8,80,28), fill=(60,0,0,255), outline=BLACK)
+    bd.rectangle((10,44,24,88), fill=(50,50,55,255), outline=BLACK)
+    bd.rectangle((104,44,118,88), fill=(50,50,55,255), outline=BLACK)
+    bd.rectangle((36,96,56,120), fill=BLACK, outline=BLACK)
+    bd.rectangle((72,96,92,120), fill=BLACK, outline=BLACK)
+    for x in range(24,104,4): bd.point((x,62), fill=RED)
+    bd.ellipse((58,56,70,68), fill=BLACK, outline=WHITE)
+    return save_static(boss, "boss_mech_128.png")
 
 # Tiles 64x64
+# Tile patterns are NumPy array ops (tools/patterns.py), bit-identical to the ImageDraw loops
 def metal_tile(base=(70,70,78,255), rust=(140,60,30,255)):
-    t = img((64,64), base); d=ImageDraw.Draw(t)
-    d.line((0,32,64,32), fill=DARK_GRAY, width=1); d.line((32,0,32,64), fill=DARK_GRAY, width=1)
-    add_noise(d,64,64,rust,density=0.02,seed=17); d.rectangle((6,50,16,60), fill=(110,50,25,255))
-    return t
-save(metal_tile(), f"{base_dir}/tile_scrapyard_64.png")
-factory = img((64,64),(36,36,42,255)); df=ImageDraw.Draw(factory)
-for x in range(0,64,8): df.line((x,0,x,64), fill=(20,20,24,255), width=1)
-for y in range(0,64,8): df.line((0,y,64,y), fill=(24,24,28,255), width=1)
-add_noise(df,64,64,(60,60,66,255),density=0.02,seed=3); save(factory, f"{base_dir}/tile_factory_64.png")
-control = img((64,64),(20,24,30,255)); dc=ImageDraw.Draw(control)
-for x in range(6,60,10): dc.line((x,6,x,58), fill=CYAN, width=1)
-for y in range(10,60,10): dc.line((6,y,58,y), fill=CYAN, width=1)
-for x in range(8,60,10):
-    for y in range(8,60,10): dc.rectangle((x-1,y-1,x+1,y+1), fill=NEON_BLUE)
-save(control, f"{base_dir}/tile_control_center_64.png")
-server = img((64,64),(10,16,24,255)); ds=ImageDraw.Draw(server)
-for x in range(0,64,16):
-    ds.rectangle((x+2,6,x+14,58), fill=(14,22,34,255), outline=(6,10,16,255))
-    for y in range(10,56,8): ds.line((x+4,y,x+12,y), fill=NEON_BLUE, width=1)
-save(server, f"{base_dir}/tile_server_room_64.png")
+    t = pt.canvas(64,64, base)
+    pt.hlines(t, [32], 0, 64, DARK_GRAY); pt.vlines(t, [32], 0, 64, DARK_GRAY)
+    pt.add_noise(t, rust, density=0.02, seed=17); pt.fill_rects(t, [6], [50], 11, 11, (110,50,25,255))
+    return pt.to_image(t)
+@asset("tile_scrapyard")
+def tile_scrapyard(): return save_static(metal_tile(), "tile_scrapyard_64.png")
+@asset("tile_factory")
+def tile_factory():
+    factory = pt.canvas(64,64,(36,36,42,255))
+    pt.vlines(factory, range(0,64,8), 0, 64, (20,20,24,255))
+    pt.hlines(factory, range(0,64,8), 0, 64, (24,24,28,255))
+    pt.add_noise(factory, (60,60,66,255), density=0.02, seed=3); return save_static(pt.to_image(factory), "tile_factory_64.png")
+@asset("tile_control_center")
+def tile_control_center():
+    control = pt.canvas(64,64,(20,24,30,255))
+    pt.vlines(control, range(6,60,10), 6, 58, CYAN)
+    pt.hlines(control, range(10,60,10), 6, 58, CYAN)
+    pt.fill_rects(control, range(7,59,10), range(7,59,10), 3, 3, NEON_BLUE)
+    return save_static(pt.to_image(control), "tile_control_center_64.png")
+@asset("tile_server_room")
+def tile_server_room():
+    server = pt.canvas(64,64,(10,16,24,255)); racks = range(2,64,16)
+    pt.fill_rects(server, racks, [6], 13, 53, (14,22,34,255))
+    pt.outline_rects(server, racks, [6], 13, 53, (6,10,16,255))
+    for x in racks: pt.hlines(server, range(10,56,8), x+2, x+10, NEON_BLUE)
+    return save_static(pt.to_image(server), "tile_server_room_64.png")
 def wall_tile(orientation="horizontal"):
-    base = img((64,64),(50,8,8,255)); dw=ImageDraw.Draw(base); dw.rectangle((0,0,63,63), outline=BLACK)
-    if orientation=="horizontal":
-        for y in range(8,64,12): dw.rectangle((0,y,63,y+6), fill=(200,40,40,255)); dw.line((0,y+6,63,y+6), fill=BLACK)
-    else:
-        for x in range(8,64,12): dw.rectangle((x,0,x+6,63), fill=(200,40,40,255)); dw.line((x+6,0,x+6,63), fill=BLACK)
-    return base
-save(wall_tile("horizontal"), f"{base_dir}/tile_wall_warning_h_64.png")
-save(wall_tile("vertical"), f"{base_dir}/tile_wall_warning_v_64.png")
+    base = pt.canvas(64,64,(50,8,8,255)); pt.outline_rects(base, [0], [0], 64, 64, BLACK)
+    axis = 0 if orientation=="horizontal" else 1
+    pt.stripes(base, range(8,64,12), 7, (200,40,40,255), axis=axis)
+    pt.stripes(base, range(14,64,12), 1, BLACK, axis=axis)
+    return pt.to_image(base)
+@asset("tile_wall_warning_h")
+def tile_wall_warning_h(): return save_static(wall_tile("horizontal"), "tile_wall_warning_h_64.png")
+@asset("tile_wall_warning_v")
+def tile_wall_warning_v(): return save_static(wall_tile("vertical"), "tile_wall_warning_v_64.png")
 
 # Items 32x32
-health = img((32,32)); dh=ImageDraw.Draw(health)
-dh.rectangle((4,4,28,28), fill=(10,30,10,255), outline=BLACK)
-dh.rectangle((14,8,18,24), fill=WHITE); dh.rectangle((8,14,24,18), fill=WHITE)
-save(health, f"{base_dir}/item_health_32.png")
-scrap = img((32,32)); dscr=ImageDraw.Draw(scrap)
-dscr.rectangle((4,6,28,26), fill=(180,150,40,255), outline=BLACK)
-dscr.polygon([(6,24),(10,10),(16,12),(20,6),(26,14),(24,24)], fill=(230,200,80,255), outline=BLACK)
-save(scrap, f"{base_dir}/item_scrap_32.png")
-upgrade = img((32,32)); du=ImageDraw.Draw(upgrade)
-du.rectangle((4,4,28,28), fill=(180,80,20,255), outline=BLACK)
-du.polygon([(16,6),(22,16),(10,16)], fill=YELLOW, outline=BLACK)
-du.rectangle((12,18,20,22), fill=BLACK); du.rectangle((18,16,24,18), fill=BLACK)
-save(upgrade, f"{base_dir}/item_weapon_upgrade_32.png")
+@asset("item_health")
+def item_health():
+    health = img((32,32)); dh=ImageDraw.Draw(health)
+    dh.rectangle((4,4,28,28), fill=(10,30,10,255), outline=BLACK)
+    dh.rectangle((14,8,18,24), fill=WHITE); dh.rectangle((8,14,24,18), fill=WHITE)
+    return save_static(health, "item_health_32.png")
+@asset("item_scrap")
+def item_scrap():
+    scrap = img((32,32)); dscr=ImageDraw.Draw(scrap)
+    dscr.rectangle((4,6,28,26), fill=(180,150,40,255), outline=BLACK)
+    dscr.polygon([(6,24),(10,10),(16,12),(20,6),(26,14),(24,24)], fill=(230,200,80,255), outline=BLACK)
+    return save_static(scrap, "item_scrap_32.png")
+@asset("item_weapon_upgrade")
+def item_weapon_upgrade():
+    upgrade = img((32,32)); du=ImageDraw.Draw(upgrade)
+    du.rectangle((4,4,28,28), fill=(180,80,20,255), outline=BLACK)
+    du.polygon([(16,6),(22,16),(10,16)], fill=YELLOW, outline=BLACK)
+    du.rectangle((12,18,20,22), fill=BLACK); du.rectangle((18,16,24,18), fill=BLACK)
+    return save_static(upgrade, "item_weapon_upgrade_32.png")
 
 # Preview sheet
 def pad(im, size_bg=(72,72)):
     bg = Image.new("RGBA", size_bg, (15,18,22,255))
     x=(size_bg[0]-im.width)//2; y=(size_bg[1]-im.height)//2; bg.alpha_composite(im,(x,y)); return bg
-sections=[
-    ("Player 64x64",[player]),
-    ("Enemies 40x40",[std,fast,heavy,kama,snip]),
-    ("Boss 128x128",[boss]),
-    ("Tiles 64x64",[Image.open(f"{base_dir}/tile_scrapyard_64.png"),
-                    Image.open(f"{base_dir}/tile_factory_64.png"),
-                    Image.open(f"{base_dir}/tile_control_center_64.png"),
-                    Image.open(f"{base_dir}/tile_server_room_64.png"),
-                    Image.open(f"{base_dir}/tile_wall_warning_h_64.png"),
-                    Image.open(f"{base_dir}/tile_wall_warning_v_64.png")]),
-    ("Items 32x32",[health,scrap,upgrade]),
+PREVIEW_SECTIONS = [
+    ("Player 64x64", ["player"]),
+    ("Enemies 40x40", ["enemy_standard","enemy_fast","enemy_heavy","enemy_kamikaze","enemy_sniper"]),
+    ("Boss 128x128", ["boss"]),
+    ("Tiles 64x64", ["tile_scrapyard","tile_factory","tile_control_center","tile_server_room",
+                     "tile_wall_warning_h","tile_wall_warning_v"]),
+    ("Items 32x32", ["item_health","item_scrap","item_weapon_upgrade"]),
 ]
-cols=8; thumbs=[]
-for title, ims in sections:
-    banner = Image.new("RGBA",(cols*72,16),(0,0,0,220))
-    try:
-        font = ImageFont.load_default(); ImageDraw.Draw(banner).text((4,2), title, fill=WHITE, font=font)
-    except: pass
-    thumbs.append(banner)
-    row = Image.new("RGBA",(cols*72,72),(12,14,18,255)); x=0
-    for im in ims:
-        row.alpha_composite(pad(im)); x+=72
-    thumbs.append(row)
-H=sum(t.height for t in thumbs); atlas=Image.new("RGBA",(cols*72,H),(8,10,12,255)); y=0
-for t in thumbs: atlas.alpha_composite(t,(0,y)); y+=t.height
-save(atlas, f"{base_dir}/roboclaust_preview.png")
+@asset("preview", deps=[n for _, names in PREVIEW_SECTIONS for n in names])
+def preview(*images):
+    by_name = dict(zip(PRODUCERS["preview"][1], images))
+    sections = [(title, [by_name[n] for n in names]) for title, names in PREVIEW_SECTIONS]
+    cols=8; thumbs=[]
+    for title, ims in sections:
+        banner = Image.new("RGBA",(cols*72,16),(0,0,0,220))
+        try:
+            font = ImageFont.load_default(); ImageDraw.Draw(banner).text((4,2), title, fill=WHITE, font=font)
+        except: pass
+        thumbs.append(banner)
+        row = Image.new("RGBA",(cols*72,72),(12,14,18,255)); x=0
+        for im in ims:
+            row.alpha_composite(pad(im)); x+=72
+        thumbs.append(row)
+    H=sum(t.height for t in thumbs); atlas=Image.new("RGBA",(cols*72,H),(8,10,12,255)); y=0
+    for t in thumbs: atlas.alpha_composite(t,(0,y)); y+=t.height
+    return save_static(atlas, "roboclaust_preview.png")
 
 # -------------------- Animated Pack --------------------
-anim_dir = "assets/anim"; os.makedirs(anim_dir, exist_ok=True)
+anim_dir = "assets/anim"
 def new_rgba(w,h,c=(0,0,0,0)): return Image.new("RGBA",(w,h),c)
-def save_anim(im,name): p=f"{anim_dir}/{name}"; im.save(p,"PNG"); return p
+def animated(sheet, size, name, fps, frames=None, loop=True):
+    """Attach a SpriteFrames animation to a horizontal strip; save_anim emits the .tres."""
+    count = sheet.width//size[0]
+    sheet.info["frame_size"] = size
+    sheet.info.setdefault("animations", []).append(
+        {"name": name, "frames": list(range(count)) if frames is None else frames, "fps": fps, "loop": loop})
+    return sheet
+def sprite_frames_tres(png_res, size, animations):
+    w,h = size; used = sorted({i for a in animations for i in a["frames"]})
+    prefix = max(animations, key=lambda a: len(a["frames"]))["name"]
+    out = [f'[gd_resource type="SpriteFrames" load_steps={len(used)+2} format=3]', "",
+           f'[ext_resource type="Texture2D" path="{png_res}" id="1"]', ""]
+    for i in used:
+        out += [f'[sub_resource type="AtlasTexture" id="{prefix}_{i}"]', 'atlas = ExtResource("1")',
+                f"region = Rect2({i*w}, 0, {w}, {h})", ""]
+    anims = []
+    for a in animations:
+        frames = "\n}, {\n".join(f'"duration": 1.0,\n"texture": SubResource("{prefix}_{i}")' for i in a["frames"])
+        anims.append(f'"frames": [{{\n{frames}\n}}],\n"loop": {str(a["loop"]).lower()},\n'
+                     f'"name": &"{a["name"]}",\n"speed": {float(a["fps"])}')
+    out += ["[resource]", "animations = [{\n" + "\n}, {\n".join(anims) + "\n}]", ""]
+    return "\n".join(out)
+def save_anim(im,name,tres=None):
+    p=f"{anim_dir}/{name}"; save(im, p)
+    if "animations" in im.info:  # e.g. drone_fast_40x40_6f.png -> drone_fast.tres
+        tres = tres or re.sub(r"_\d+x\d+_\d+f$", "", os.path.splitext(name)[0]) + ".tres"
+        text = sprite_frames_tres(f"res://{p}", im.info["frame_size"], im.info["animations"])
+        with open(f"{anim_dir}/{tres}", "w", encoding="utf-8", newline="\n") as f: f.write(text)
+        texture_tiers.save_tres_tiers(text, f"{anim_dir}/{tres}", TIERS)
+    return p
+
+# Animated strips go through compositor.Compositor: static parts are drawn once as
+# layers, frames are keyed by the values that actually change and reused when equal.
+# *_frame(spec) builders are module-level so FRAME_POOL workers can unpickle them.
+FRAME_POOL = None  # ProcessPoolExecutor set by --jobs; None renders in this process
+def strip(size, specs, build_frame):
+    with tracing.span("strip", "frames", frames=len(specs), size=list(size)):
+        return Compositor(size).sheet(specs, build_frame, pool=FRAME_POOL)
 
 # Player walk 8f
-def draw_player_frame(phase):
-    im = new_rgba(64,64); d=ImageDraw.Draw(im); bob=int(2*math.sin(phase*2*math.pi))
+def draw_player_body(bob=0):
+    im = new_rgba(64,64); d=ImageDraw.Draw(im)
     d.rectangle((10,8+bob,54,56+bob), fill=DARK_GRAY, outline=BLACK)
     d.ellipse((22,4+bob,42,20+bob), fill=BLACK, outline=(10,10,10,255))
     d.rectangle((6,34+bob,20,44+bob), fill=(20,30,35,255), outline=BLACK)
@@ -186,15 +293,19 @@ def draw_player_frame(phase):
     d.rectangle((26,28+bob,38,44+bob), fill=(30,30,36,255), outline=(15,15,18,255))
     for x in range(12,53,3): d.point((x,32+bob), fill=CYAN)
     for y in range(16,54,3): d.point((12,y+bob), fill=CYAN); d.point((52,y+bob), fill=CYAN)
-    swing=int(4*math.sin(phase*2*math.pi))
-    d.rectangle((20+swing,52,28+swing,58), fill=BLACK)
-    d.rectangle((36-swing,52,44-swing,58), fill=BLACK)
     return im
-def make_sheet(draw_fn, frames, size):
-    w,h=size; out=new_rgba(w*frames,h)
-    for i in range(frames): out.alpha_composite(draw_fn(i/frames),(i*w,0))
-    return out
-player_sheet = make_sheet(draw_player_frame, 8, (64,64)); save_anim(player_sheet,"player_walk_64x64_8f.png")
+def draw_legs(fr, swing):
+    d=ImageDraw.Draw(fr); d.rectangle((20+swing,52,28+swing,58), fill=BLACK); d.rectangle((36-swing,52,44-swing,58), fill=BLACK)
+def player_frame(spec):
+    bob, swing = spec
+    return [place(layer("player_body", draw_player_body),(0,bob)), partial(draw_legs, swing=swing)]
+def player_walk_sheet(frames=8):
+    specs=[(int(2*math.sin(i/frames*2*math.pi)), int(4*math.sin(i/frames*2*math.pi))) for i in range(frames)]  # (bob, swing)
+    return animated(strip((64,64), specs, player_frame), (64,64), "walk", 8)
+@asset("player_walk")
+def player_walk():
+    player_sheet = animated(player_walk_sheet(), (64,64), "idle", 5, frames=[0])
+    save_anim(player_sheet,"player_walk_64x64_8f.png", tres="player_hacker.tres"); return player_sheet
 
 # Drones 6f rotor
 def draw_drone_body(kind):
@@ -226,66 +337,156 @@ def draw_rotor(im, angle_deg, radius=12, color=(0,0,0,200)):
         a=math.radians(angle_deg+mul); x=cx+int(math.cos(a)*radius); y=cy+int(math.sin(a)*radius)
         d.line((cx,cy,x,y), fill=color, width=2)
     d.ellipse((cx-3,cy-3,cx+3,cy+3), fill=(30,30,30,220))
-def drone_sheet(kind, frames=6):
-    w=h=40; sheet=new_rgba(w*frames,h)
-    for i in range(frames):
-        base=draw_drone_body(kind); bob=int(1*math.sin(i/frames*2*math.pi))
-        fr=new_rgba(w,h); fr.alpha_composite(base,(0,bob))
-        angle=(i*(360/frames))%360; draw_rotor(fr, angle, radius=14 if kind!="fast" else 10)
-        sheet.alpha_composite(fr,(i*w,0))
-    return sheet
+DRONE_FPS = {"standard":8, "fast":12, "heavy":6, "kamikaze":10, "sniper":8}
+def drone_frame(kind, spec):
+    bob, angle = spec
+    return [place(layer(("drone",kind), draw_drone_body, kind),(0,bob)),
+            partial(draw_rotor, angle_deg=angle, radius=14 if kind!="fast" else 10)]
+def drone_sheet(kind, frames=6, fps=None):
+    specs=[(int(1*math.sin(i/frames*2*math.pi)), (i*(360/frames))%360) for i in range(frames)]  # (bob, rotor angle)
+    return animated(strip((40,40), specs, partial(drone_frame, kind)), (40,40), "hover", fps or DRONE_FPS[kind])
+def drone_producer(kind):
+    def produce(): sheet=drone_sheet(kind); save_anim(sheet, f"drone_{kind}_40x40_6f.png"); return sheet
+    return produce
 for kind in ["standard","fast","heavy","kamikaze","sniper"]:
-    save_anim(drone_sheet(kind), f"drone_{kind}_40x40_6f.png")
+    asset(f"drone_{kind}")(drone_producer(kind))
 
 # Explosions 12f 64x64
-def explosion_sheet(inner, outer, frames=12, size=64):
-    w=h=size; sheet=new_rgba(w*frames,h); cx=cy=size//2
-    for i in range(frames):
-        t=i/(frames-1); fr=new_rgba(w,h); d=ImageDraw.Draw(fr)
-        r=int(4 + t*26); d.ellipse((cx-r,cy-r,cx+r,cy+r), outline=outer, width=2)
-        r2=int(max(0,10 - t*10));
-        if r2>0: d.ellipse((cx-r2,cy-r2,cx+r2,cy+r2), fill=inner, outline=(0,0,0,120))
-        n=10
-        for k in range(n):
-            ang = 2*math.pi*(k/n) + t*3; dist=int(8 + t*24 + (k%3))
-            x = cx + int(math.cos(ang)*dist); y = cy + int(math.sin(ang)*dist)
-            d.rectangle((x-1,y-1,x+1,y+1), fill=outer)
-        sheet.alpha_composite(fr,(i*w,0))
-    return sheet
-save_anim(explosion_sheet((255,180,40,255),(255,240,120,255)), "explosion_generic_64x64_12f.png")
-save_anim(explosion_sheet((255,170,0,255),(255,220,0,255)), "explosion_kamikaze_64x64_12f.png")
+def draw_explosion(fr, t, inner, outer):
+    d=ImageDraw.Draw(fr); cx=cy=fr.width//2
+    r=int(4 + t*26); d.ellipse((cx-r,cy-r,cx+r,cy+r), outline=outer, width=2)
+    r2=int(max(0,10 - t*10));
+    if r2>0: d.ellipse((cx-r2,cy-r2,cx+r2,cy+r2), fill=inner, outline=(0,0,0,120))
+    n=10
+    for k in range(n):
+        ang = 2*math.pi*(k/n) + t*3; dist=int(8 + t*24 + (k%3))
+        x = cx + int(math.cos(ang)*dist); y = cy + int(math.sin(ang)*dist)
+        d.rectangle((x-1,y-1,x+1,y+1), fill=outer)
+def explosion_frame(inner, outer, t): return [partial(draw_explosion, t=t, inner=inner, outer=outer)]
+def explosion_sheet(inner, outer, frames=12, size=64, fps=24):
+    specs=[i/(frames-1) for i in range(frames)]  # t
+    return animated(strip((size,size), specs, partial(explosion_frame, inner, outer)), (size,size), "explode", fps, loop=False)
+@asset("explosion_generic")
+def explosion_generic():
+    sheet=explosion_sheet((255,180,40,255),(255,240,120,255)); save_anim(sheet, "explosion_generic_64x64_12f.png"); return sheet
+@asset("explosion_kamikaze")
+def explosion_kamikaze():
+    sheet=explosion_sheet((255,170,0,255),(255,220,0,255)); save_anim(sheet, "explosion_kamikaze_64x64_12f.png"); return sheet
 
 # Boss core pulse 8f 128x128
-def boss_core_pulse(frames=8):
-    w=h=128; sheet=new_rgba(w*frames,h)
-    for i in range(frames):
-        phase=i/frames; base=new_rgba(128,128); bd=ImageDraw.Draw(base)
-        bd.rectangle((20,24,108,100), fill=(120,0,0,255), outline=BLACK)
-        bd.rectangle((48,8,80,28), fill=(60,0,0,255), outline=BLACK)
-        bd.rectangle((10,44,24,88), fill=(50,50,55,255), outline=BLACK)
-        bd.rectangle((104,44,118,88), fill=(50,50,55,255), outline=BLACK)
-        bd.rectangle((36,96,56,120), fill=BLACK, outline=BLACK); bd.rectangle((72,96,92,120), fill=BLACK, outline=BLACK)
-        for x in range(24,104,4): bd.point((x,62), fill=RED)
-        r = 6 + int(3*math.sin(phase*2*math.pi))
-        bd.ellipse((64-r,62-r,64+r,62+r), fill=(0,0,0,255), outline=WHITE)
-        glow=new_rgba(128,128); g=ImageDraw.Draw(glow); rg=12 + int(6*math.sin(phase*2*math.pi))
-        g.ellipse((64-rg,62-rg,64+rg,62+rg), fill=(255,40,40,80)); base.alpha_composite(glow,(0,0))
-        sheet.alpha_composite(base,(i*w,0))
-    return sheet
-save_anim(boss_core_pulse(), "boss_core_pulse_128x128_8f.png")
+def draw_boss_chassis():
+    base=new_rgba(128,128); bd=ImageDraw.Draw(base)
+    bd.rectangle((20,24,108,100), fill=(120,0,0,255), outline=BLACK)
+    bd.rectangle((48,8,80,28), fill=(60,0,0,255), outline=BLACK)
+    bd.rectangle((10,44,24,88), fill=(50,50,55,255), outline=BLACK)
+    bd.rectangle((104,44,118,88), fill=(50,50,55,255), outline=BLACK)
+    bd.rectangle((36,96,56,120), fill=BLACK, outline=BLACK); bd.rectangle((72,96,92,120), fill=BLACK, outline=BLACK)
+    for x in range(24,104,4): bd.point((x,62), fill=RED)
+    return base
+def draw_core(fr, r): ImageDraw.Draw(fr).ellipse((64-r,62-r,64+r,62+r), fill=(0,0,0,255), outline=WHITE)
+def draw_glow(rg):
+    """Glow disc cropped to its own bounding box instead of a full 128x128 layer"""
+    glow=new_rgba(2*rg+1,2*rg+1); ImageDraw.Draw(glow).ellipse((0,0,2*rg,2*rg), fill=(255,40,40,80)); return glow
+def boss_pulse_frame(spec):
+    r, rg = spec
+    return [place(layer("boss_chassis", draw_boss_chassis)), partial(draw_core, r=r),
+            over(layer(("boss_glow",rg), draw_glow, rg), (64-rg,62-rg))]
+def boss_core_pulse(frames=8, fps=8):
+    specs=[(6 + int(3*math.sin(i/frames*2*math.pi)), 12 + int(6*math.sin(i/frames*2*math.pi))) for i in range(frames)]  # (core r, glow r)
+    return animated(strip((128,128), specs, boss_pulse_frame), (128,128), "pulse", fps)
+@asset("boss_core_pulse")
+def boss_core_pulse_sheet():
+    sheet=boss_core_pulse(); save_anim(sheet, "boss_core_pulse_128x128_8f.png"); return sheet
 
 # Boss muzzle flash overlay 6f 64x64
-def boss_muzzle_flash(frames=6):
-    w=h=64; sheet=new_rgba(w*frames,h)
-    for i in range(frames):
-        t=i/(frames-1); fr=new_rgba(w,h); d=ImageDraw.Draw(fr)
-        length=int(8 + t*40); width=int(4 + t*10)
-        d.polygon([(6,32-width),(6,32+width),(6+length,32)], fill=(255,230,160,220))
-        d.polygon([(6,32-(width//2)), (6,32+(width//2)), (6+length//2,32)], fill=(255,200,60,240))
-        sheet.alpha_composite(fr,(i*w,0))
-    return sheet
-save_anim(boss_muzzle_flash(), "boss_muzzle_flash_overlay_64x64_6f.png")
+def draw_muzzle_flash(fr, length, width):
+    d=ImageDraw.Draw(fr)
+    d.polygon([(6,32-width),(6,32+width),(6+length,32)], fill=(255,230,160,220))
+    d.polygon([(6,32-(width//2)), (6,32+(width//2)), (6+length//2,32)], fill=(255,200,60,240))
+def muzzle_flash_frame(spec): return [partial(draw_muzzle_flash, length=spec[0], width=spec[1])]
+def boss_muzzle_flash(frames=6, fps=24):
+    specs=[(int(8 + i/(frames-1)*40), int(4 + i/(frames-1)*10)) for i in range(frames)]  # (length, width)
+    return animated(strip((64,64), specs, muzzle_flash_frame), (64,64), "flash", fps, loop=False)
+@asset("boss_muzzle_flash")
+def boss_muzzle_flash_sheet():
+    sheet=boss_muzzle_flash(); save_anim(sheet, "boss_muzzle_flash_overlay_64x64_6f.png"); return sheet
+
+# -------------------- Watch --------------------
+# A producer is rebuilt when its code fingerprint changes (its functions, the palette
+# and helper values it reads, patterns.py/compositor.py) or one of its dependencies is.
+WATCHED = ["generate_roboclaust_assets.py", "patterns.py", "compositor.py"]
+def fingerprints(): return {n: watch.code_fingerprint(fn) for n, (fn, _) in PRODUCERS.items()}
+def needed(targets):
+    """targets plus their transitive dependencies."""
+    names, stack = set(), list(targets)
+    while stack:
+        n = stack.pop()
+        if n not in names: names.add(n); stack += PRODUCERS[n][1]
+    return names
+def reload_generator():
+    """Fresh copy of this script and its helper modules, as edited on disk."""
+    for helper in ("patterns", "compositor"): importlib.reload(sys.modules[helper])
+    spec = importlib.util.spec_from_file_location("generate_roboclaust_assets", os.path.abspath(__file__))
+    module = importlib.util.module_from_spec(spec); sys.modules[spec.name] = module  # Pool workers unpickle by name
+    spec.loader.exec_module(module); return module
+def watch_assets(patterns, jobs):
+    tools = os.path.dirname(os.path.abspath(__file__))
+    built_from = fingerprints()
+    def rebuild(changed):
+        gen = reload_generator(); gen.OPTIMIZE_PNG = OPTIMIZE_PNG; gen.TIERS = TIERS
+        current = gen.fingerprints()
+        dirty = {n for n in current if current[n] != built_from.get(n)}
+        while True:  # Dependents of rebuilt producers
+            more = {n for n, (_, deps) in gen.PRODUCERS.items() if dirty & set(deps)} - dirty
+            if not more: break
+            dirty |= more
+        scope = gen.needed(gen.select(patterns) if patterns else gen.PRODUCERS)
+        todo = [n for n in gen.PRODUCERS if n in dirty & scope]
+        gen.FRAME_POOL = ProcessPoolExecutor(max_workers=jobs) if jobs > 1 and todo else None
+        try:
+            built = {}
+            for name in todo: gen.build(name, built)
+        finally:
+            if gen.FRAME_POOL: gen.FRAME_POOL.shutdown()
+        built_from.update(current)
+        print(f"Rebuilt {len(todo)} asset(s): {', '.join(todo) or 'nothing changed'}")
+    watch.watch(lambda: [os.path.join(tools, name) for name in WATCHED], rebuild)
+
+# -------------------- CLI --------------------
+def main():
+    parser = argparse.ArgumentParser(description="Generate the Roboclaust placeholder asset pack")
+    parser.add_argument("--only", action="append", metavar="PATTERN",
+                        help="Build only matching assets (glob, repeatable), plus their dependencies")
+    parser.add_argument("--list", action="store_true", help="List asset names and dependencies")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Worker processes for strips with many distinct frames (default: 1 = no pool)")
+    parser.add_argument("--optimize", action="store_true", help="Write indexed, size-optimized PNGs")
+    parser.add_argument("--watch", action="store_true", help="Keep running and rebuild assets affected by edits")
+    parser.add_argument("--tiers", metavar="SCALES", default="", help="Also write texture tiers, e.g. 0.5,2")
+    parser.add_argument("--trace", metavar="PATH", help="Write timing spans as Chrome trace JSON and print a summary")
+    args = parser.parse_args()
+    tracing.enable(bool(args.trace))
+    if args.list:
+        for name, (_, deps) in PRODUCERS.items(): print(name + (f"  <- {', '.join(deps)}" if deps else ""))
+        return
+    targets = select(args.only) if args.only else list(PRODUCERS)
+    global FRAME_POOL, OPTIMIZE_PNG, TIERS
+    OPTIMIZE_PNG = args.optimize
+    try: TIERS = texture_tiers.parse_tiers(args.tiers)
+    except ValueError as error: parser.error(str(error))
+    built = {}
+    FRAME_POOL = ProcessPoolExecutor(max_workers=args.jobs) if args.jobs > 1 else None
+    try:
+        for name in targets: build(name, built)
+    finally:
+        if FRAME_POOL: FRAME_POOL.shutdown()
+    print("Asset generation complete!")
+    print(f"Built {len(built)} asset(s): {', '.join(built)}")
+    print(f"Static assets: {base_dir}")
+    print(f"Animated assets: {anim_dir}")
+    if TIERS: texture_tiers.print_manifest(texture_tiers.write_manifest("assets"))
+    if args.trace: tracing.write_chrome(args.trace); tracing.print_summary()
+    if args.watch: watch_assets(args.only, args.jobs)
 
-print("Asset generation complete!")
-print(f"Static assets: {base_dir}")
-print(f"Animated assets: {anim_dir}")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Import Sidecar Tool for Roboclaust
+Writes and validates Godot .import files for PNG textures without the editor.
+
+Every PNG gets the import policy of its directory (pixel art: lossless, no
+mipmaps, no 3D VRAM compression - the settings configure_imports.gd applies
+to SPRITE_DIRS). Existing UIDs and params outside the policy are kept, so
+updates don't invalidate references or hand-made tweaks. New UIDs are derived
+from the res:// path, so re-running the tool is stable.
+
+Godot still builds its .godot/imported cache on the next editor launch,
+but it no longer has to write sidecars or hand out new UIDs.
+
+Usage:
+    python tools/import_sidecars.py                 # write/update every PNG sidecar (failed imports are only reported)
+    python tools/import_sidecars.py assets/sprites  # only below these directories
+    python tools/import_sidecars.py --check         # report missing/stale/inconsistent files, exit 1 if any
+    python tools/import_sidecars.py --prune         # also delete sidecars whose source is gone
+"""
+
+import argparse
+import hashlib
+import os
+import sys
+
+from asset_splitter import DIRS
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SKIP_DIRS = {".godot", ".git", "__pycache__", ".build_cache"}
+
+# Godot 4 texture importer params, in the order the editor writes them
+DEFAULT_PARAMS = [
+    ("compress/mode", "0"),
+    ("compress/high_quality", "false"),
+    ("compress/lossy_quality", "0.7"),
+    ("compress/uastc_level", "0"),
+    ("compress/rdo_quality_loss", "0.0"),
+    ("compress/hdr_compression", "1"),
+    ("compress/normal_map", "0"),
+    ("compress/channel_pack", "0"),
+    ("mipmaps/generate", "false"),
+    ("mipmaps/limit", "-1"),
+    ("roughness/mode", "0"),
+    ("roughness/src_normal", '""'),
+    ("process/channel_remap/red", "0"),
+    ("process/channel_remap/green", "1"),
+    ("process/channel_remap/blue", "2"),
+    ("process/channel_remap/alpha", "3"),
+    ("process/fix_alpha_border", "true"),
+    ("process/premult_alpha", "false"),
+    ("process/normal_map_invert_y", "false"),
+    ("process/hdr_as_srgb", "false"),
+    ("process/hdr_clamp_exposure", "false"),
+    ("process/size_limit", "0"),
+    ("detect_3d/compress_to", "1"),
+]
+
+# Params each policy enforces; everything else keeps its current or default value
+POLICIES = {
+    "pixel_art": {"compress/mode": "0", "mipmaps/generate": "false", "detect_3d/compress_to": "0"},
+    "default": {},
+}
+
+# Directory -> policy (longest match wins). Same directories as SPRITE_DIRS
+# in configure_imports.gd, plus the generated animation strips and texture tiers.
+DIR_POLICIES = {**{path: "pixel_art" for path in DIRS.values()}, "assets/anim": "pixel_art",
+                "assets/tiers": "pixel_art"}
+
+UID_CHARS = "abcdefghijklmnopqrstuvwxyz0123456789"
+
+
+def res_path(path):
+    return "res://" + os.path.relpath(os.path.abspath(path), BASE_PATH).replace(os.sep, "/")
+
+
+def policy_for(path):
+    """Name of the policy that applies to a PNG"""
+    rel = os.path.relpath(os.path.abspath(path), BASE_PATH).replace(os.sep, "/")
+    matches = [directory for directory in DIR_POLICIES if rel.startswith(directory.rstrip("/") + "/")]
+    return DIR_POLICIES[max(matches, key=len)] if matches else "default"
+
+
+def stable_uid(res):
+    """uid://... text for a new resource, derived from its path (ResourceUID::id_to_text)"""
+    value = int.from_bytes(hashlib.sha256(res.encode()).digest()[:8], "little") & 0x7FFFFFFFFFFFFFFF
+    text = ""
+    while True:
+        text = UID_CHARS[value % 36] + text
+        value //= 36
+        if not value:
+            return "uid://" + text
+
+
+def imported_path(res):
+    """The .ctex path Godot derives from a source path"""
+    name = res.rsplit("/", 1)[-1]
+    return f"res://.godot/imported/{name}-{hashlib.md5(res.encode()).hexdigest()}.ctex"
+
+
+def parse_import(path):
+    """
+    Read a .import file
+
+    Returns:
+        Dict of section -> {key: raw value text}, preserving order
+    """
+    sections = {}
+    current = sections.setdefault("", {})
+    with open(path, encoding="utf-8") as f:
+        lines = iter(f.read().splitlines())
+    for line in lines:
+        if line.startswith("[") and line.endswith("]"):
+            current = sections.setdefault(line[1:-1], {})
+        elif "=" in line:
+            key, value = line.split("=", 1)
+            if value.startswith("{") and not value.endswith("}"):  # metadata={ ... }
+                block = [value]
+                for more in lines:
+                    block.append(more)
+                    if more == "}":
+                        break
+                value = "\n".join(block)
+            current[key] = value
+    return sections
+
+
+def render_import(png_path, existing=None):
+    """
+    Build the .import text for a PNG
+
+    Args:
+        png_path: PNG on disk
+        existing: Parsed current sidecar (keeps its uid and non-policy params)
+    """
+    res = res_path(png_path)
+    existing = existing or {}
+    uid = existing.get("remap", {}).get("uid", "").strip('"') or stable_uid(res)
+    dest = imported_path(res)
+
+    params = dict(DEFAULT_PARAMS)
+    params.update(existing.get("params", {}))
+    params.update(POLICIES[policy_for(png_path)])
+
+    lines = [
+        "[remap]",
+        "",
+        'importer="texture"',
+        'type="CompressedTexture2D"',
+        f'uid="{uid}"',
+        f'path="{dest}"',
+        "metadata={",
+        '"vram_texture": false',
+        "}",
+        "",
+        "[deps]",
+        "",
+        f'source_file="{res}"',
+        f'dest_files=["{dest}"]',
+        "",
+        "[params]",
+        "",
+    ]
+    lines += [f"{key}={value}" for key, value in params.items()]
+    return "\n".join(lines) + "\n"
+
+
+def find_files(roots, suffix):
+    """Files ending in suffix below roots, skipping Godot/tool caches"""
+    found = []
+    for root in roots:
+        for directory, subdirs, files in os.walk(root):
+            subdirs[:] = [d for d in subdirs if d not in SKIP_DIRS]
+            found += [os.path.join(directory, name) for name in files if name.lower().endswith(suffix)]
+    return sorted(found)
+
+
+def check(roots):
+    """
+    Validate PNG sidecars
+
+    Returns:
+        List of (kind, path, detail) problems: missing, stale, inconsistent, policy, duplicate_uid
+    """
+    problems = []
+    for png in find_files(roots, ".png"):
+        if not os.path.exists(png + ".import"):
+            problems.append(("missing", png, "no .import sidecar"))
+
+    uids = {}
+    for sidecar in find_files([BASE_PATH], ".png.import"):
+        sections = parse_import(sidecar)
+        uid = sections.get("remap", {}).get("uid", "").strip('"')
+        if uid:
+            uids.setdefault(uid, []).append(sidecar)
+        if not any(os.path.abspath(sidecar).startswith(os.path.abspath(root)) for root in roots):
+            continue
+
+        png = sidecar[:-len(".import")]
+        res = res_path(png)
+        source = sections.get("deps", {}).get("source_file", "").strip('"')
+        if not os.path.exists(png):
+            problems.append(("stale", sidecar, f"source_file {source or res} no longer exists"))
+            continue
+        if sections.get("remap", {}).get("importer") != '"texture"':
+            continue  # Imported as something else (e.g. an Image) on purpose
+        if sections["remap"].get("valid") == "false":
+            problems.append(("inconsistent", sidecar, "the last editor import failed (valid=false)"))
+            continue
+        if source != res:
+            problems.append(("inconsistent", sidecar, f"source_file is {source}, expected {res}"))
+        if sections["remap"].get("path", "").strip('"') != imported_path(res):
+            problems.append(("inconsistent", sidecar, "path does not match the source path hash"))
+        if not uid:
+            problems.append(("inconsistent", sidecar, "no uid"))
+        params = sections.get("params", {})
+        for key, value in POLICIES[policy_for(png)].items():
+            if params.get(key) != value:
+                problems.append(("policy", sidecar, f"{key}={params.get(key)}, {policy_for(png)} wants {value}"))
+
+    for uid, sidecars in uids.items():
+        if len(sidecars) > 1:
+            problems += [("duplicate_uid", sidecar, uid) for sidecar in sidecars]
+    return problems
+
+
+def write_sidecars(roots):
+    """
+    Create or update the sidecar of every PNG below roots
+
+    Sidecars of failed imports (valid=false) are left alone, so check() still
+    reports them.
+
+    Returns:
+        Dict of "created"/"updated"/"unchanged"/"skipped"/"failed" -> count
+    """
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "skipped": 0, "failed": 0}
+    for png in find_files(roots, ".png"):
+        sidecar = png + ".import"
+        existing = parse_import(sidecar) if os.path.exists(sidecar) else None
+        if existing and existing.get("remap", {}).get("importer") != '"texture"':
+            counts["skipped"] += 1
+            continue
+        if existing and existing["remap"].get("valid") == "false":
+            counts["failed"] += 1
+            continue
+
+        text = render_import(png, existing)
+        if existing is not None:
+            with open(sidecar, encoding="utf-8") as f:
+                if f.read() == text:
+                    counts["unchanged"] += 1
+                    continue
+        with open(sidecar, "w", encoding="utf-8", newline="\n") as f:
+            f.write(text)
+        counts["updated" if existing else "created"] += 1
+        print(f"  {'Updated' if existing else 'Created'}: {res_path(sidecar)}")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write and validate Godot .import sidecars for PNGs")
+    parser.add_argument("dirs", nargs="*", help="Directories to process (default: whole project)")
+    parser.add_argument("--check", action="store_true", help="Only report problems; exit 1 if there are any")
+    parser.add_argument("--prune", action="store_true", help="Delete sidecars whose source PNG is gone")
+    args = parser.parse_args()
+
+    roots = [os.path.join(BASE_PATH, directory) for directory in args.dirs] or [BASE_PATH]
+
+    print("=" * 60)
+    print("Roboclaust Import Sidecars" + (" (check)" if args.check else ""))
+    print("=" * 60)
+
+    if not args.check:
+        counts = write_sidecars(roots)
+        print(", ".join(f"{count} {kind}" for kind, count in counts.items()))
+
+    problems = check(roots)
+    if args.prune:
+        for kind, path, _ in problems:
+            if kind == "stale":
+                os.remove(path)
+                print(f"  Removed: {res_path(path)}")
+        problems = [problem for problem in problems if problem[0] != "stale"]
+
+    for kind, path, detail in problems:
+        print(f"  [{kind}] {res_path(path)}: {detail}")
+    print(f"{len(problems)} problem(s)")
+    if args.check and problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+PNG Optimizer for Roboclaust
+Losslessly re-encodes PNGs as small as possible: images with at most 256
+RGBA colours become indexed PNGs (alpha in tRNS, 1/2/4-bit when they fit),
+opaque images drop the alpha channel, and several zlib settings are tried.
+Indexed candidates are only kept if they decode to exactly the same RGBA pixels.
+
+Usage:
+    python tools/optimize_png.py                       # assets/sprites, assets/anim, assets/tiles
+    python tools/optimize_png.py assets/sprites/enemies --dry-run
+
+asset_splitter.py and generate_roboclaust_assets.py use encode_smallest()
+directly when run with --optimize.
+"""
+
+from PIL import Image
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import argparse
+import glob
+import io
+import os
+import zlib
+
+import pixel_cache
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DEFAULT_DIRS = ["assets/sprites", "assets/anim", "assets/tiles"]
+
+# (save options) tried for every candidate colour type; Pillow picks row filters itself
+ZLIB_SETTINGS = [
+    {"optimize": True},
+    {"compress_level": 9, "compress_type": zlib.Z_FILTERED},
+    {"compress_level": 9, "compress_type": zlib.Z_RLE},
+]
+
+
+def to_indexed(rgba):
+    """
+    Build a lossless palette image when the image has at most 256 RGBA colours
+
+    Palette entries with alpha < 255 come first so the tRNS chunk stays short.
+
+    Returns:
+        (P image, save options) or None when there are too many colours
+    """
+    packed = rgba.reshape(-1, 4).copy().view(np.uint32).ravel()
+    colors, indices = np.unique(packed, return_inverse=True)
+    if len(colors) > 256:
+        return None
+
+    entries = colors.view(np.uint8).reshape(-1, 4)
+    order = np.argsort(entries[:, 3] == 255, kind="stable")  # Translucent entries first
+    remap = np.empty(len(order), dtype=np.uint8)
+    remap[order] = np.arange(len(order), dtype=np.uint8)
+    entries = entries[order]
+
+    image = Image.fromarray(remap[indices].reshape(rgba.shape[:2]), "P")
+    image.putpalette(entries[:, :3].tobytes())
+    options = {}
+    translucent = int(np.count_nonzero(entries[:, 3] < 255))
+    if translucent:
+        options["transparency"] = entries[:translucent, 3].tobytes()
+    for bits in (1, 2, 4):
+        if len(entries) <= 1 << bits:
+            options["bits"] = bits
+            break
+    return image, options
+
+
+def candidates(img):
+    """(image, save options) for every colour type that can hold img losslessly"""
+    rgba = np.asarray(img.convert("RGBA"))
+    yield Image.fromarray(rgba, "RGBA"), {}
+    if (rgba[..., 3] == 255).all():
+        yield Image.fromarray(rgba[..., :3], "RGB"), {}
+    indexed = to_indexed(rgba)
+    if indexed:
+        yield indexed
+
+
+def encode_smallest(img):
+    """
+    Encode img as the smallest PNG that decodes to the same RGBA pixels
+
+    Returns:
+        PNG bytes
+    """
+    reference = np.asarray(img.convert("RGBA"))  # RGBA/RGB candidates are lossless by construction
+    best = None
+    for image, options in candidates(img):
+        for settings in ZLIB_SETTINGS:
+            buffer = io.BytesIO()
+            image.save(buffer, "PNG", **options, **settings)
+            data = buffer.getvalue()
+            if best is not None and len(data) >= len(best):
+                continue
+            if image.mode != "P" or np.array_equal(
+                    np.asarray(Image.open(io.BytesIO(data)).convert("RGBA")), reference):
+                best = data
+    return best
+
+
+def optimize_file(path, dry_run=False):
+    """
+    Rewrite one PNG if a smaller lossless encoding exists
+
+    Returns:
+        (bytes before, bytes after)
+    """
+    before = os.path.getsize(path)
+    img = pixel_cache.open_image(path)
+    data = encode_smallest(img)
+    if len(data) >= before:
+        return before, before
+    if not dry_run:
+        with open(path, "wb") as f:
+            f.write(data)
+        pixel_cache.put(data, img)
+    return before, len(data)
+
+
+def optimize_dirs(dirs, dry_run=False, jobs=None):
+    """
+    Optimize every PNG below dirs
+
+    Returns:
+        Dict of directory -> [files, bytes before, bytes after]
+    """
+    paths = sorted({path for directory in dirs
+                    for path in glob.glob(os.path.join(directory, "**", "*.png"), recursive=True)})
+    report = {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        for path, (before, after) in zip(paths, pool.map(lambda p: optimize_file(p, dry_run), paths)):
+            entry = report.setdefault(os.path.dirname(path), [0, 0, 0])
+            entry[0] += 1
+            entry[1] += before
+            entry[2] += after
+    return report
+
+
+def print_report(report):
+    print(f"{'directory':<44} {'files':>5} {'before':>10} {'after':>10} {'saved':>8}")
+    totals = [0, 0, 0]
+    for directory, (files, before, after) in sorted(report.items()):
+        name = os.path.relpath(directory, BASE_PATH).replace(os.sep, "/")
+        print(f"{name:<44} {files:>5} {before:>10} {after:>10} {(before - after) / before:>7.1%}")
+        totals = [total + value for total, value in zip(totals, (files, before, after))]
+    if totals[1]:
+        print(f"{'total':<44} {totals[0]:>5} {totals[1]:>10} {totals[2]:>10} "
+              f"{(totals[1] - totals[2]) / totals[1]:>7.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Losslessly shrink PNG assets")
+    parser.add_argument("dirs", nargs="*", default=DEFAULT_DIRS,
+                        help="Directories to optimize recursively (default: %(default)s)")
+    parser.add_argument("--dry-run", action="store_true", help="Only report what would be saved")
+    parser.add_argument("--jobs", "-j", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Roboclaust PNG Optimizer" + (" (dry run)" if args.dry_run else ""))
+    print("=" * 60)
+
+    dirs = [os.path.join(BASE_PATH, directory) for directory in args.dirs]
+    print_report(optimize_dirs(dirs, args.dry_run, args.jobs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,339 @@
+#!/usr/bin/env python3
+"""
+Tile Atlas Packer for Roboclaust
+Packs a directory of equally sized tile PNGs into one padded atlas and
+rewrites the TileSet .tres with a single TileSetAtlasSource.
+
+Scenes whose TileMap/TileMapLayer nodes use that TileSet (as an ext_resource)
+get their painted cells remapped from the old per-tile sources to the atlas
+coords, so existing maps keep their tiles. Scenes with an embedded copy of the
+TileSet (GameMap.tscn) don't use the .tres and are left alone.
+
+The danger tiles are not packed here: replace_danger_tiles.py owns
+danger_atlas.png/.json and danger_tileset.tres (deduplicated tiles with
+flip/transpose alternatives), and this tool refuses to overwrite them.
+
+Usage:
+    python tools/pack_tile_atlas.py assets/tiles/factory --tileset assets/tiles/factory_tileset.tres
+"""
+
+from PIL import Image
+import numpy as np
+import argparse
+import base64
+import glob
+import json
+import math
+import os
+import re
+
+import pixel_cache
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SKIP_DIRS = {".godot", ".git", "__pycache__", ".build_cache"}
+
+# Written by replace_danger_tiles.py; a plain pack would drop their alternative tiles
+DANGER_OUTPUTS = {"assets/tiles/danger_atlas.png", "assets/tiles/danger_atlas.json",
+                  "assets/tiles/danger_tileset.tres"}
+
+# TileMapLayer.tile_map_data (format 0): uint16 version, then one record per cell
+CELL_RECORD = np.dtype([("x", "<i2"), ("y", "<i2"), ("source", "<u2"),
+                        ("atlas_x", "<u2"), ("atlas_y", "<u2"), ("alternative", "<u2")])
+
+
+def res_path(path):
+    """Convert a filesystem path inside the project to a res:// path"""
+    return "res://" + os.path.relpath(os.path.abspath(path), BASE_PATH).replace(os.sep, "/")
+
+
+def pack_tiles(tiles, columns=None, padding=1):
+    """
+    Pack equally sized tiles into an edge-extruded atlas
+
+    Each tile's border pixels are repeated into its padding so linear
+    filtering and subpixel camera offsets never sample a neighbour.
+
+    Args:
+        tiles: List of RGBA images, all the same size
+        columns: Tiles per atlas row (default: square-ish layout)
+        padding: Extruded pixels around each tile
+
+    Returns:
+        (atlas image, list of (col, row) atlas coords in tile order)
+    """
+    tile_w, tile_h = tiles[0].size
+    for tile in tiles:
+        if tile.size != (tile_w, tile_h):
+            raise ValueError(f"All tiles must be {tile_w}x{tile_h}, got {tile.size[0]}x{tile.size[1]}")
+
+    columns = columns or math.ceil(math.sqrt(len(tiles)))
+    rows = math.ceil(len(tiles) / columns)
+    pitch_w = tile_w + 2 * padding
+    pitch_h = tile_h + 2 * padding
+
+    atlas = np.zeros((rows * pitch_h, columns * pitch_w, 4), dtype=np.uint8)
+    coords = []
+    for index, tile in enumerate(tiles):
+        col, row = index % columns, index // columns
+        extruded = np.pad(np.asarray(tile.convert("RGBA")),
+                          ((padding, padding), (padding, padding), (0, 0)), mode="edge")
+        atlas[row * pitch_h:(row + 1) * pitch_h, col * pitch_w:(col + 1) * pitch_w] = extruded
+        coords.append((col, row))
+
+    return Image.fromarray(atlas, "RGBA"), coords
+
+
+def read_resource_properties(tres_path):
+    """Return the [resource] section lines of an existing .tres, minus its sources"""
+    if not os.path.exists(tres_path):
+        return []
+    with open(tres_path, encoding="utf-8") as f:
+        text = f.read()
+    match = re.search(r"^\[resource\]\n(.*?)(?=^\[|\Z)", text, re.M | re.S)
+    if not match:
+        return []
+    return [line for line in match.group(1).splitlines()
+            if line.strip() and not line.startswith("sources/")]
+
+
+def read_tile_sources(tres_path):
+    """
+    Single-tile atlas sources of an existing TileSet (one PNG per source, tile at 0:0)
+
+    Returns:
+        Dict of source id -> res:// path of its texture
+    """
+    if not os.path.exists(tres_path):
+        return {}
+    with open(tres_path, encoding="utf-8") as f:
+        text = f.read()
+    textures = dict((rid, path) for path, rid in
+                    re.findall(r'^\[ext_resource type="Texture2D"[^\]]*?path="([^"]+)"[^\]]*?id="([^"]+)"', text, re.M))
+    sub_textures = {}
+    for sub_id, body in re.findall(r'^\[sub_resource type="TileSetAtlasSource" id="([^"]+)"\]\n(.*?)(?=^\[|\Z)',
+                                   text, re.M | re.S):
+        tiles = re.findall(r"^(\d+):(\d+)/0 = 0$", body, re.M)
+        texture = re.search(r'^texture = ExtResource\("([^"]+)"\)', body, re.M)
+        if texture and tiles == [("0", "0")] and texture.group(1) in textures:
+            sub_textures[sub_id] = textures[texture.group(1)]
+    return {int(source): sub_textures[sub_id]
+            for source, sub_id in re.findall(r'^sources/(\d+) = SubResource\("([^"]+)"\)', text, re.M)
+            if sub_id in sub_textures}
+
+
+def remap_cells(cells, remap):
+    """
+    Move painted cells to their new tiles, in place
+
+    Args:
+        cells: CELL_RECORD array
+        remap: Dict of (source, atlas_x, atlas_y) -> (source, atlas_x, atlas_y, alternative);
+               the alternative replaces the cell's only when the cell used the base tile (0)
+
+    Returns:
+        (cells moved, painted cells without a mapping)
+    """
+    moved = missing = 0
+    for cell in cells:
+        if cell["source"] == 0xFFFF:  # Erased cell
+            continue
+        target = remap.get((int(cell["source"]), int(cell["atlas_x"]), int(cell["atlas_y"])))
+        if target is None:
+            missing += 1
+            continue
+        cell["source"], cell["atlas_x"], cell["atlas_y"] = target[:3]
+        if cell["alternative"] == 0:
+            cell["alternative"] = target[3]
+        moved += 1
+    return moved, missing
+
+
+def _remap_tile_map_data(encoded, remap):
+    data = base64.b64decode(encoded)
+    cells = np.frombuffer(data, dtype=CELL_RECORD, offset=2).copy()
+    counts = remap_cells(cells, remap)
+    return base64.b64encode(data[:2] + cells.tobytes()).decode("ascii"), counts
+
+
+def _remap_tile_data(values, remap):
+    """TileMap layer_N/tile_data (format 2): position, source | atlas_x << 16, atlas_y | alternative << 16"""
+    ints = np.array([int(value) for value in values.split(",") if value.strip()], dtype=np.int64).reshape(-1, 3)
+    cells = np.zeros(len(ints), dtype=CELL_RECORD)
+    cells["source"], cells["atlas_x"] = ints[:, 1] & 0xFFFF, (ints[:, 1] >> 16) & 0xFFFF
+    cells["atlas_y"], cells["alternative"] = ints[:, 2] & 0xFFFF, (ints[:, 2] >> 16) & 0xFFFF
+    counts = remap_cells(cells, remap)
+    ints[:, 1] = cells["source"].astype(np.int64) | cells["atlas_x"].astype(np.int64) << 16
+    ints[:, 2] = cells["atlas_y"].astype(np.int64) | cells["alternative"].astype(np.int64) << 16
+    ints[:, 1:] = np.where(ints[:, 1:] >= 1 << 31, ints[:, 1:] - (1 << 32), ints[:, 1:])  # Back to int32
+    return ", ".join(map(str, ints.ravel())), counts
+
+
+def remap_scene(text, tileset_res, remap):
+    """
+    Remap the cells of every node in a .tscn that uses the TileSet at tileset_res
+
+    Returns:
+        (new text, cells moved, painted cells without a mapping)
+    """
+    ids = re.findall(r'^\[ext_resource type="TileSet"[^\]]*?path="' + re.escape(tileset_res) + r'"[^\]]*?id="([^"]+)"',
+                     text, re.M)
+    if not ids:
+        return text, 0, 0
+    uses_tileset = re.compile(r'^tile_set = ExtResource\("(?:' + "|".join(map(re.escape, ids)) + r')"\)$', re.M)
+    totals = [0, 0]
+    sections = re.split(r"(?m)^(?=\[)", text)
+    for index, section in enumerate(sections):
+        if not section.startswith("[node") or not uses_tileset.search(section):
+            continue
+
+        def byte_data(match):
+            encoded, counts = _remap_tile_map_data(match.group(2), remap)
+            totals[0] += counts[0]
+            totals[1] += counts[1]
+            return f'{match.group(1)}"{encoded}")'
+
+        def int_data(match):
+            values, counts = _remap_tile_data(match.group(2), remap)
+            totals[0] += counts[0]
+            totals[1] += counts[1]
+            return f"{match.group(1)}{values})"
+
+        section = re.sub(r'^(tile_map_data = PackedByteArray\()"([^"]*)"\)', byte_data, section, flags=re.M)
+        sections[index] = re.sub(r"^(layer_\d+/tile_data = PackedInt32Array\()([^)]*)\)", int_data,
+                                 section, flags=re.M)
+    return "".join(sections), totals[0], totals[1]
+
+
+def remap_scenes(tileset_path, remap, root=BASE_PATH):
+    """
+    Rewrite the painted cells of every scene under root that uses the TileSet
+
+    Returns:
+        List of (res:// scene, cells moved, painted cells without a mapping)
+    """
+    tileset_res = res_path(tileset_path)
+    changed = []
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [d for d in subdirs if d not in SKIP_DIRS]
+        for name in files:
+            if not name.endswith(".tscn"):
+                continue
+            path = os.path.join(directory, name)
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if tileset_res not in text:
+                continue
+            new_text, moved, missing = remap_scene(text, tileset_res, remap)
+            if new_text != text:
+                with open(path, "w", encoding="utf-8", newline="\n") as f:
+                    f.write(new_text)
+            if moved or missing:
+                changed.append((res_path(path), moved, missing))
+    return changed
+
+
+def print_remapped(changed):
+    for scene, moved, missing in changed:
+        note = f", {missing} cells use tiles that are gone" if missing else ""
+        print(f"Remapped {moved} cells in {scene}{note}")
+    if not changed:
+        print("No scene paints with this TileSet (embedded TileSet copies are not touched)")
+
+
+def write_tileset(tres_path, atlas_path, region_size, padding, coords, tile_size=None,
+                  alternatives=None):
+    """
+    Write a TileSet resource with one TileSetAtlasSource
+
+    Args:
+        tres_path: TileSet .tres to (re)write
+        atlas_path: Atlas PNG inside the project
+        region_size: (width, height) of one tile in the atlas
+        padding: Padding used when packing (margins = padding, separation = 2 * padding)
+        coords: Atlas coords of every tile
+        tile_size: TileSet tile_size; keeps the existing value when None
+        alternatives: Optional dict of coords -> list of (alternative id, TileData
+                      properties such as {"flip_h": True, "transpose": True})
+    """
+    properties = read_resource_properties(tres_path)
+    if tile_size is not None or not any(line.startswith("tile_size") for line in properties):
+        width, height = tile_size or region_size
+        properties = [line for line in properties if not line.startswith("tile_size")]
+        properties.insert(0, f"tile_size = Vector2i({width}, {height})")
+
+    lines = [
+        '[gd_resource type="TileSet" load_steps=3 format=3]',
+        "",
+        f'[ext_resource type="Texture2D" path="{res_path(atlas_path)}" id="1_atlas"]',
+        "",
+        '[sub_resource type="TileSetAtlasSource" id="TileSetAtlasSource_atlas"]',
+        'texture = ExtResource("1_atlas")',
+        f"margins = Vector2i({padding}, {padding})",
+        f"separation = Vector2i({2 * padding}, {2 * padding})",
+        f"texture_region_size = Vector2i({region_size[0]}, {region_size[1]})",
+    ]
+    for col, row in coords:
+        lines.append(f"{col}:{row}/0 = 0")
+        for alt_id, tile_properties in (alternatives or {}).get((col, row), []):
+            lines.append(f"{col}:{row}/{alt_id} = {alt_id}")
+            lines += [f"{col}:{row}/{alt_id}/{key} = {str(value).lower()}"
+                      for key, value in sorted(tile_properties.items())]
+    lines += ["", "[resource]"] + properties + ['sources/0 = SubResource("TileSetAtlasSource_atlas")', ""]
+
+    with open(tres_path, "w", encoding="utf-8", newline="\n") as f:
+        f.write("\n".join(lines))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack tile PNGs into one TileSet atlas")
+    parser.add_argument("tile_dir", help="Directory of tile PNGs")
+    parser.add_argument("--tileset", required=True, help="TileSet .tres to rewrite")
+    parser.add_argument("--atlas", help="Output atlas PNG (default: <tile_dir>_atlas.png)")
+    parser.add_argument("--padding", type=int, default=1, help="Extruded border per tile (default: 1)")
+    parser.add_argument("--columns", type=int, help="Tiles per atlas row (default: square layout)")
+    parser.add_argument("--tile-size", type=int, nargs=2, metavar=("W", "H"),
+                        help="TileSet tile_size (default: keep the existing value)")
+    args = parser.parse_args()
+
+    tile_dir = os.path.join(BASE_PATH, args.tile_dir)
+    tileset_path = os.path.join(BASE_PATH, args.tileset)
+    atlas_path = os.path.join(BASE_PATH, args.atlas or args.tile_dir.rstrip("/\\") + "_atlas.png")
+    for path in (tileset_path, atlas_path, os.path.splitext(atlas_path)[0] + ".json"):
+        if res_path(path)[len("res://"):] in DANGER_OUTPUTS:
+            raise SystemExit(f"{res_path(path)} belongs to replace_danger_tiles.py; run that instead")
+
+    print("=" * 60)
+    print("Roboclaust Tile Atlas Packer")
+    print("=" * 60)
+
+    paths = sorted(glob.glob(os.path.join(tile_dir, "*.png")))
+    if not paths:
+        raise SystemExit(f"No tiles found in {tile_dir}")
+    tiles = [pixel_cache.open_image(path) for path in paths]
+
+    atlas, coords = pack_tiles(tiles, args.columns, args.padding)
+    pixel_cache.save(atlas, atlas_path)
+    print(f"Packed {len(tiles)} tiles into {res_path(atlas_path)} ({atlas.size[0]}x{atlas.size[1]})")
+
+    old_sources = read_tile_sources(tileset_path)
+    write_tileset(tileset_path, atlas_path, tiles[0].size, args.padding, coords,
+                  tuple(args.tile_size) if args.tile_size else None)
+    print(f"Rewrote {res_path(tileset_path)} with 1 atlas source")
+
+    new_coords = {res_path(path): coord for path, coord in zip(paths, coords)}
+    remap = {(source, 0, 0): (0, *new_coords[res], 0) for source, res in old_sources.items() if res in new_coords}
+    print_remapped(remap_scenes(tileset_path, remap))
+
+    # Tile name -> atlas coords, for remapping TileMaps painted with the old sources
+    mapping = {os.path.splitext(os.path.basename(path))[0]: list(coord)
+               for path, coord in zip(paths, coords)}
+    with open(os.path.splitext(atlas_path)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump(mapping, f, indent=2)
+
+    print("\nNext steps:")
+    print("1. Open Godot to import the atlas (Filter = Nearest, Mipmaps = Off)")
+    print("2. Check the remapped scenes; every tile now lives in source 0 at the coords in the .json")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Pattern Primitives for Roboclaust
+NumPy versions of the per-pixel drawing loops in generate_roboclaust_assets.py
+(noise speckles, grid lines, stripes, rectangle grids).
+
+Canvases are (height, width, 4) uint8 arrays. Coordinates follow
+ImageDraw: ranges are inclusive and clipped to the canvas, and later
+primitives overwrite earlier ones, so the output is bit-identical to the
+equivalent ImageDraw calls.
+
+Run this file to benchmark noise generation against the ImageDraw loop:
+    python tools/patterns.py --sizes 64 256 512 1024
+    python tools/patterns.py --check     # noise_points vs. randrange on edge cases, exit 1 on a mismatch
+"""
+
+from PIL import Image, ImageDraw
+import numpy as np
+import argparse
+import random
+import time
+
+
+def canvas(w, h, color=(0, 0, 0, 0)):
+    """New RGBA canvas filled with color"""
+    return np.full((h, w, 4), color, dtype=np.uint8)
+
+
+def to_image(arr):
+    return Image.fromarray(arr, "RGBA")
+
+
+def _span(start, stop, limit):
+    """Inclusive [start, stop] clipped to [0, limit)"""
+    return np.arange(max(start, 0), min(stop, limit - 1) + 1)
+
+
+def hlines(arr, ys, x0, x1, color):
+    """Horizontal 1px lines at every y in ys, from x0 to x1 inclusive"""
+    ys = np.asarray(ys)
+    ys = ys[(ys >= 0) & (ys < arr.shape[0])]
+    arr[ys[:, None], _span(x0, x1, arr.shape[1])[None, :]] = color
+
+
+def vlines(arr, xs, y0, y1, color):
+    """Vertical 1px lines at every x in xs, from y0 to y1 inclusive"""
+    xs = np.asarray(xs)
+    xs = xs[(xs >= 0) & (xs < arr.shape[1])]
+    arr[_span(y0, y1, arr.shape[0])[:, None], xs[None, :]] = color
+
+
+def rect_mask(shape, xs, ys, w, h):
+    """Mask of w x h rectangles whose top-left corners are every (x, y) in xs x ys"""
+    height, width = shape[:2]
+    cols = np.zeros(width, dtype=bool)
+    rows = np.zeros(height, dtype=bool)
+    for x in xs:
+        cols[max(x, 0):max(x + w, 0)] = True
+    for y in ys:
+        rows[max(y, 0):max(y + h, 0)] = True
+    return rows[:, None] & cols[None, :]
+
+
+def fill_rects(arr, xs, ys, w, h, color):
+    """Fill a grid of w x h rectangles (top-left corners xs x ys)"""
+    arr[rect_mask(arr.shape, xs, ys, w, h)] = color
+
+
+def outline_rects(arr, xs, ys, w, h, color):
+    """1px outline of a grid of w x h rectangles, like ImageDraw.rectangle(outline=...)"""
+    outer = rect_mask(arr.shape, xs, ys, w, h)
+    inner = rect_mask(arr.shape, [x + 1 for x in xs], [y + 1 for y in ys], w - 2, h - 2)
+    arr[outer & ~inner] = color
+
+
+def stripes(arr, starts, thickness, color, axis=0):
+    """
+    Solid bands of the given thickness starting at every offset in starts
+
+    Args:
+        axis: 0 for horizontal bands (offsets are rows), 1 for vertical bands
+    """
+    mask = np.zeros(arr.shape[axis], dtype=bool)
+    for start in starts:
+        mask[max(start, 0):max(start + thickness, 0)] = True
+    if axis == 0:
+        arr[mask, :] = color
+    else:
+        arr[:, mask] = color
+
+
+def _randbelow_stream(rnd, n, count):
+    """
+    Draw count values like random.Random.randrange(n), as an array
+
+    randrange(n) takes getrandbits(k) (the top k bits of one 32-bit
+    Mersenne Twister word, k = n.bit_length()) and rejects values >= n.
+    getrandbits(32 * N) returns N consecutive words little-endian, so the
+    raw word stream can be pulled in bulk and the rejection done with masks.
+    """
+    k = n.bit_length()
+    accepted = []
+    have = 0
+    while have < count:
+        words = int((count - have) * (1 << k) / n * 1.1) + 64
+        raw = np.frombuffer(rnd.getrandbits(32 * words).to_bytes(4 * words, "little"), dtype="<u4")
+        values = raw >> np.uint32(32 - k)
+        values = values[values < n]
+        accepted.append(values)
+        have += len(values)
+    return np.concatenate(accepted)[:count].astype(np.intp)
+
+
+CHECK_POINTS = 16  # Leading points compared against random.randrange on every noise_points() call
+
+
+def _interleaved_pairs(rnd, w, h, count):
+    """
+    (x, y) pairs for w != h from one bulk word stream
+
+    The loop alternates two rejection rules (x: top kx bits < w, then y: top ky
+    bits < h). Every word is tested against both rules at once; next_x[i] /
+    next_y[i] are the first accepted word at or after i, and step(i) = position
+    after the pair starting at word i. The pair starts are the orbit of 0 under
+    step, listed by pointer doubling (log2(count) array passes).
+
+    Returns:
+        (xs, ys), or None when the words ran out before count pairs
+    """
+    kx, ky = w.bit_length(), h.bit_length()
+    words = int(count * ((1 << kx) / w + (1 << ky) / h) * 1.1) + 64
+    raw = np.frombuffer(rnd.getrandbits(32 * words).to_bytes(4 * words, "little"), dtype="<u4")
+    values_x, values_y = raw >> np.uint32(32 - kx), raw >> np.uint32(32 - ky)
+    end = np.full(2, words)  # Sentinels: "no accepted word left"
+
+    def next_accepted(accepted):
+        index = np.where(accepted, np.arange(words), words)
+        return np.concatenate([np.minimum.accumulate(index[::-1])[::-1], end])
+
+    next_x, next_y = next_accepted(values_x < w), next_accepted(values_y < h)
+    step = next_y[next_x + 1] + 1  # words + 1 once the stream is exhausted, and stays there
+    starts = np.zeros(1, dtype=np.intp)
+    while len(starts) <= count:
+        starts = np.concatenate([starts, step[starts]])
+        step = step[step]
+    if starts[count] > words:
+        return None
+    x_at = next_x[starts[:count]]
+    return values_x[x_at].astype(np.intp), values_y[next_y[x_at + 1]].astype(np.intp)
+
+
+def _noise_points_loop(w, h, count, seed):
+    """Per-point randrange loop: the reference sequence and the fallback"""
+    rnd = random.Random(seed)
+    points = [(rnd.randrange(w), rnd.randrange(h)) for _ in range(count)]
+    return (np.array([x for x, _ in points], dtype=np.intp).reshape(-1),
+            np.array([y for _, y in points], dtype=np.intp).reshape(-1))
+
+
+def noise_points(w, h, density, seed):
+    """
+    Speckle coordinates for a w x h canvas
+
+    Reproduces the (x, y) sequence of the original ImageDraw loop
+    (rnd.randrange(w), rnd.randrange(h) per point, random.Random(seed)).
+    The bulk paths rely on getrandbits() word order, which CPython doesn't
+    document, so the first CHECK_POINTS points are compared against
+    randrange on every call and the per-point loop is used if they differ.
+
+    Returns:
+        (xs, ys) index arrays
+    """
+    count = int(w * h * density)
+    if count == 0:  # density 0 or a tiny tile: the loop draws nothing
+        return np.zeros(0, dtype=np.intp), np.zeros(0, dtype=np.intp)
+    if w == h:
+        # x and y share one rejection rule, so accepted values simply alternate
+        values = _randbelow_stream(random.Random(seed), w, 2 * count)
+        points = values[0::2], values[1::2]
+    else:
+        points = None
+        factor = 1
+        while points is None:  # Unlucky rejection runs: retry with more words
+            points = _interleaved_pairs(random.Random(seed), w, h, count * factor)
+            factor *= 2
+        points = points[0][:count], points[1][:count]
+
+    reference = _noise_points_loop(w, h, min(count, CHECK_POINTS), seed)
+    if not (np.array_equal(points[0][:CHECK_POINTS], reference[0])
+            and np.array_equal(points[1][:CHECK_POINTS], reference[1])):
+        return _noise_points_loop(w, h, count, seed)
+    return points
+
+
+def add_noise(arr, color, density=0.05, seed=7):
+    """Scatter single-pixel speckles of color (seeded, deterministic)"""
+    xs, ys = noise_points(arr.shape[1], arr.shape[0], density, seed)
+    arr[ys, xs] = color
+
+
+def _draw_noise(im, color, density, seed):
+    """The original per-point ImageDraw loop, kept as the benchmark reference"""
+    draw = ImageDraw.Draw(im)
+    w, h = im.size
+    rnd = random.Random(seed)
+    for _ in range(int(w * h * density)):
+        x = rnd.randrange(0, w); y = rnd.randrange(0, h)
+        draw.point((x, y), fill=color)
+
+
+def benchmark(sizes, density=0.02, repeat=3):
+    """Time noise generation with ImageDraw and NumPy and check the outputs match"""
+    color = (140, 60, 30, 255)
+    base = (70, 70, 78, 255)
+    print(f"{'size':>6} {'points':>9} {'ImageDraw ms':>13} {'NumPy ms':>9} {'speedup':>8}  identical")
+    for size in sizes:
+        best_pil = best_np = float("inf")
+        for _ in range(repeat):
+            im = Image.new("RGBA", (size, size), base)
+            start = time.perf_counter()
+            _draw_noise(im, color, density, seed=17)
+            best_pil = min(best_pil, time.perf_counter() - start)
+
+            arr = canvas(size, size, base)
+            start = time.perf_counter()
+            add_noise(arr, color, density, seed=17)
+            best_np = min(best_np, time.perf_counter() - start)
+
+        identical = np.array_equal(np.asarray(im), arr)
+        print(f"{size:>6} {int(size * size * density):>9} {best_pil * 1000:>13.2f} "
+              f"{best_np * 1000:>9.2f} {best_pil / best_np:>7.1f}x  {identical}")
+
+
+CHECK_CASES = [  # (w, h, density, seed): empty, tiny, square, non-square, powers of two
+    (7, 7, 0.02, 17), (64, 64, 0.0, 17), (3, 5, 0.01, 1), (1, 1, 1.0, 3),
+    (7, 7, 0.5, 17), (64, 64, 0.02, 17), (100, 37, 0.3, 5), (37, 100, 0.3, 5), (256, 128, 0.05, 9),
+]
+
+
+def check(cases=CHECK_CASES):
+    """
+    Compare noise_points with the randrange loop on every case
+
+    Returns:
+        Number of mismatching cases
+    """
+    failed = 0
+    for w, h, density, seed in cases:
+        xs, ys = noise_points(w, h, density, seed)
+        ref_xs, ref_ys = _noise_points_loop(w, h, int(w * h * density), seed)
+        ok = np.array_equal(xs, ref_xs) and np.array_equal(ys, ref_ys)
+        failed += not ok
+        print(f"{w:>4}x{h:<4} density {density:<5} {len(xs):>6} points  {'ok' if ok else 'MISMATCH'}")
+    return failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy pattern primitives")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 128, 256, 512, 1024])
+    parser.add_argument("--density", type=float, default=0.02)
+    parser.add_argument("--check", action="store_true", help="Check noise_points against randrange, exit 1 on a mismatch")
+    args = parser.parse_args()
+    if args.check:
+        raise SystemExit(1 if check() else 0)
+    benchmark(args.sizes, args.density)
+
+
+if __name__ == "__main__":
+    main()
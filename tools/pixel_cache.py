@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Decoded Pixel Cache for Roboclaust
+Raw RGBA buffers of images the pipeline has seen, keyed by a hash of the
+encoded file bytes, so later stages memory-map pixels instead of decoding
+PNG/JPEG again.
+
+Writers register what they encode:
+    pixel_cache.save(img, path)             # encode once, write, register
+    data = encode(img); write(data); pixel_cache.put(data, img)
+Readers get a read-only view, decoding (and caching) only on a miss:
+    rgba = pixel_cache.load_rgba(path)      # (h, w, 4) uint8 memmap
+    rgba = pixel_cache.load_rgba(path, store=False)   # reports: never add entries
+    img = pixel_cache.open_image(path)      # RGBA PIL image
+
+Entries live in tools/.build_cache/pixels as <hash>.rgba: a 16-byte header
+(magic, width, height) followed by the pixels. Images over MAX_ENTRY_BYTES of
+RGBA are not cached.
+
+Usage:
+    python tools/pixel_cache.py              # stats
+    python tools/pixel_cache.py --prune 256  # keep the newest 256 MB
+    python tools/pixel_cache.py --clear
+"""
+
+from PIL import Image
+import numpy as np
+import argparse
+import hashlib
+import io
+import os
+import struct
+import tempfile
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".build_cache", "pixels")
+HEADER = struct.Struct("<4sII4x")  # magic, width, height, padding
+MAGIC = b"RGBA"
+MAX_BYTES = 512 * 1024 * 1024  # prune() default
+MAX_ENTRY_BYTES = 64 * 1024 * 1024  # Bigger images (a 4096x4096 sheet and up) would evict everything else
+ENABLED = os.environ.get("ROBOCLAUST_PIXEL_CACHE", "1") != "0"
+
+
+def content_key(data):
+    """Cache key of encoded image bytes"""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _entry_path(key):
+    return os.path.join(CACHE_DIR, key + ".rgba")
+
+
+def _read(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        magic, width, height = HEADER.unpack(f.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError(f"Not a pixel cache entry: {path}")
+    return np.memmap(path, dtype=np.uint8, mode="r", offset=HEADER.size, shape=(height, width, 4))
+
+
+def put(data, img):
+    """
+    Register the pixels of freshly encoded image bytes
+
+    Args:
+        data: Encoded file bytes (what was or will be written to disk)
+        img: The RGBA image or (h, w, 4) array that data decodes to
+
+    Returns:
+        True if a new entry was written
+    """
+    width, height = img.size if isinstance(img, Image.Image) else (img.shape[1], img.shape[0])
+    if not ENABLED or width * height * 4 > MAX_ENTRY_BYTES:
+        return False
+    path = _entry_path(content_key(data))
+    try:
+        os.utime(path)
+        return False
+    except FileNotFoundError:
+        pass
+    rgba = np.ascontiguousarray(np.asarray(img.convert("RGBA") if isinstance(img, Image.Image) else img))
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    # Unique per writer: splitter threads may put identical cells at the same time
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as f:
+        f.write(HEADER.pack(MAGIC, rgba.shape[1], rgba.shape[0]))
+        f.write(rgba.tobytes())
+    try:
+        os.replace(f.name, path)  # Atomic, so parallel workers never see half an entry
+    except OSError:
+        os.remove(f.name)
+        if os.path.exists(path):
+            return False  # Another writer stored it first (Windows can't replace a mapped file)
+        raise
+    return True
+
+
+def save(img, path, encode=None):
+    """
+    Encode img as PNG (or with encode(img) -> bytes), write it and register its pixels
+
+    An identical file on disk is left alone (and keeps its mtime, so Godot
+    doesn't reimport it).
+
+    Returns:
+        The encoded bytes
+    """
+    if encode:
+        data = encode(img)
+    else:
+        buffer = io.BytesIO()
+        img.save(buffer, "PNG")
+        data = buffer.getvalue()
+    if not (os.path.exists(path) and os.path.getsize(path) == len(data) and _read(path) == data):
+        with open(path, "wb") as f:
+            f.write(data)
+    put(data, img)
+    return data
+
+
+def load_rgba(path, store=True):
+    """
+    Pixels of an image file as a read-only (h, w, 4) uint8 array
+
+    Memory-mapped from the cache when the file's bytes were seen before,
+    otherwise decoded once and cached.
+
+    Args:
+        store: False for lookup only (analysis tools): a miss is decoded but not cached
+    """
+    data = _read(path)
+    if not ENABLED:
+        return np.asarray(Image.open(path).convert("RGBA"))
+
+    entry = _entry_path(content_key(data))
+    if os.path.exists(entry):
+        try:
+            return _map(entry)
+        except (OSError, ValueError):
+            pass  # Damaged entry, decode again
+    with Image.open(path) as img:
+        rgba = np.asarray(img.convert("RGBA"))
+    if store:
+        put(data, rgba)
+    return rgba
+
+
+def open_image(path):
+    """RGBA PIL image of a file, from the cache when possible"""
+    rgba = load_rgba(path)
+    return Image.frombuffer("RGBA", (rgba.shape[1], rgba.shape[0]), rgba, "raw", "RGBA", 0, 1)
+
+
+def entries():
+    """(path, size, mtime) of every cache entry, newest first"""
+    if not os.path.isdir(CACHE_DIR):
+        return []
+    found = []
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith(".rgba"):
+            stat = os.stat(os.path.join(CACHE_DIR, name))
+            found.append((os.path.join(CACHE_DIR, name), stat.st_size, stat.st_mtime))
+    return sorted(found, key=lambda entry: -entry[2])
+
+
+def prune(max_bytes=MAX_BYTES):
+    """
+    Delete the least recently used entries beyond max_bytes
+
+    Returns:
+        Number of entries removed
+    """
+    total = 0
+    removed = 0
+    for path, size, _ in entries():
+        total += size
+        if total > max_bytes:
+            try:
+                os.remove(path)
+                removed += 1
+            except OSError:
+                pass  # Still mapped by another process (Windows)
+    return removed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the decoded pixel cache")
+    parser.add_argument("--prune", type=int, metavar="MB", help="Keep only the newest MB megabytes")
+    parser.add_argument("--clear", action="store_true", help="Delete every entry")
+    args = parser.parse_args()
+
+    if args.clear or args.prune is not None:
+        removed = prune(0 if args.clear else args.prune * 1024 * 1024)
+        print(f"Removed {removed} entries")
+    found = entries()
+    print(f"{len(found)} entries, {sum(size for _, size, _ in found) / 1024 / 1024:.1f} MB in {CACHE_DIR}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,19 @@
 # Replace old danger tiles with new generated tiles
+#
+# The 64 danger tile variants are rotations/flips of 4 source tiles. Every
+# variant is fingerprinted modulo rotation and flip, each unique image is
+# stored once in danger_atlas.png and the variants become TileSet alternative
+# tiles (flip_h / flip_v / transpose) in danger_tileset.tres; danger_atlas.json
+# maps danger_tile_NN to atlas coords + alternative. This is the only writer of
+# those three files (pack_tile_atlas.py refuses to pack over them).
+# The 64 per-variant PNGs are still written: GameMap.tscn and create_tilemap.gd
+# load them until they move to the atlas. Run with --legacy to write only those.
 from PIL import Image
-import os, shutil
+import numpy as np
+import hashlib, json, os, sys
+
+from pack_tile_atlas import pack_tiles, print_remapped, read_tile_sources, remap_scenes, write_tileset
+import pixel_cache
 
 # Source tiles
 SOURCE_TILES = [
@@ -12,50 +25,171 @@ SOURCE_TILES = [
 
 # Target directory
 TARGET_DIR = "assets/tiles/danger"
+TILESET_PATH = "assets/tiles/danger_tileset.tres"
+ATLAS_PATH = "assets/tiles/danger_atlas.png"
+VARIANTS_PER_TILE = 16
+
+# Godot TileData flags -> array transform (transpose is applied before the flips)
+TRANSFORMS = [
+    {"transpose": t, "flip_h": h, "flip_v": v}
+    for t in (False, True) for h in (False, True) for v in (False, True)
+]
+
+
+def make_variant(base_img, variant):
+    """Create variations by rotating or flipping (the original 16-per-tile scheme)"""
+    img = base_img.copy()
+
+    if variant % 4 == 1:
+        img = img.rotate(90)
+    elif variant % 4 == 2:
+        img = img.rotate(180)
+    elif variant % 4 == 3:
+        img = img.rotate(270)
+
+    if variant >= 8:
+        img = img.transpose(Image.FLIP_LEFT_RIGHT)
+
+    return img
+
+
+def apply_transform(pixels, flags):
+    """Apply Godot's transpose/flip_h/flip_v flags to an (h, w, 4) array"""
+    if flags["transpose"]:
+        pixels = pixels.transpose(1, 0, 2)
+    if flags["flip_h"]:
+        pixels = pixels[:, ::-1]
+    if flags["flip_v"]:
+        pixels = pixels[::-1, :]
+    return pixels
+
+
+def fingerprint(pixels):
+    return hashlib.sha256(np.ascontiguousarray(pixels).tobytes() + bytes(str(pixels.shape), "ascii")).hexdigest()
+
+
+class TileDeduplicator:
+    """Stores each tile once modulo rotation and flip"""
+
+    def __init__(self):
+        self.uniques = []  # Unique tile images
+        self.lookup = {}   # fingerprint -> (unique index, flags)
+
+    def add(self, img):
+        """
+        Register a tile image
+
+        Returns:
+            (unique index, flags) such that apply_transform(uniques[index], flags) == img
+        """
+        pixels = np.asarray(img.convert("RGBA"))
+        match = self.lookup.get(fingerprint(pixels))
+        if match:
+            return match
+
+        index = len(self.uniques)
+        self.uniques.append(img.convert("RGBA"))
+        # The inverse of every transform is in the same group, so registering all
+        # 8 transforms of the new unique makes any variant of it resolvable.
+        for flags in TRANSFORMS:
+            self.lookup.setdefault(fingerprint(apply_transform(pixels, flags)), (index, flags))
+        return index, TRANSFORMS[0]
+
+
+def write_legacy_tiles(sources):
+    """Copy each source tile 16 times with variations (one PNG per variant)"""
+    tile_counter = 0
+    for source_path, base_img in sources:
+        print(f"\nProcessing {source_path}...")
+        for variant in range(VARIANTS_PER_TILE):
+            target_path = f"{TARGET_DIR}/danger_tile_{tile_counter:02d}.png"
+            pixel_cache.save(make_variant(base_img, variant), target_path)
+            print(f"  Created {target_path}")
+            tile_counter += 1
+    return tile_counter
+
+
+def write_deduplicated_tiles(sources):
+    """Store unique tiles once and express variants as TileSet alternative tiles"""
+    dedup = TileDeduplicator()
+    variants = []  # (variant name, unique index, flags)
+
+    tile_counter = 0
+    for source_path, base_img in sources:
+        print(f"\nProcessing {source_path}...")
+        for variant in range(VARIANTS_PER_TILE):
+            index, flags = dedup.add(make_variant(base_img, variant))
+            variants.append((f"danger_tile_{tile_counter:02d}", index, flags))
+            tile_counter += 1
+
+    print(f"\n{tile_counter} variants -> {len(dedup.uniques)} unique tiles")
+
+    atlas, coords = pack_tiles(dedup.uniques, padding=1)
+    pixel_cache.save(atlas, ATLAS_PATH)
+
+    alternatives = {}  # coords -> [(alternative id, flags)]
+    mapping = {}
+    for name, index, flags in variants:
+        alts = alternatives.setdefault(coords[index], [])
+        enabled = {key: True for key, value in flags.items() if value}
+        if not enabled:
+            alt_id = 0
+        else:
+            alt_id = next((a for a, props in alts if props == enabled), None)
+            if alt_id is None:
+                alt_id = len(alts) + 1
+                alts.append((alt_id, enabled))
+        mapping[name] = {"coords": list(coords[index]), "alternative": alt_id}
 
-# Make sure source tiles exist
-os.chdir("C:/Users/reid1/Documents/Roboclaust")
+    old_sources = read_tile_sources(TILESET_PATH)
+    write_tileset(TILESET_PATH, ATLAS_PATH, dedup.uniques[0].size, 1, coords,
+                  alternatives=alternatives)
+    with open(os.path.splitext(ATLAS_PATH)[0] + ".json", "w", encoding="utf-8") as f:
+        json.dump(mapping, f, indent=2)
+    print(f"Wrote {TILESET_PATH} ({len(coords)} tiles, "
+          f"{sum(len(a) for a in alternatives.values())} alternatives)")
 
-print("============================================================")
-print("Replacing danger tiles with new generated tiles")
-print("============================================================")
+    # Scenes painted with the old per-variant sources move to atlas coords + alternative
+    remap = {}
+    for source, res in old_sources.items():
+        entry = mapping.get(os.path.splitext(os.path.basename(res))[0])
+        if entry and res.startswith(f"res://{TARGET_DIR}/"):
+            remap[(source, 0, 0)] = (0, *entry["coords"], entry["alternative"])
+    print_remapped(remap_scenes(TILESET_PATH, remap))
+    return len(dedup.uniques)
 
-# Create target directory
-os.makedirs(TARGET_DIR, exist_ok=True)
 
-# Copy each source tile 16 times with variations
-tile_counter = 0
-for i, source_path in enumerate(SOURCE_TILES):
-    if not os.path.exists(source_path):
-        print(f"WARNING: Source tile not found: {source_path}")
-        continue
+def main():
+    # Paths are relative to the project root
+    os.chdir(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
 
-    print(f"\nProcessing {source_path}...")
-    base_img = Image.open(source_path)
+    print("============================================================")
+    print("Replacing danger tiles with new generated tiles")
+    print("============================================================")
 
-    # Create 16 variations per source tile
-    for variant in range(16):
-        target_path = f"{TARGET_DIR}/danger_tile_{tile_counter:02d}.png"
+    # Create target directory
+    os.makedirs(TARGET_DIR, exist_ok=True)
 
-        # Create variations by rotating, flipping, or color shifting
-        img = base_img.copy()
+    # Make sure source tiles exist
+    sources = []
+    for source_path in SOURCE_TILES:
+        if not os.path.exists(source_path):
+            print(f"WARNING: Source tile not found: {source_path}")
+            continue
+        sources.append((source_path, pixel_cache.open_image(source_path)))  # Mapped, not decoded, after the generator ran
 
-        if variant % 4 == 1:
-            img = img.rotate(90)
-        elif variant % 4 == 2:
-            img = img.rotate(180)
-        elif variant % 4 == 3:
-            img = img.rotate(270)
+    if not sources:
+        print("ERROR: No source tiles found, leaving the danger tiles untouched")
+        sys.exit(1)
 
-        if variant >= 8:
-            img = img.transpose(Image.FLIP_LEFT_RIGHT)
+    tile_count = write_legacy_tiles(sources)
+    if "--legacy" not in sys.argv:
+        write_deduplicated_tiles(sources)
 
-        # Save
-        img.save(target_path, "PNG")
-        print(f"  Created {target_path}")
+    print(f"\n============================================================")
+    print(f"Replaced danger tiles with {tile_count} tile images successfully!")
+    print(f"============================================================")
 
-        tile_counter += 1
 
-print(f"\n============================================================")
-print(f"Replaced {tile_counter} danger tiles successfully!")
-print(f"============================================================")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,276 @@
+#!/usr/bin/env python3
+"""
+Resource Reference Index for Roboclaust
+Scans every .tscn, .tres, .gd and project.godot for res:// paths, uid://
+references and preload()/load() calls, builds the reference graph and
+reports broken references, unreferenced assets, byte-identical duplicates
+and same-name variants (e.g. song.mp3 + song.ogg).
+
+Paths built at runtime are matched conservatively:
+    "res://sounds/"                 directory scan -> every file directly inside
+    "res://assets/sprites/%s.png"   format string  -> every file matching the glob
+
+Usage:
+    python tools/res_index.py                # full report
+    python tools/res_index.py --check        # exit 1 on broken references anywhere
+    python tools/res_index.py --check scripts/player.gd scenes/Game.tscn   # pre-commit: staged files only
+    python tools/res_index.py --json index.json
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SKIP_DIRS = {".godot", ".git", ".vs", "__pycache__", ".build_cache"}
+
+SOURCE_EXTENSIONS = {".tscn", ".tres", ".gd", ".godot", ".cfg"}
+ASSET_EXTENSIONS = {".png", ".jpg", ".jpeg", ".webp", ".svg", ".ogg", ".mp3", ".wav",
+                    ".ttf", ".otf", ".tscn", ".tres", ".gd", ".csv", ".translation", ".gdshader"}
+GENERATED_PREFIXES = ("res://assets/tiers/",)  # tools/texture_tiers.py output, absent until it runs
+VARIANT_GROUPS = [{".ogg", ".mp3", ".wav"}, {".png", ".jpg", ".jpeg", ".webp", ".svg"}]
+
+REF_PATTERN = re.compile(r'(?:"|\')\*?((?:res|uid)://[^"\']*)(?:"|\')'
+                         r'|(?:pre)?load\(\s*"([^":]+)"')
+UID_HEADER = re.compile(r'^\[gd_(?:scene|resource)[^\]]*\buid="(uid://[a-z0-9]+)"', re.M)
+IMPORT_UID = re.compile(r'^uid="(uid://[a-z0-9]+)"', re.M)
+FORMAT_FIELD = re.compile(r"%[-0-9.]*[sdif]|\{[^}]*\}")
+
+
+def res_path(path):
+    return "res://" + os.path.relpath(path, BASE_PATH).replace(os.sep, "/")
+
+
+def walk_project(root=BASE_PATH):
+    """All project files, skipping editor and tool caches"""
+    for directory, subdirs, files in os.walk(root):
+        subdirs[:] = [d for d in subdirs if d not in SKIP_DIRS]
+        for name in files:
+            yield os.path.join(directory, name)
+
+
+class ResIndex:
+    """
+    Reference graph of one Godot project
+
+    Attributes:
+        files: res:// path -> filesystem path of every project file
+        refs: res:// path of a source file -> set of res:// paths it references
+        broken: res:// path of a source file -> set of references that resolve to nothing
+        uids: uid:// text -> res:// path
+    """
+
+    def __init__(self, root=BASE_PATH):
+        self.root = root
+        self.files = {}
+        self.refs = {}
+        self.broken = {}
+        self.uids = {}
+        self.dynamic = set()  # Files only reached through directory scans / format strings
+
+        sources = []
+        for path in walk_project(root):
+            res = res_path(path)
+            if path.endswith(".import"):
+                self._read_import_uid(path)
+                continue
+            if path.endswith(".uid"):  # script.gd.uid
+                with open(path, encoding="utf-8") as f:
+                    self.uids[f.read().strip()] = res[:-len(".uid")]
+                continue
+            self.files[res] = path
+            if os.path.splitext(path)[1] in SOURCE_EXTENSIONS:
+                sources.append((res, path))
+
+        texts = {}
+        for res, path in sources:
+            with open(path, encoding="utf-8", errors="replace") as f:
+                texts[res] = f.read()
+            if res.endswith((".tscn", ".tres")):
+                header = UID_HEADER.search(texts[res])
+                if header:
+                    self.uids[header.group(1)] = res
+        for res, text in texts.items():
+            self._index_source(res, text)
+
+        self.referenced_by = {}
+        for source, targets in self.refs.items():
+            for target in targets:
+                self.referenced_by.setdefault(target, set()).add(source)
+
+    def _read_import_uid(self, path):
+        with open(path, encoding="utf-8", errors="replace") as f:
+            match = IMPORT_UID.search(f.read(400))
+        if match:
+            self.uids[match.group(1)] = res_path(path[:-len(".import")])
+
+    def _index_source(self, source, text):
+        targets = set()
+        base_dir = source.rsplit("/", 1)[0]
+        for match in REF_PATTERN.finditer(text):
+            ref = match.group(1) or match.group(2)
+            if ref.startswith("uid://"):
+                resolved = self.uids.get(ref)
+                if resolved:
+                    targets.add(resolved)
+                # Unknown uids fall back to the path next to them (ext_resource has both)
+                continue
+            if not ref.startswith("res://"):
+                ref = base_dir + "/" + ref  # Relative load("enemy.tscn")
+            found = self.resolve(ref)
+            if found is None:
+                self.broken.setdefault(source, set()).add(ref)
+            targets.update(found or ())
+        targets.discard(source)
+        self.refs[source] = targets
+
+    def resolve(self, ref):
+        """
+        Files a res:// string refers to
+
+        Returns:
+            Set of res:// file paths, or None if the reference is broken
+        """
+        ref = ref.split("::", 1)[0]  # res://scene.tscn::SubResource
+        if ref in self.files:
+            return {ref}
+        if FORMAT_FIELD.search(ref):
+            pattern = FORMAT_FIELD.sub("*", ref)
+            found = {res for res in self.files if fnmatch.fnmatchcase(res, pattern)}
+        elif ref.endswith("/") or os.path.isdir(os.path.join(self.root, ref[len("res://"):])):
+            prefix = ref.rstrip("/") + "/"
+            found = {res for res in self.files if res.startswith(prefix) and "/" not in res[len(prefix):]}
+        elif ref.rstrip("/") in ("res:", "res://.godot") or ref.startswith("res://.godot/"):
+            return set()  # Editor cache / bare prefix used in string building
+        elif ref.startswith(GENERATED_PREFIXES):
+            return set()  # Optional build output; the game checks it exists before loading
+        else:
+            return None
+        self.dynamic.update(found)
+        return found
+
+    def roots(self):
+        """Entry points: everything project.godot references"""
+        return set(self.refs.get("res://project.godot", ()))
+
+    def dependencies(self, res):
+        """Transitive closure of the references of one file (including itself)"""
+        seen, stack = set(), [res]
+        while stack:
+            current = stack.pop()
+            if current in seen:
+                continue
+            seen.add(current)
+            stack.extend(self.refs.get(current, ()))
+        return seen
+
+    def unreferenced(self):
+        """Assets no other file references"""
+        return sorted(res for res in self.files
+                      if os.path.splitext(res)[1] in ASSET_EXTENSIONS and res not in self.referenced_by)
+
+    def unreachable(self):
+        """Assets not reachable from project.godot (main scene, autoloads, ...)"""
+        reachable = set()
+        for root in self.roots() | {"res://project.godot"}:
+            reachable |= self.dependencies(root)
+        return sorted(res for res in self.files
+                      if os.path.splitext(res)[1] in ASSET_EXTENSIONS and res not in reachable)
+
+    def duplicates(self):
+        """Groups of byte-identical asset files (size first, then content hash)"""
+        by_size = {}
+        for res, path in self.files.items():
+            if os.path.splitext(res)[1] in ASSET_EXTENSIONS:
+                by_size.setdefault(os.path.getsize(path), []).append(res)
+
+        groups = []
+        for size, paths in by_size.items():
+            if len(paths) < 2 or size == 0:
+                continue
+            by_hash = {}
+            for res in paths:
+                with open(self.files[res], "rb") as f:
+                    by_hash.setdefault(hashlib.blake2b(f.read(), digest_size=16).digest(), []).append(res)
+            groups += [(size, sorted(group)) for group in by_hash.values() if len(group) > 1]
+        return sorted(groups, key=lambda group: -group[0] * (len(group[1]) - 1))
+
+    def variants(self):
+        """Same path and name, different format of the same media type (song.mp3 + song.ogg)"""
+        stems = {}
+        for res in self.files:
+            stem, ext = os.path.splitext(res)
+            for group in VARIANT_GROUPS:
+                if ext.lower() in group:
+                    stems.setdefault((stem, id(group)), []).append(res)
+        return sorted(sorted(paths) for paths in stems.values() if len(paths) > 1)
+
+
+def print_report(index, elapsed, limit):
+    def section(title, rows):
+        print(f"\n{title} ({len(rows)})")
+        for row in rows[:limit]:
+            print(f"  {row}")
+        if len(rows) > limit:
+            print(f"  ... {len(rows) - limit} more (--limit 0 for all)")
+
+    edges = sum(len(targets) for targets in index.refs.values())
+    print(f"{len(index.files)} files, {len(index.refs)} sources, {edges} references, "
+          f"{len(index.uids)} uids in {elapsed * 1000:.0f} ms")
+
+    section("Broken references", [f"{source}: {ref}" for source, refs in sorted(index.broken.items())
+                                  for ref in sorted(refs)])
+    section("Unreferenced assets", index.unreferenced())
+    section("Unreachable from project.godot", index.unreachable())
+
+    duplicates = index.duplicates()
+    wasted = sum(size * (len(paths) - 1) for size, paths in duplicates)
+    section(f"Byte-identical duplicates, {wasted / 1024:.0f} KiB redundant",
+            [f"{size:>9} B  " + "  ".join(paths) for size, paths in duplicates])
+
+    rows = []
+    for paths in index.variants():
+        used = [res for res in paths if res in index.referenced_by and res not in index.dynamic]
+        rows.append("  ".join(paths) + (f"   (referenced: {', '.join(used)})" if used else ""))
+    section("Format variants", rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index res:// references and report dead or duplicate assets")
+    parser.add_argument("files", nargs="*", help="With --check: only check references made by these files")
+    parser.add_argument("--check", action="store_true", help="Exit 1 if any reference is broken (for pre-commit)")
+    parser.add_argument("--json", metavar="PATH", help="Also write the reference graph as JSON")
+    parser.add_argument("--limit", type=int, default=40, help="Rows per report section (0 = all)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    index = ResIndex()
+    elapsed = time.perf_counter() - start
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"refs": {source: sorted(targets) for source, targets in sorted(index.refs.items())},
+                       "broken": {source: sorted(refs) for source, refs in sorted(index.broken.items())},
+                       "uids": dict(sorted(index.uids.items()))}, f, indent=2)
+
+    if args.check:
+        only = {res_path(os.path.abspath(path)) for path in args.files}
+        broken = {source: refs for source, refs in index.broken.items() if not only or source in only}
+        for source, refs in sorted(broken.items()):
+            for ref in sorted(refs):
+                print(f"{source}: broken reference {ref}")
+        sys.exit(1 if broken else 0)
+
+    print("=" * 60)
+    print("Roboclaust Resource Index")
+    print("=" * 60)
+    print_report(index, elapsed, args.limit or sys.maxsize)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+Texture Resolution Tiers for Roboclaust
+Writes scaled copies of PNG assets into a parallel tree per tier, so the
+game can pick a tier at startup (AssetManager, see scripts/asset_manager.gd):
+
+    assets/sprites/enemies/fast_drone.png
+    assets/tiers/2x/sprites/enemies/fast_drone.png     nearest-neighbour upscale
+    assets/tiers/0.5x/sprites/enemies/fast_drone.png   area-averaged downscale
+    assets/tiers/2x/anim/drone_fast.tres               SpriteFrames with scaled regions
+    assets/tiers/tiers.json                            scales, file counts, VRAM per tier
+
+Upscales are integer factors with nearest-neighbour sampling (pixel art stays
+crisp); downscales are 1/integer factors averaged over each block with
+premultiplied alpha, so transparent pixels don't bleed dark fringes.
+
+asset_splitter.py and generate_roboclaust_assets.py write tiers as they go
+with --tiers; this script backfills them from PNGs already on disk.
+
+Usage:
+    python tools/texture_tiers.py                      # 0.5x and 2x of every sprite, tile and animation
+    python tools/texture_tiers.py --tiers 0.5,2,3 assets/sprites/enemies
+    python tools/texture_tiers.py --manifest-only      # just recount assets/tiers/tiers.json
+"""
+
+from PIL import Image
+from fractions import Fraction
+import numpy as np
+import argparse
+import glob
+import json
+import os
+import re
+import struct
+
+import pixel_cache
+
+BASE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ASSETS_DIR = os.path.join(BASE_PATH, "assets")
+TIERS_SUBDIR = "tiers"
+DEFAULT_TIERS = "0.5,2"
+DEFAULT_DIRS = ["assets/sprites", "assets/anim", "assets/tiles"]
+
+
+def parse_tiers(text):
+    """
+    Parse a comma-separated tier list ("0.5,2", "1/4,3")
+
+    Returns:
+        List of Fraction scales; each is an integer or 1/integer, never 1
+    """
+    if not text:
+        return []
+    scales = []
+    for part in text.split(","):
+        scale = Fraction(part.strip())
+        if scale <= 0 or scale == 1 or (scale.numerator != 1 and scale.denominator != 1):
+            raise ValueError(f"Tier {part!r}: use an integer upscale (2, 3) or 1/integer downscale (0.5, 1/4)")
+        scales.append(scale)
+    return sorted(set(scales))
+
+
+def tier_name(scale):
+    """Directory name of a tier: 2x, 0.5x, 0.25x"""
+    return f"{float(scale):g}x"
+
+
+def scale_size(size, scale):
+    """Pixel size at a tier (downscales round up, so nothing is cut off)"""
+    return tuple(-(-value * scale.numerator // scale.denominator) for value in size)
+
+
+def area_average(rgba, factor):
+    """
+    Downscale an (h, w, 4) uint8 array by an integer factor, averaging each block
+
+    Colours are averaged premultiplied by alpha; odd edges are padded by repetition.
+    """
+    height, width = rgba.shape[:2]
+    pad_y, pad_x = -height % factor, -width % factor
+    if pad_y or pad_x:
+        rgba = np.pad(rgba, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+    pixels = rgba.astype(np.float32)
+    pixels[..., :3] *= pixels[..., 3:] / 255
+    blocks = pixels.reshape(rgba.shape[0] // factor, factor, rgba.shape[1] // factor, factor, 4).mean(axis=(1, 3))
+    alpha = blocks[..., 3:]
+    blocks[..., :3] = np.divide(blocks[..., :3] * 255, alpha, out=np.zeros_like(blocks[..., :3]), where=alpha > 0)
+    return np.rint(blocks).clip(0, 255).astype(np.uint8)
+
+
+def scale_image(img, scale):
+    """RGBA image at a tier"""
+    img = img if img.mode == "RGBA" else img.convert("RGBA")
+    if scale.denominator == 1:
+        return img.resize(scale_size(img.size, scale), Image.NEAREST)
+    return Image.fromarray(area_average(np.asarray(img), scale.denominator), "RGBA")
+
+
+def scale_rect(rect, scale):
+    """(x, y, w, h) at a tier: the corner rounds down, the far edge up like scale_size"""
+    x, y, width, height = rect
+    left, top = x * scale.numerator // scale.denominator, y * scale.numerator // scale.denominator
+    right, bottom = scale_size((x + width, y + height), scale)
+    return left, top, right - left, bottom - top
+
+
+def scale_trim(trim, scale):
+    """A .trim.json sidecar (asset_splitter.py --trim) for a tier"""
+    return {"cell_size": list(scale_size(trim["cell_size"], scale)),
+            "offset": [value * scale.numerator // scale.denominator for value in trim["offset"]],
+            "size": list(scale_size(trim["size"], scale))}
+
+
+def tier_path(path, scale):
+    """
+    Where a tier copy of an asset goes
+
+    Relative paths are taken as relative to the project root (the generator
+    writes "assets/..."), absolute ones must lie under assets/.
+
+    Returns:
+        The tier path, or None for files outside assets/ (tests, preview builds)
+    """
+    assets = ASSETS_DIR if os.path.isabs(path) else "assets"
+    rel = os.path.relpath(path, assets)
+    if rel.startswith("..") or rel.split(os.sep)[0] == TIERS_SUBDIR:
+        return None
+    return os.path.join(assets, TIERS_SUBDIR, tier_name(scale), rel)
+
+
+def save_tiers(img, path, scales, encode=None):
+    """
+    Write the tier copies of an image that was saved to path
+
+    Args:
+        encode: img -> PNG bytes (default: plain PNG); files with the same bytes are left alone
+
+    Returns:
+        List of the tier paths
+    """
+    written = []
+    for scale in scales:
+        target = tier_path(path, scale)
+        if target:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            pixel_cache.save(scale_image(img, scale), target, encode)
+            written.append(target)
+    return written
+
+
+def tier_tres(text, scale):
+    """
+    .tres text for a tier: res://assets/ PNG paths point into the tier and
+    Rect2 regions are scaled. UIDs of moved references are dropped, because
+    Godot resolves a uid before the path.
+    """
+    prefix = f"res://assets/{TIERS_SUBDIR}/{tier_name(scale)}/"
+    text = re.sub(r'"res://assets/(?!' + TIERS_SUBDIR + r'/)([^"]+\.png)"', lambda m: f'"{prefix}{m.group(1)}"', text)
+    text = re.sub(r' uid="uid://[a-z0-9]+"(?=[^\n]*' + re.escape(prefix) + ")", "", text)
+    return re.sub(r"Rect2\(([^)]*)\)", lambda m: "Rect2(%d, %d, %d, %d)" % scale_rect(
+        [int(float(value)) for value in m.group(1).split(",")], scale), text)
+
+
+def save_tres_tiers(text, path, scales):
+    """Write the tier copies of a .tres that was saved to path"""
+    for scale in scales:
+        target = tier_path(path, scale)
+        if target:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8", newline="\n") as f:
+                f.write(tier_tres(text, scale))
+
+
+def save_trim_tiers(trim, path, scales):
+    """Write the tier copies of a .trim.json sidecar"""
+    for scale in scales:
+        target = tier_path(path, scale)
+        if target:
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with open(target, "w", encoding="utf-8", newline="\n") as f:
+                json.dump(scale_trim(trim, scale), f, indent=2)
+
+
+def png_size(path):
+    """(width, height) from a PNG's IHDR chunk, without decoding it"""
+    with open(path, "rb") as f:
+        header = f.read(24)
+    if header[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError(f"Not a PNG: {path}")
+    return struct.unpack(">II", header[16:24])
+
+
+def write_manifest(assets_dir=ASSETS_DIR):
+    """
+    Recount every tier under assets/tiers and write tiers.json
+
+    VRAM is the uncompressed RGBA8 size (what the pixel-art import policy
+    produces, no mipmaps). "base" covers the originals of the tiered files.
+
+    Returns:
+        The manifest dict
+    """
+    tiers_dir = os.path.join(assets_dir, TIERS_SUBDIR)
+    manifest = {"base": {"scale": 1, "files": 0, "vram_bytes": 0}, "tiers": {}}
+    counted = set()
+    for tier_dir in sorted(glob.glob(os.path.join(tiers_dir, "*x"))):
+        name = os.path.basename(tier_dir)
+        entry = {"scale": float(Fraction(name[:-1])), "root": "res://assets/tiers/" + name,
+                 "files": 0, "vram_bytes": 0, "disk_bytes": 0}
+        for path in glob.glob(os.path.join(tier_dir, "**", "*.png"), recursive=True):
+            width, height = png_size(path)
+            entry["files"] += 1
+            entry["vram_bytes"] += width * height * 4
+            entry["disk_bytes"] += os.path.getsize(path)
+            rel = os.path.relpath(path, tier_dir)
+            original = os.path.join(assets_dir, rel)
+            if rel not in counted and os.path.exists(original):
+                counted.add(rel)
+                width, height = png_size(original)
+                manifest["base"]["files"] += 1
+                manifest["base"]["vram_bytes"] += width * height * 4
+        manifest["tiers"][name] = entry
+
+    os.makedirs(tiers_dir, exist_ok=True)
+    with open(os.path.join(tiers_dir, "tiers.json"), "w", encoding="utf-8", newline="\n") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    return manifest
+
+
+def print_manifest(manifest):
+    print(f"{'tier':<8} {'files':>6} {'VRAM MiB':>9} {'disk KiB':>9}")
+    base = manifest["base"]
+    print(f"{'1x':<8} {base['files']:>6} {base['vram_bytes'] / 1048576:>9.1f} {'':>9}")
+    for name, entry in sorted(manifest["tiers"].items(), key=lambda item: item[1]["scale"]):
+        print(f"{name:<8} {entry['files']:>6} {entry['vram_bytes'] / 1048576:>9.1f} "
+              f"{entry['disk_bytes'] / 1024:>9.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write scaled texture tiers of PNG assets")
+    parser.add_argument("dirs", nargs="*", default=DEFAULT_DIRS,
+                        help="Directories to tier recursively (default: %(default)s)")
+    parser.add_argument("--tiers", default=DEFAULT_TIERS,
+                        help="Comma-separated scales: integers upscale, 0.5/0.25 downscale (default: %(default)s)")
+    parser.add_argument("--manifest-only", action="store_true", help="Only rewrite assets/tiers/tiers.json")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Roboclaust Texture Tiers")
+    print("=" * 60)
+
+    if not args.manifest_only:
+        scales = parse_tiers(args.tiers)
+        tiers_dir = os.path.join(ASSETS_DIR, TIERS_SUBDIR)
+        paths = sorted({path for directory in args.dirs
+                        for path in glob.glob(os.path.join(BASE_PATH, directory, "**", "*.png"), recursive=True)
+                        if not os.path.abspath(path).startswith(tiers_dir + os.sep)})
+        for path in paths:
+            save_tiers(pixel_cache.open_image(path), path, scales)
+            sidecar = os.path.splitext(path)[0] + ".trim.json"
+            if os.path.exists(sidecar):
+                with open(sidecar, encoding="utf-8") as f:
+                    save_trim_tiers(json.load(f), sidecar, scales)
+        resources = sorted({path for directory in args.dirs
+                            for path in glob.glob(os.path.join(BASE_PATH, directory, "**", "*.tres"), recursive=True)
+                            if not os.path.abspath(path).startswith(tiers_dir + os.sep)})
+        for path in resources:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            if "Rect2(" in text and ".png" in text:  # SpriteFrames / AtlasTexture regions
+                save_tres_tiers(text, path, scales)
+        print(f"Tiered {len(paths)} PNGs at {', '.join(map(tier_name, scales))}")
+
+    print_manifest(write_manifest())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Span Tracing for the Roboclaust Asset Tools
+Opt-in timing spans (stage, source sheet, output file) with byte counts,
+exported as Chrome trace-event JSON (chrome://tracing, ui.perfetto.dev,
+speedscope) and as a flat summary table.
+
+Disabled by default: span() then returns a no-op context manager, so the
+instrumentation can stay in the code.
+
+    tracing.enable()
+    with tracing.span("encode", "cell", file=path) as args:
+        data = encode_png(cell)
+        args["bytes"] = len(data)
+    tracing.write_chrome("trace.json")
+    tracing.print_summary()
+
+Process pool workers return their events with call(); the parent adds
+them with extend(). Timestamps come from perf_counter, which is system-wide,
+so spans from all processes line up.
+
+Usage:
+    python tools/tracing.py trace.json   # summary table of a saved trace
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+
+ENABLED = False
+_EVENTS = []  # list.append is atomic, so encoder threads can record spans
+
+
+class _Span:
+    __slots__ = ("name", "cat", "args", "start")
+
+    def __init__(self, name, cat, args):
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self.args
+
+    def __exit__(self, *exc):
+        end = time.perf_counter_ns()
+        _EVENTS.append({"name": self.name, "cat": self.cat, "ph": "X",
+                        "ts": self.start / 1000, "dur": (end - self.start) / 1000,
+                        "pid": os.getpid(), "tid": threading.get_native_id(), "args": self.args})
+        return False
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return {}  # Callers may still fill in args
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+def enable(on=True):
+    """Turn recording on or off for this process"""
+    global ENABLED
+    ENABLED = on
+
+
+def span(name, cat="", **args):
+    """
+    Time a block
+
+    Args:
+        name: What runs (e.g. "decode", "encode", or a stage name)
+        cat: Level it belongs to ("stage", "source", "cell", "file", ...)
+        **args: Shown in the trace viewer; set "bytes" to count data volume
+
+    Returns:
+        Context manager whose value is the args dict, to add results at the end
+    """
+    return _Span(name, cat, args) if ENABLED else _NO_SPAN
+
+
+def drain():
+    """Take the events recorded so far in this process"""
+    events = _EVENTS[:]
+    del _EVENTS[:len(events)]
+    return events
+
+
+def extend(events):
+    """Add events recorded in another process"""
+    _EVENTS.extend(events)
+
+
+def call(fn, *args):
+    """Run fn in a pool worker; returns (value, events recorded meanwhile) for extend()"""
+    value = fn(*args)
+    return value, drain()
+
+
+def write_chrome(path, events=None):
+    """Write events as Chrome trace-event JSON, naming the main and worker processes"""
+    events = _EVENTS if events is None else events
+    main_pid = os.getpid()
+    names = [{"name": "process_name", "ph": "M", "pid": pid, "tid": 0,
+              "args": {"name": "main" if pid == main_pid else f"worker {pid}"}}
+             for pid in sorted({event["pid"] for event in events})]
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": names + events, "displayTimeUnit": "ms"}, f)
+
+
+def summary(events=None):
+    """
+    Aggregate spans by (category, name)
+
+    Returns:
+        List of (cat, name, count, total ms, max ms, bytes), largest total first.
+        Nested spans are each counted in full, so totals of different levels overlap.
+    """
+    rows = {}
+    for event in _EVENTS if events is None else events:
+        if event.get("ph") != "X":
+            continue
+        row = rows.setdefault((event["cat"], event["name"]), [0, 0.0, 0.0, 0])
+        row[0] += 1
+        row[1] += event["dur"] / 1000
+        row[2] = max(row[2], event["dur"] / 1000)
+        row[3] += event["args"].get("bytes", 0)
+    return sorted(((cat, name, *row) for (cat, name), row in rows.items()), key=lambda row: -row[3])
+
+
+def print_summary(events=None):
+    print(f"{'category':<10} {'span':<30} {'count':>6} {'total ms':>10} {'mean ms':>9} {'max ms':>9} {'bytes':>12}")
+    for cat, name, count, total, longest, size in summary(events):
+        print(f"{cat:<10} {name[:30]:<30} {count:>6} {total:>10.1f} {total / count:>9.2f} {longest:>9.2f} "
+              f"{size or '':>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Summarize a Chrome trace written with --trace")
+    parser.add_argument("trace", help="Trace JSON file")
+    args = parser.parse_args()
+
+    with open(args.trace, encoding="utf-8") as f:
+        data = json.load(f)
+    print_summary(data["traceEvents"] if isinstance(data, dict) else data)
+
+
+if __name__ == "__main__":
+    main()
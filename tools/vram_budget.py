@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Texture Memory Budget for Roboclaust
+Estimates what every imported texture costs in GPU memory, from the image
+header and the .import params, and sums it per directory and per scene.
+
+VRAM per texture, as Godot 4 uploads it:
+    compress/mode 0, 1 (lossless, lossy)   RGBA8, 4 bytes per pixel (lossy only shrinks the file)
+    compress/mode 2, 4 (VRAM, Basis)       BC3/BC7/ETC2 1 byte per pixel with alpha, BC1 0.5 without,
+                                           in 4x4 blocks
+    compress/mode 3 (VRAM uncompressed)    RGBA8
+    mipmaps/generate=true                  every level down to 1x1 (about +1/3)
+    process/size_limit                     the longest side is scaled down to the limit first
+
+A scene costs every texture it can reach through the res_index.py reference
+graph. Paths built at runtime ("res://assets/sprites/%s.png") count all their
+matches, so scene totals are upper bounds. Editor tool scenes (tools/) are
+listed but don't count against the scene budget.
+
+Flags:
+    waste   share of a texture outside the bounding box of its visible pixels
+            (what asset_splitter.py --trim would reclaim) and fully transparent pixels
+    npot    sizes that are not powers of two, with the bytes a POT-padding
+            driver (old mobile GPUs, some GLES3 paths) would add
+
+Usage:
+    python tools/vram_budget.py                      # report, exit 1 when over budget
+    python tools/vram_budget.py --budget 96 --scene-budget 48
+    python tools/vram_budget.py --json vram.json
+"""
+
+from PIL import Image
+import numpy as np
+import argparse
+import json
+import os
+import sys
+
+from import_sidecars import DEFAULT_PARAMS, parse_import
+from res_index import ResIndex
+from texture_tiers import TIERS_SUBDIR, png_size
+import pixel_cache
+
+TEXTURE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+BUDGET_MIB = 256  # All textures together
+SCENE_BUDGET_MIB = 128  # Textures one scene can reach
+EDITOR_DIRS = ("res://tools/",)  # Editor tool scenes are reported but not held to the scene budget
+WASTE_FLAG = 0.25  # Flag textures with at least this share outside their visible pixels ...
+WASTE_MIN_BYTES = 64 * 1024  # ... that cost at least this much VRAM
+
+MODE_NAMES = {0: "lossless", 1: "lossy", 2: "vram", 3: "vram_raw", 4: "basis"}
+
+
+def is_power_of_two(value):
+    return value > 0 and value & (value - 1) == 0
+
+
+def next_power_of_two(value):
+    return 1 << (value - 1).bit_length()
+
+
+def image_size(path):
+    """(width, height) from the file header, without decoding"""
+    try:
+        return png_size(path)
+    except ValueError:  # JPEG/WebP, or a JPEG saved as .png
+        pass
+    with Image.open(path) as img:
+        return img.size
+
+
+def import_params(path):
+    """
+    Texture importer params of an image
+
+    Returns:
+        Dict of param -> value text (defaults for images without a .import yet), or
+        None when the file is imported as something other than a texture
+    """
+    params = dict(DEFAULT_PARAMS)
+    sidecar = path + ".import"
+    if os.path.exists(sidecar):
+        sections = parse_import(sidecar)
+        if sections.get("remap", {}).get("importer", '"texture"').strip('"') != "texture":
+            return None
+        params.update(sections.get("params", {}))
+    return params
+
+
+def imported_size(size, params):
+    """Size after process/size_limit"""
+    limit = int(params.get("process/size_limit", "0"))
+    width, height = size
+    if limit and max(width, height) > limit:
+        factor = limit / max(width, height)
+        width, height = max(1, round(width * factor)), max(1, round(height * factor))
+    return width, height
+
+
+def level_bytes(width, height, mode, alpha):
+    """Bytes of one mip level"""
+    if mode in (2, 4):
+        blocks = -(-width // 4) * -(-height // 4)
+        return blocks * (16 if alpha else 8)
+    return width * height * 4
+
+
+def vram_bytes(size, params, alpha=True):
+    """
+    GPU memory of a texture with these import params
+
+    Args:
+        size: (width, height) of the source image
+        alpha: Whether the image has transparency (only matters for VRAM compression)
+    """
+    mode = int(params.get("compress/mode", "0"))
+    width, height = imported_size(size, params)
+    total = level_bytes(width, height, mode, alpha)
+    if params.get("mipmaps/generate") == "true":
+        limit = int(params.get("mipmaps/limit", "-1"))
+        level = 0
+        while (width > 1 or height > 1) and (limit < 0 or level < limit):
+            width, height, level = max(1, width // 2), max(1, height // 2), level + 1
+            total += level_bytes(width, height, mode, alpha)
+    return total
+
+
+def transparency(path):
+    """
+    Transparent area of an image
+
+    Returns:
+        (share outside the bounding box of non-transparent pixels, share of fully
+        transparent pixels, whether any pixel is not opaque)
+    """
+    alpha = pixel_cache.load_rgba(path, store=False)[..., 3]  # A report, so no new cache entries
+    visible = alpha > 0
+    rows, cols = np.flatnonzero(visible.any(axis=1)), np.flatnonzero(visible.any(axis=0))
+    if not len(rows):
+        return 1.0, 1.0, True
+    box = (rows[-1] + 1 - rows[0]) * (cols[-1] + 1 - cols[0])
+    return 1 - box / alpha.size, 1 - np.count_nonzero(visible) / alpha.size, bool((alpha < 255).any())
+
+
+def analyze(index, with_pixels=True):
+    """
+    Measure every texture in the project
+
+    Args:
+        index: ResIndex of the project
+        with_pixels: Decode images for the waste columns (and alpha for VRAM compression)
+
+    Returns:
+        Dict of res:// path -> dict with size, mode, mipmaps, vram, waste, empty, npot_padding
+    """
+    textures = {}
+    tiers_prefix = f"res://assets/{TIERS_SUBDIR}/"
+    for res, path in sorted(index.files.items()):
+        if not res.lower().endswith(TEXTURE_EXTENSIONS) or res.startswith(tiers_prefix):
+            continue  # Tier copies replace the originals at runtime, they don't add to them
+        params = import_params(path)
+        if params is None:
+            continue
+        size = image_size(path)
+        waste, empty, alpha = transparency(path) if with_pixels else (0.0, 0.0, True)
+        vram = vram_bytes(size, params, alpha)
+        width, height = imported_size(size, params)
+        pot = vram_bytes((next_power_of_two(width), next_power_of_two(height)), dict(params, **{
+            "process/size_limit": "0"}), alpha)
+        textures[res] = {
+            "size": list(size),
+            "mode": MODE_NAMES.get(int(params.get("compress/mode", "0")), params.get("compress/mode")),
+            "mipmaps": params.get("mipmaps/generate") == "true",
+            "vram": vram,
+            "waste": round(float(waste), 4),
+            "empty": round(float(empty), 4),
+            "npot_padding": 0 if is_power_of_two(width) and is_power_of_two(height) else pot - vram,
+            "imported": os.path.exists(path + ".import"),
+        }
+    return textures
+
+
+def by_directory(textures):
+    """res:// directory -> (texture count, VRAM bytes), largest first"""
+    totals = {}
+    for res, texture in textures.items():
+        entry = totals.setdefault(res.rsplit("/", 1)[0], [0, 0])
+        entry[0] += 1
+        entry[1] += texture["vram"]
+    return sorted(((directory, *entry) for directory, entry in totals.items()), key=lambda row: -row[2])
+
+
+def by_scene(index, textures):
+    """res:// scene -> (texture count, VRAM bytes), largest first"""
+    rows = []
+    for scene in index.files:
+        if scene.endswith(".tscn"):
+            used = [res for res in index.dependencies(scene) if res in textures]
+            rows.append((scene, len(used), sum(textures[res]["vram"] for res in used)))
+    return sorted(rows, key=lambda row: -row[2])
+
+
+def mib(size):
+    return f"{size / 1048576:.2f}"
+
+
+def print_report(textures, directories, scenes, limit):
+    def section(title, header, rows):
+        print(f"\n{title} ({len(rows)})")
+        if rows:
+            print(f"  {header}")
+        for row in rows[:limit]:
+            print(f"  {row}")
+        if len(rows) > limit:
+            print(f"  ... {len(rows) - limit} more (--limit 0 for all)")
+
+    total = sum(texture["vram"] for texture in textures.values())
+    print(f"{len(textures)} textures, {mib(total)} MiB VRAM")
+    modes = {}
+    for texture in textures.values():
+        modes[texture["mode"]] = modes.get(texture["mode"], 0) + 1
+    print("Import modes: " + ", ".join(f"{mode} {count}" for mode, count in sorted(modes.items())))
+    missing = sum(not texture["imported"] for texture in textures.values())
+    if missing:
+        print(f"{missing} without .import (counted with default params; see import_sidecars.py)")
+
+    largest = sorted(textures.items(), key=lambda item: -item[1]["vram"])
+    section("Largest textures", f"{'MiB':>7}  {'size':>11}  {'mode':<9} mip  path",
+            [f"{mib(t['vram']):>7}  {t['size'][0]:>5}x{t['size'][1]:<5}  {t['mode']:<9} "
+             f"{'yes' if t['mipmaps'] else 'no ':<3}  {res}" for res, t in largest])
+    section("Per directory", f"{'MiB':>7}  {'files':>5}  directory",
+            [f"{mib(size):>7}  {count:>5}  {directory}" for directory, count, size in directories])
+    section("Per scene (upper bound)", f"{'MiB':>7}  {'files':>5}  scene",
+            [f"{mib(size):>7}  {count:>5}  {scene}" + ("  (editor)" if scene.startswith(EDITOR_DIRS) else "")
+             for scene, count, size in scenes])
+
+    wasteful = sorted(((res, t) for res, t in textures.items()
+                       if t["waste"] >= WASTE_FLAG and t["vram"] * t["waste"] >= WASTE_MIN_BYTES),
+                      key=lambda item: -item[1]["vram"] * item[1]["waste"])
+    reclaimable = sum(t["vram"] * t["waste"] for _, t in wasteful)
+    section(f"Transparent waste, {mib(reclaimable)} MiB outside visible pixels",
+            f"{'MiB':>7}  {'trim':>5}  {'empty':>5}  path",
+            [f"{mib(t['vram'] * t['waste']):>7}  {t['waste']:>5.0%}  {t['empty']:>5.0%}  {res}"
+             for res, t in wasteful])
+
+    npot = sorted(((res, t) for res, t in textures.items() if t["npot_padding"]),
+                  key=lambda item: -item[1]["npot_padding"])
+    section(f"Non-power-of-two, {mib(sum(t['npot_padding'] for _, t in npot))} MiB if padded to POT",
+            f"{'MiB':>7}  {'size':>11}  path",
+            [f"{mib(t['npot_padding']):>7}  {t['size'][0]:>5}x{t['size'][1]:<5}  {res}" for res, t in npot])
+
+
+def check_budget(textures, scenes, budget, scene_budget):
+    """
+    Returns:
+        List of budget violations as text (empty when everything fits)
+    """
+    failures = []
+    total = sum(texture["vram"] for texture in textures.values())
+    if budget and total > budget * 1048576:
+        failures.append(f"All textures: {mib(total)} MiB > budget {budget} MiB")
+    if scene_budget:
+        failures += [f"{scene}: {mib(size)} MiB > scene budget {scene_budget} MiB"
+                     for scene, _, size in scenes
+                     if size > scene_budget * 1048576 and not scene.startswith(EDITOR_DIRS)]
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Estimate texture VRAM per asset, directory and scene")
+    parser.add_argument("--budget", type=float, default=BUDGET_MIB,
+                        help="MiB all textures may use together, 0 = no limit (default: %(default)s)")
+    parser.add_argument("--scene-budget", type=float, default=SCENE_BUDGET_MIB,
+                        help="MiB of textures one scene may reach, 0 = no limit (default: %(default)s)")
+    parser.add_argument("--no-pixels", action="store_true",
+                        help="Headers only: skip decoding, so no waste report and alpha is assumed")
+    parser.add_argument("--json", metavar="PATH", help="Also write the measurements as JSON")
+    parser.add_argument("--limit", type=int, default=20, help="Rows per report section (0 = all)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Roboclaust Texture Memory Budget")
+    print("=" * 60)
+
+    index = ResIndex()
+    textures = analyze(index, not args.no_pixels)
+    directories = by_directory(textures)
+    scenes = by_scene(index, textures)
+    print_report(textures, directories, scenes, args.limit or sys.maxsize)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"textures": textures,
+                       "directories": {directory: size for directory, _, size in directories},
+                       "scenes": {scene: size for scene, _, size in scenes}}, f, indent=2)
+
+    failures = check_budget(textures, scenes, args.budget, args.scene_budget)
+    print()
+    for failure in failures:
+        print(f"OVER BUDGET  {failure}")
+    if failures:
+        sys.exit(1)
+    print(f"Within budget ({args.budget:g} MiB total, {args.scene_budget:g} MiB per scene)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Polling File Watcher for Roboclaust Tools
+Shared by the --watch modes of asset_splitter.py and generate_roboclaust_assets.py.
+
+Polls mtimes and sizes (no platform-specific notification APIs), waits until
+a burst of saves has settled, then calls rebuild(changed paths) and reports
+the time from the last save to the rebuilt outputs.
+
+code_fingerprint() tells which functions of a reloaded script actually
+changed, so a watcher can rebuild only what depends on an edit.
+
+Usage (from a tool):
+    watch.watch(lambda: [manifest] + sources, rebuild)
+"""
+
+import hashlib
+import inspect
+import os
+import sys
+import time
+import traceback
+
+POLL_INTERVAL = 0.1  # Seconds between polls
+DEBOUNCE = 0.2  # Quiet time after the last change before rebuilding
+
+
+def snapshot(paths):
+    """
+    Stat a set of files
+
+    Returns:
+        Dict of path -> (mtime_ns, size), or None for files that don't exist (yet)
+    """
+    state = {}
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            state[path] = None
+    return state
+
+
+def diff(before, after):
+    """Paths that appeared, disappeared or changed between two snapshots"""
+    return {path for path in before.keys() | after.keys() if before.get(path) != after.get(path)}
+
+
+def _stable(value):
+    """repr() without memory addresses, for hashing module-level values"""
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = sorted(map(_stable, value)) if isinstance(value, (set, frozenset)) else map(_stable, value)
+        return "[" + ",".join(items) + "]"
+    if isinstance(value, dict):
+        return "{" + ",".join(f"{_stable(k)}:{_stable(v)}" for k, v in value.items()) + "}"
+    if isinstance(value, (int, float, complex, str, bytes, bool, type(None))):
+        return repr(value)
+    return getattr(value, "__qualname__", type(value).__name__)
+
+
+def _code_objects(code):
+    yield code
+    for const in code.co_consts:
+        if inspect.iscode(const):  # Nested functions, lambdas, comprehensions
+            yield from _code_objects(const)
+
+
+def _local_module_file(value, directory):
+    """Source file of the module value comes from, if it lives in directory"""
+    module = value if inspect.ismodule(value) else sys.modules.get(getattr(value, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    return path if path and os.path.dirname(os.path.abspath(path)) == directory else None
+
+
+def code_fingerprint(fn):
+    """
+    Hash of what a function computes: its bytecode and constants, the
+    module-level functions it calls (recursively), the module-level values it
+    reads (e.g. palette colours) and the source of sibling modules it uses.
+
+    Comments and line numbers don't count, so only real edits change it.
+    """
+    namespace = fn.__globals__
+    own_file = os.path.abspath(namespace.get("__file__", "."))
+    directory = os.path.dirname(own_file)
+    digest = hashlib.blake2b(digest_size=16)
+    seen, files, stack = set(), set(), [fn]
+    while stack:
+        func = stack.pop()
+        if id(func) in seen:
+            continue
+        seen.add(id(func))
+        digest.update(_stable((func.__defaults__, func.__kwdefaults__)).encode())
+        values = [cell.cell_contents for cell in func.__closure__ or ()]
+        for code in _code_objects(func.__code__):
+            digest.update(code.co_code)
+            digest.update(_stable([c for c in code.co_consts if not inspect.iscode(c)]).encode())
+            values += [namespace[name] for name in code.co_names if name in namespace]
+        for value in values:
+            if inspect.isfunction(value) and value.__globals__ is namespace:
+                stack.append(value)
+            elif _local_module_file(value, directory) not in (None, own_file):
+                files.add(_local_module_file(value, directory))
+            else:
+                digest.update(_stable(value).encode())
+    for path in sorted(files):
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _paths(get_paths, fallback):
+    try:
+        return list(get_paths())
+    except Exception as error:  # e.g. a manifest that is being edited
+        print(f"Keeping the previous watch list: {error}")
+        return list(fallback)
+
+
+def watch(get_paths, rebuild, interval=POLL_INTERVAL, debounce=DEBOUNCE):
+    """
+    Rebuild whenever watched files change, until Ctrl+C
+
+    Args:
+        get_paths: Returns the files to watch; called again after every rebuild
+                   so edits to a manifest can add or remove inputs
+        rebuild: Called with the set of changed paths. Exceptions are printed
+                 and watching continues (a half-saved file is not fatal).
+        interval: Seconds between polls
+        debounce: Seconds without further changes before rebuilding
+    """
+    state = snapshot(get_paths())
+    print(f"Watching {len(state)} file(s), Ctrl+C to stop")
+    try:
+        while True:
+            time.sleep(interval)
+            current = snapshot(state)
+            changed = diff(state, current)
+            if not changed:
+                continue
+
+            # Let a burst of saves (editor temp files, multi-file exports) settle
+            quiet_since = time.monotonic()
+            while time.monotonic() - quiet_since < debounce:
+                time.sleep(interval)
+                latest = snapshot(state)
+                if latest != current:
+                    changed |= diff(current, latest)
+                    current = latest
+                    quiet_since = time.monotonic()
+
+            saved_at = max((current[path][0] for path in changed if current.get(path)), default=None)
+            names = ", ".join(sorted(os.path.basename(path) for path in changed))
+            print(f"\n--- Changed: {names}")
+            start = time.perf_counter()
+            try:
+                rebuild(changed)
+            except Exception:
+                traceback.print_exc()
+                print("--- Rebuild failed, still watching")
+            else:
+                took = time.perf_counter() - start
+                latency = f", {time.time() - saved_at / 1e9:.2f}s after save" if saved_at else ""
+                print(f"--- Rebuilt in {took:.2f}s{latency}")
+            # Keep the pre-rebuild stats so saves made during the rebuild trigger another one
+            state = {path: current[path] if path in current else snapshot([path])[path]
+                     for path in _paths(get_paths, current)}
+    except KeyboardInterrupt:
+        print("\nStopped watching")